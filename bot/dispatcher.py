@@ -0,0 +1,90 @@
+import queue
+import threading
+from collections.abc import Callable, Iterable
+from functools import partial
+
+from django.db import close_old_connections, connections
+
+from bot.tg.schemas import UpdateObj
+
+
+class ChatDispatcher:
+    """
+    Handle updates of different chats concurrently by bounded pool of worker
+    threads. Updates of one chat are handled by one worker in order they were
+    received, batch is returned after all its updates are handled
+    """
+
+    def __init__(self, handler: Callable[[UpdateObj], None], workers: int = 8) -> None:
+        self.handler = handler
+        self.tasks: queue.Queue[Callable[[], None] | None] = queue.Queue()
+        self.errors: list[Exception] = []
+        self.workers = [
+            threading.Thread(target=self.work, name=f'bot-worker-{number}')
+            for number in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def dispatch(self, updates: Iterable[UpdateObj]) -> None:
+        """
+        Handle batch of updates, first exception of handler is raised after
+        other chats are handled
+        :param updates: updates from getUpdates
+        :return: None
+        """
+        chats: dict[int, list[UpdateObj]] = {}
+        for update in updates:
+            chats.setdefault(update.message.chat.id, []).append(update)
+        self.run(partial(self.handle_chat, updates) for updates in chats.values())
+
+    def run(self, tasks: Iterable[Callable[[], None]]) -> None:
+        """
+        Run tasks by workers and wait for them, first exception of tasks is
+        raised after other tasks are finished
+        :param tasks: tasks
+        :return: None
+        """
+        for task in tasks:
+            self.tasks.put(task)
+        self.tasks.join()
+        if self.errors:
+            error, self.errors = self.errors[0], []
+            raise error
+
+    def handle_chat(self, updates: list[UpdateObj]) -> None:
+        """
+        Handle updates of one chat in order
+        :param updates: updates of chat
+        :return: None
+        """
+        for update in updates:
+            self.handler(update)
+
+    def work(self) -> None:
+        """
+        Run tasks until dispatcher is closed
+        :return: None
+        """
+        try:
+            while (task := self.tasks.get()) is not None:
+                try:
+                    task()
+                except Exception as error:
+                    self.errors.append(error)
+                finally:
+                    # Connections of worker threads are not closed by requests
+                    close_old_connections()
+                    self.tasks.task_done()
+        finally:
+            connections.close_all()
+
+    def close(self) -> None:
+        """
+        Stop workers after handled updates
+        :return: None
+        """
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
@@ -0,0 +1,67 @@
+import time
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+
+from bot.dispatcher import ChatDispatcher
+from bot.tg.schemas import UpdateObj
+
+
+class Command(BaseCommand):
+    """
+    Measure throughput of chat dispatcher with slow Telegram
+    """
+
+    help = 'Benchmark handling of updates of many chats by worker threads'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--chats', type=int, default=16, help='Number of chats')
+        parser.add_argument(
+            '--per-chat', type=int, default=2, help='Number of updates of chat'
+        )
+        parser.add_argument(
+            '--latency',
+            type=float,
+            default=0.05,
+            help='Seconds of Telegram request made by handler of update',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            action='append',
+            help='Number of workers, 1 and 8 by default',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Dispatch the same updates by each number of workers
+        :param args:
+        :param options:
+        :return: None
+        """
+        chats = options['chats']
+        updates = [
+            UpdateObj(
+                update_id=number * chats + chat,
+                message={'chat': {'id': chat}, 'text': f'message {number}'},
+            )
+            for number in range(options['per_chat'])
+            for chat in range(1, chats + 1)
+        ]
+        latency = options['latency']
+
+        def handler(update: UpdateObj) -> None:
+            time.sleep(latency)
+
+        for workers in options['workers'] or [1, 8]:
+            dispatcher = ChatDispatcher(handler, workers=workers)
+            try:
+                started = time.perf_counter()
+                dispatcher.dispatch(updates)
+                elapsed = time.perf_counter() - started
+            finally:
+                dispatcher.close()
+            self.stdout.write(
+                f'{workers} workers: {len(updates)} updates in {elapsed:.2f}s, '
+                f'{len(updates) / elapsed:.0f} updates/s'
+            )
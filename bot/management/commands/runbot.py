@@ -1,12 +1,25 @@
+import time
+from functools import partial
 from typing import Any
 
-from django.core.management import BaseCommand
+from django.conf import settings
+from django.core.management import BaseCommand, CommandParser
+from django.db import close_old_connections
 from django.db.models import QuerySet
 
+from bot.dispatcher import ChatDispatcher
 from bot.models import TgUser
-from bot.tg.client import TgClient
-from bot.tg.schemas import Message, GetUpdatesResponse, SendMessageResponse
-from goals.models import Goal, GoalCategory
+from bot.outbox import Outbox
+from bot.states import chat_states
+from bot.tg.client import TgClient, TgClientError
+from bot.tg.schemas import (
+    Message,
+    GetUpdatesResponse,
+    UpdateObj,
+)
+from bot.updates import update_queue
+from core.db.routers import use_replicas
+from goals.models import Board, Goal, GoalCategory
 
 
 class Command(BaseCommand):
@@ -15,21 +28,126 @@ class Command(BaseCommand):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.tg_client: TgClient = TgClient()
-        self.states: dict = {}
+        self.outbox: Outbox = Outbox(self.tg_client)
+        self.stats_reported: float = time.monotonic()
+        self.states = chat_states
+        self.primary_until: dict[int, float] = {}
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--workers', type=int, default=8, help='Chats handled concurrently'
+        )
+        parser.add_argument(
+            '--queue',
+            action='store_true',
+            help='Handle updates received by webhook instead of polling',
+        )
+        parser.add_argument(
+            '--wait', type=float, default=5, help='Max wait for queued update'
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         """
-        Wait updates and return message
+        Handle updates from polling or from webhook queue
         :param args:
         :param options:
-        :return: message
+        :return: None
+        """
+        dispatcher = ChatDispatcher(self.handle_update, workers=options['workers'])
+        try:
+            if options['queue']:
+                self.drain_queue(dispatcher, options['workers'], options['wait'])
+            else:
+                self.poll(dispatcher)
+        finally:
+            dispatcher.close()
+            self.outbox.close()
+
+    def poll(self, dispatcher: ChatDispatcher) -> None:
+        """
+        Wait updates and return message, offset is moved after batch of
+        updates is handled
+        :param dispatcher: dispatcher of updates
+        :return: None
         """
         offset: int = 0
         while True:
-            res: GetUpdatesResponse = self.tg_client.get_updates(offset=offset)
-            for item in res.result:
-                offset = item.update_id + 1
-                self.handle_message(item.message)
+            try:
+                res: GetUpdatesResponse = self.tg_client.get_updates(offset=offset)
+            except TgClientError as error:
+                self.stderr.write(str(error))
+                continue
+            if res.result:
+                dispatcher.dispatch(res.result)
+                offset = res.result[-1].update_id + 1
+            # Connection is not held while waiting for updates
+            close_old_connections()
+            self.report_stats()
+
+    def drain_queue(
+        self, dispatcher: ChatDispatcher, chats: int, wait: float, once: bool = False
+    ) -> None:
+        """
+        Handle queued updates of chats with oldest updates by workers, wait for
+        new updates when queue is empty
+        :param dispatcher: dispatcher of updates
+        :param chats: number of chats handled at once
+        :param wait: max wait for new update
+        :param once: return when queue is empty
+        :return: None
+        """
+        while True:
+            chat_ids = update_queue.chats(limit=chats)
+            if chat_ids:
+                dispatcher.run(
+                    partial(self.drain_chat, chat_id) for chat_id in chat_ids
+                )
+            elif once:
+                return
+            else:
+                update_queue.wait(wait)
+            close_old_connections()
+            self.report_stats()
+
+    def drain_chat(self, chat_id: int, batch: int = 100) -> None:
+        """
+        Handle queued updates of chat unless other worker handles them, failed
+        update is removed so it does not block chat
+        :param chat_id: chat id
+        :param batch: max number of updates
+        :return: None
+        """
+        with update_queue.lock(chat_id) as locked:
+            if not locked:
+                return
+            for update in update_queue.pending(chat_id, limit=batch):
+                try:
+                    self.handle_update(UpdateObj(**update.data))
+                except Exception as error:
+                    self.stderr.write(f'Update {update.update_id} failed: {error!r}')
+                update_queue.remove(update)
+
+    def report_stats(self, interval: float = 60) -> None:
+        """
+        Write stats of outgoing messages once per interval
+        :param interval: seconds between reports
+        :return: None
+        """
+        if time.monotonic() - self.stats_reported >= interval:
+            self.stats_reported = time.monotonic()
+            self.stdout.write(f'Outbox: {self.outbox.stats()}')
+
+    def handle_update(self, update: UpdateObj) -> None:
+        """
+        Handle update in worker thread, failed update is logged so other
+        updates of batch are handled and offset is moved past it
+        :param update: update
+        :return: None
+        """
+        try:
+            self.handle_message(update.message)
+        except Exception as error:
+            self.stderr.write(f'Update {update.update_id} failed: {error!r}')
 
     def handle_message(self, message: Message) -> None:
         """
@@ -52,50 +170,42 @@ class Command(BaseCommand):
         :return: Answer from bot
         """
         commands: list[str] = ['/goals', '/create', '/cancel']
+        states: dict = self.states.get(message.chat.id)
 
-        if not self.states.get('state') and message.text not in commands:
-            self.tg_client.send_message(
-                chat_id=message.chat.id, text=f'Unknown command!'
-            )
+        if not states.get('state') and message.text not in commands:
+            self.outbox.send(chat_id=message.chat.id, text=f'Unknown command!')
 
         if message.text == '/cancel':
-            self.states = {}
-            self.tg_client.send_message(
-                chat_id=message.chat.id, text='Operation was canceled'
-            )
+            states.clear()
+            self.outbox.send(chat_id=message.chat.id, text='Operation was canceled')
 
-        if not self.states and message.text in commands:
+        if not states and message.text in commands:
             if message.text == '/goals':
                 self._get_goals(message, tg_user)
 
             if message.text == '/create':
-                self.states['state'] = 'creating'
-                self._get_categories(message=message, tg_user=tg_user)
-
-        if (
-            self.states.get('state') == 'getting goal title'
-            and message.text not in commands
-        ):
-            self.states['goal_title'] = message.text
+                states['state'] = 'creating'
+                self._get_categories(message=message, tg_user=tg_user, states=states)
+
+        if states.get('state') == 'getting goal title' and message.text not in commands:
+            states['goal_title'] = message.text
             self._create_goal(
                 chat_id=message.chat.id,
-                title=self.states.get('goal_title'),
+                title=states.get('goal_title'),
                 user_id=tg_user.user.id,
-                category_id=self.states.get('user_category_id'),
+                category_id=states.get('user_category_id'),
             )
-            self.states = {}
+            states.clear()
 
-        if self.states.get('state') == 'creating' and message.text not in commands:
-            if message.text in self.states['categories_id']:
-                self.tg_client.send_message(
-                    chat_id=message.chat.id, text='Input goal title'
-                )
-                self.states['user_category_id'] = int(message.text)
-                self.states['state'] = 'getting goal title'
+        if states.get('state') == 'creating' and message.text not in commands:
+            if message.text in states['categories_id']:
+                self.outbox.send(chat_id=message.chat.id, text='Input goal title')
+                states['user_category_id'] = int(message.text)
+                states['state'] = 'getting goal title'
             else:
-                self.tg_client.send_message(
-                    chat_id=message.chat.id, text='Wrong category!'
-                )
+                self.outbox.send(chat_id=message.chat.id, text='Wrong category!')
+
+        self.states.set(message.chat.id, states)
 
     def handler_unauthorized_user(self, tg_user: TgUser, message: Message) -> None:
         """
@@ -108,36 +218,39 @@ class Command(BaseCommand):
         tg_user.verification_code = verification_code
         tg_user.save()
 
-        self.tg_client.send_message(
+        self.outbox.send(
             chat_id=message.chat.id,
             text=f'Your verification code is {tg_user.verification_code}',
         )
 
-    def _get_goals(self, message: Message, tg_user: TgUser) -> SendMessageResponse:
+    def _get_goals(self, message: Message, tg_user: TgUser) -> None:
         """
         Return user goals or "No goals" if goals does not exist
         :param message: user message
         :param tg_user: telegram user
-        :return: Message with user goals
+        :return: None
         """
         query_set: QuerySet = (
             Goal.objects.select_related('user')
             .filter(user_id=tg_user.user.id, category__is_deleted=False)
             .exclude(status=Goal.Status.archived)
         )
-        goals = [f'{goal.id} {goal.title}' for goal in query_set]
+        chat_id = message.chat.id
+        with use_replicas(self.primary_until.get(chat_id, 0) < time.monotonic()):
+            goals = [f'{goal.id} {goal.title}' for goal in query_set]
         if not goals:
             text = 'No goals'
         else:
             text = '\n'.join(goals)
-        return self.tg_client.send_message(chat_id=message.chat.id, text=text)
+        self.outbox.send(chat_id=message.chat.id, text=text)
 
-    def _get_categories(self, message: Message, tg_user: TgUser) -> SendMessageResponse:
+    def _get_categories(self, message: Message, tg_user: TgUser, states: dict) -> None:
         """
         Return user categories or "No categories" if categories does not exist
         :param message: user message
         :param tg_user: telegram user
-        :return: Message with user categories
+        :param states: state of chat
+        :return: None
         """
         query_set: QuerySet = GoalCategory.objects.filter(
             board__participants__user=tg_user.user
@@ -145,25 +258,30 @@ class Command(BaseCommand):
         categories: list[str] = [
             f'{category.id} {category.title}' for category in query_set
         ]
-        self.states['categories_id'] = [str(cat.id) for cat in query_set]
+        states['categories_id'] = [str(cat.id) for cat in query_set]
         if not categories:
             text: str = 'No categories'
         else:
             text = '\n'.join(categories)
-        return self.tg_client.send_message(chat_id=message.chat.id, text=text)
+        self.outbox.send(chat_id=message.chat.id, text=text)
 
     def _create_goal(
         self, chat_id: int, title: str | None, user_id: int, category_id: int | None
-    ) -> SendMessageResponse:
+    ) -> None:
         """
         Create goal
         :param chat_id: user chat id
         :param title: goal title
         :param user_id: user id
         :param category_id: chosen category id
-        :return: Message of success creating
+        :return: None
         """
-        Goal.objects.create(user_id=user_id, title=title, category_id=category_id)
-        return self.tg_client.send_message(
-            chat_id=chat_id, text=f'Goal {title} created!'
+        goal = Goal.objects.create(
+            user_id=user_id, title=title, category_id=category_id
+        )
+        Board.bump_version(goal.board_id)
+        # Goals of chat are read from primary until replicas receive new goal
+        self.primary_until[chat_id] = (
+            time.monotonic() + settings.DATABASE_REPLICA_STICKINESS
         )
+        self.outbox.send(chat_id=chat_id, text=f'Goal {title} created!')
@@ -0,0 +1,38 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, CommandParser
+from django.urls import reverse
+
+from bot.tg.client import TgClient
+
+
+class Command(BaseCommand):
+    """
+    Switch bot between webhook and polling modes
+    """
+
+    help = 'Send updates to webhook of site, runbot --queue handles them'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('url', nargs='?', help='Base url of site, https://site')
+        parser.add_argument(
+            '--delete', action='store_true', help='Remove webhook to use polling'
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Set or remove webhook
+        :param args:
+        :param options:
+        :return: None
+        """
+        if options['delete']:
+            TgClient().set_webhook(url='', secret_token='')
+            self.stdout.write('Webhook removed')
+            return
+        if not options['url'] or not settings.BOT_WEBHOOK_SECRET:
+            raise CommandError('Url and BOT_WEBHOOK_SECRET are required')
+        url = options['url'].rstrip('/') + reverse('bot:webhook')
+        TgClient().set_webhook(url=url, secret_token=settings.BOT_WEBHOOK_SECRET)
+        self.stdout.write(f'Webhook set to {url}')
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.7 on 2026-10-18 04:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TgUpdate',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('update_id', models.BigIntegerField(unique=True)),
+                ('chat_id', models.BigIntegerField()),
+                ('data', models.JSONField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='tgupdate',
+            index=models.Index(
+                fields=['chat_id', 'update_id'], name='tgupdate_chat_update_idx'
+            ),
+        ),
+    ]
@@ -24,3 +24,21 @@ class TgUser(models.Model):
         :return: verification code
         """
         return get_random_string(length=50)
+
+
+class TgUpdate(models.Model):
+    """
+    Update received by webhook and waiting for queue worker
+    """
+
+    update_id = models.BigIntegerField(unique=True)
+    chat_id = models.BigIntegerField()
+    data = models.JSONField()
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('chat_id', 'update_id'), name='tgupdate_chat_update_idx'
+            )
+        ]
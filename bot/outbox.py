@@ -0,0 +1,310 @@
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+from bot.tg.client import TgClient
+
+MAX_MESSAGE_LENGTH = 4096
+
+
+class SharedRateLimit:
+    """
+    Limit of actions per window counted in cache shared by processes. Window
+    of burst / rate seconds allows burst actions, counters expire with window
+    """
+
+    def __init__(
+        self, name: str, rate: float, burst: float = 1, alias: str = 'bot_limits'
+    ) -> None:
+        self.name = name
+        self.limit = burst
+        self.window = burst / rate
+        self.alias = alias
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    def acquire(self, key: str | int = '') -> float:
+        """
+        Take permission for action if limit of current window is not reached
+        :param key: key of limited object, e.g. chat id
+        :return: seconds until next window, 0 if permission is taken
+        """
+        now = time.time()
+        window = int(now // self.window)
+        cache_key = f'bot:limit:{self.name}:{key}:{window}'
+        timeout = math.ceil(self.window) + 1
+        self.cache.add(cache_key, 0, timeout)
+        try:
+            count = self.cache.incr(cache_key)
+        except ValueError:
+            # Counter expired between add and incr
+            self.cache.add(cache_key, 1, timeout)
+            count = 1
+        if count <= self.limit:
+            return 0.0
+        return (window + 1) * self.window - now
+
+
+def split_text(text: str, length: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    Split text to parts not longer than length, by lines when possible
+    :param text: text
+    :param length: max length of part
+    :return: parts of text
+    """
+    parts = []
+    while len(text) > length:
+        end = text.rfind('\n', 0, length + 1)
+        if end <= 0:
+            parts.append(text[:length])
+            text = text[length:]
+        else:
+            parts.append(text[:end])
+            text = text[end + 1 :]
+    parts.append(text)
+    return parts
+
+
+class Outbox:
+    """
+    Queue of outgoing messages sent by background threads within Telegram
+    limits: global limit for all chats and limit of each chat. Limits are
+    counted in shared cache, so outboxes of bot and web processes together
+    stay within them. Messages queued to chat during window are merged into
+    one message up to 4096 characters, longer messages are split. Messages of
+    chat are sent in order, one at a time
+    """
+
+    def __init__(
+        self,
+        client: TgClient | None = None,
+        rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 1,
+        window: float = 0.1,
+        workers: int = 4,
+    ) -> None:
+        self.client = client
+        self.limit = SharedRateLimit('global', rate, rate)
+        self.chat_limit = SharedRateLimit('chat', chat_rate, chat_burst)
+        self.window = window
+        self.workers = workers
+        self.chats: dict[int, deque[tuple[str, float]]] = {}
+        # Monotonic time until chat limit is reached, chat is not checked before
+        self.chat_waits: dict[int, float] = {}
+        # Chat which took its chat permission and waits for global permission
+        self.reserved: int | None = None
+        self.in_flight: set[int] = set()
+        self.condition = threading.Condition()
+        self.thread: threading.Thread | None = None
+        self.executor: ThreadPoolExecutor | None = None
+        self.closed = False
+        self.counters = {
+            'queued': 0,
+            'sent': 0,
+            'merged': 0,
+            'split': 0,
+            'failed': 0,
+        }
+        self.latency = 0.0
+        self.latency_count = 0
+        self.max_latency = 0.0
+
+    def send(self, chat_id: int, text: str) -> None:
+        """
+        Queue message to chat, return without waiting for Telegram
+        :param chat_id: chat id
+        :param text: text message
+        :return: None
+        """
+        parts = split_text(text)
+        now = time.monotonic()
+        with self.condition:
+            self.start()
+            messages = self.chats.setdefault(chat_id, deque())
+            messages.extend((part, now) for part in parts)
+            self.counters['queued'] += 1
+            self.counters['split'] += len(parts) - 1
+            self.condition.notify_all()
+
+    def start(self) -> None:
+        """
+        Start sending thread if it is not running, called with lock held
+        :return: None
+        """
+        if self.thread is not None:
+            return
+        if self.client is None:
+            self.client = TgClient()
+        self.closed = False
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix='bot-outbox'
+        )
+        self.thread = threading.Thread(target=self.run, name='bot-outbox', daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """
+        Send messages of chats when their limits allow
+        :return: None
+        """
+        with self.condition:
+            while not (self.closed and not self.chats and not self.in_flight):
+                chat_id, delay = self.next_chat()
+                if chat_id is None:
+                    self.condition.wait(delay)
+                    continue
+                self.in_flight.add(chat_id)
+                text, enqueued = self.take_messages(chat_id)
+                self.executor.submit(self.deliver, chat_id, text, enqueued)
+
+    def next_chat(self) -> tuple[int | None, float | None]:
+        """
+        Find chat which message can be sent now and take its permissions,
+        called with lock held
+        :return: chat id or None and time to wait
+        """
+        now = time.monotonic()
+        chat_id = self.reserved
+        if chat_id is None:
+            chat_id, wait = self.ready_chat(now)
+            if chat_id is None:
+                return None, wait
+        wait = self.limit.acquire()
+        if wait:
+            self.reserved = chat_id
+            return None, wait
+        self.reserved = None
+        return chat_id, None
+
+    def ready_chat(self, now: float) -> tuple[int | None, float | None]:
+        """
+        Find chat after its window which can take chat permission, called
+        with lock held
+        :param now: monotonic time
+        :return: chat id or None and time to wait
+        """
+        waits = []
+        for chat_id, messages in self.chats.items():
+            if chat_id in self.in_flight:
+                continue
+            first_enqueued = messages[0][1]
+            wait = max(
+                first_enqueued + self.window - now,
+                self.chat_waits.get(chat_id, now) - now,
+            )
+            if wait <= 0:
+                wait = self.chat_limit.acquire(chat_id)
+                if not wait:
+                    return chat_id, None
+                self.chat_waits[chat_id] = now + wait
+            waits.append(wait)
+        return None, min(waits) if waits else None
+
+    def take_messages(self, chat_id: int) -> tuple[str, list[float]]:
+        """
+        Merge queued messages of chat up to max message length, called with
+        lock held
+        :param chat_id: chat id
+        :return: text and enqueue times of merged messages
+        """
+        messages = self.chats[chat_id]
+        text, enqueued = messages.popleft()
+        times = [enqueued]
+        while messages and len(text) + 1 + len(messages[0][0]) <= MAX_MESSAGE_LENGTH:
+            part, enqueued = messages.popleft()
+            text = f'{text}\n{part}'
+            times.append(enqueued)
+        self.counters['merged'] += len(times) - 1
+        if not messages:
+            del self.chats[chat_id]
+        return text, times
+
+    def deliver(self, chat_id: int, text: str, enqueued: list[float]) -> None:
+        """
+        Send message by client in worker thread
+        :param chat_id: chat id
+        :param text: text message
+        :param enqueued: enqueue times of merged messages
+        :return: None
+        """
+        try:
+            self.client.send_message(chat_id=chat_id, text=text)
+            failed = False
+        except Exception:
+            failed = True
+        now = time.monotonic()
+        with self.condition:
+            self.in_flight.discard(chat_id)
+            if failed:
+                self.counters['failed'] += 1
+            else:
+                self.counters['sent'] += 1
+                self.latency_count += len(enqueued)
+                for started in enqueued:
+                    self.latency += now - started
+                    self.max_latency = max(self.max_latency, now - started)
+            self.evict(now)
+            self.condition.notify_all()
+
+    def evict(self, now: float) -> None:
+        """
+        Remove passed waits of chat limits, called with lock held
+        :param now: monotonic time
+        :return: None
+        """
+        for chat_id, until in list(self.chat_waits.items()):
+            if until <= now:
+                del self.chat_waits[chat_id]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until queued messages are sent
+        :param timeout: max time of wait
+        :return: True if queue is empty
+        """
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.chats and not self.in_flight, timeout
+            )
+
+    def close(self) -> None:
+        """
+        Send queued messages and stop threads
+        :return: None
+        """
+        with self.condition:
+            if self.thread is None:
+                return
+            self.closed = True
+            self.condition.notify_all()
+            thread, self.thread = self.thread, None
+        thread.join()
+        self.executor.shutdown()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get queue depth, counters and latency from queueing to sending
+        :return: dict of outbox stats
+        """
+        with self.condition:
+            count = self.latency_count
+            return {
+                'depth': sum(len(messages) for messages in self.chats.values()),
+                'chats': len(self.chats),
+                'in_flight': len(self.in_flight),
+                **self.counters,
+                'avg_latency': round(self.latency / count, 6) if count else None,
+                'max_latency': round(self.max_latency, 6),
+            }
+
+
+outbox = Outbox()
@@ -0,0 +1,45 @@
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+
+class ChatStateStore:
+    """
+    Conversation state of chats in cache. Shared cache backend lets several
+    bot processes continue dialog of chat, state of chat expires after cache
+    timeout and least recently used states are evicted by cache backend
+    """
+
+    key_prefix = 'bot:state'
+
+    def __init__(self, alias: str = 'bot_states') -> None:
+        self.alias = alias
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    def make_key(self, chat_id: int) -> str:
+        return f'{self.key_prefix}:{chat_id}'
+
+    def get(self, chat_id: int) -> dict:
+        """
+        Get state of chat
+        :param chat_id: chat id
+        :return: state or empty dict if chat has no state
+        """
+        return self.cache.get(self.make_key(chat_id)) or {}
+
+    def set(self, chat_id: int, state: dict) -> None:
+        """
+        Save state of chat and restart its timeout, empty state is deleted
+        :param chat_id: chat id
+        :param state: state
+        :return: None
+        """
+        if state:
+            self.cache.set(self.make_key(chat_id), state)
+        else:
+            self.cache.delete(self.make_key(chat_id))
+
+
+chat_states = ChatStateStore()
@@ -1,17 +1,48 @@
+import time
+
 import requests
 from django.conf import settings
 from requests import Response
+from requests.adapters import HTTPAdapter
 
 from bot.tg.schemas import GetUpdatesResponse, SendMessageResponse
 
 
+class TgClientError(Exception):
+    """
+    Telegram returned error or could not be reached after retries
+    """
+
+
 class TgClient:
     """
-    Class with telegram bot interactions
+    Class with telegram bot interactions. Requests are sent by one keep-alive
+    session, failed requests are retried with exponential backoff, Telegram
+    flood limit is waited for retry_after seconds
     """
 
-    def __init__(self, token: str = settings.BOT_TOKEN) -> None:
+    retry_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        token: str = settings.BOT_TOKEN,
+        base_url: str = 'https://api.telegram.org',
+        connect_timeout: float = 5,
+        read_timeout: float = 10,
+        retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 10,
+    ) -> None:
         self.token = token
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def get_url(self, method: str) -> str:
         """
@@ -19,7 +50,48 @@ class TgClient:
         :param method: telegram method
         :return: url for request
         """
-        return f'https://api.telegram.org/bot{self.token}/{method}'
+        return f'{self.base_url}/bot{self.token}/{method}'
+
+    def request(
+        self, method: str, payload: dict, wait: float = 0, idempotent: bool = False
+    ) -> dict:
+        """
+        Send JSON request to telegram, retry on connection errors, flood limit
+        and server errors. Read timeout is retried only for idempotent methods,
+        message could be delivered already
+        :param method: telegram method
+        :param payload: request body
+        :param wait: time telegram holds request, added to read timeout
+        :param idempotent: request can be repeated after read timeout
+        :return: response data
+        """
+        timeout = (self.connect_timeout, self.read_timeout + wait)
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2**attempt
+            last_attempt = attempt == self.retries
+            try:
+                response: Response = self.session.post(
+                    self.get_url(method), json=payload, timeout=timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                retry = idempotent or not isinstance(error, requests.ReadTimeout)
+                if last_attempt or not retry:
+                    raise TgClientError(f'{method} failed: {error}') from error
+                time.sleep(delay)
+                continue
+
+            try:
+                data = response.json()
+            except ValueError:
+                data = {'ok': False, 'description': response.reason}
+            if response.status_code not in self.retry_statuses or last_attempt:
+                break
+            retry_after = data.get('parameters', {}).get('retry_after')
+            time.sleep(retry_after if retry_after is not None else delay)
+
+        if not data.get('ok'):
+            raise TgClientError(f'{method} failed: {data.get("description")}')
+        return data
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         """
@@ -28,10 +100,12 @@ class TgClient:
         :param timeout: timeout
         :return: response
         """
-        response: Response = requests.get(
-            self.get_url('getUpdates'), params={'offset': offset, 'timeout': timeout}
+        data = self.request(
+            'getUpdates',
+            {'offset': offset, 'timeout': timeout},
+            wait=timeout,
+            idempotent=True,
         )
-        data = response.json()
         return GetUpdatesResponse(**data)
 
     def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
@@ -41,8 +115,25 @@ class TgClient:
         :param text: text message
         :return: response
         """
-        response: Response = requests.get(
-            self.get_url('sendMessage'), params={'chat_id': chat_id, 'text': text}
-        )
-        data = response.json()
+        data = self.request('sendMessage', {'chat_id': chat_id, 'text': text})
         return SendMessageResponse(**data)
+
+    def set_webhook(self, url: str, secret_token: str) -> dict:
+        """
+        Send updates to webhook instead of getUpdates, empty url removes webhook
+        :param url: webhook url
+        :param secret_token: token sent in X-Telegram-Bot-Api-Secret-Token
+        :return: response data
+        """
+        return self.request(
+            'setWebhook',
+            {'url': url, 'secret_token': secret_token, 'allowed_updates': ['message']},
+            idempotent=True,
+        )
+
+    def close(self) -> None:
+        """
+        Close connections of session
+        :return: None
+        """
+        self.session.close()
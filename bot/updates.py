@@ -0,0 +1,105 @@
+import select
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Min
+
+from bot.models import TgUpdate
+
+CHANNEL = 'tg_updates'
+
+
+class UpdateQueue:
+    """
+    Durable queue of webhook updates in database. Workers of several processes
+    drain it, updates of one chat are handled by one worker at a time under
+    advisory lock of chat, so they stay in order
+    """
+
+    def put(self, update_id: int, chat_id: int, data: dict) -> None:
+        """
+        Add update, update delivered again by Telegram is ignored
+        :param update_id: update id
+        :param chat_id: chat id
+        :param data: raw update
+        :return: None
+        """
+        with transaction.atomic():
+            TgUpdate.objects.bulk_create(
+                [TgUpdate(update_id=update_id, chat_id=chat_id, data=data)],
+                ignore_conflicts=True,
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(f'NOTIFY {CHANNEL}')
+
+    def chats(self, limit: int) -> list[int]:
+        """
+        Get chats with waiting updates, chats with oldest updates first
+        :param limit: number of chats
+        :return: chat ids
+        """
+        return list(
+            TgUpdate.objects.values('chat_id')
+            .annotate(first_update_id=Min('update_id'))
+            .order_by('first_update_id')
+            .values_list('chat_id', flat=True)[:limit]
+        )
+
+    @contextmanager
+    def lock(self, chat_id: int) -> Iterator[bool]:
+        """
+        Try to take advisory lock of chat for current connection
+        :param chat_id: chat id
+        :return: True if lock is taken
+        """
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [chat_id])
+            locked = cursor.fetchone()[0]
+        try:
+            yield locked
+        finally:
+            if locked:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', [chat_id])
+
+    def pending(self, chat_id: int, limit: int) -> list[TgUpdate]:
+        """
+        Get waiting updates of chat in order
+        :param chat_id: chat id
+        :param limit: number of updates
+        :return: updates
+        """
+        return list(
+            TgUpdate.objects.filter(chat_id=chat_id).order_by('update_id')[:limit]
+        )
+
+    def remove(self, update: TgUpdate) -> None:
+        """
+        Remove handled update
+        :param update: update
+        :return: None
+        """
+        TgUpdate.objects.filter(id=update.id).delete()
+
+    def wait(self, timeout: float) -> None:
+        """
+        Wait for notification about new update, notification sent before
+        wait is missed and update is found after timeout
+        :param timeout: max time of wait
+        :return: None
+        """
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN {CHANNEL}')
+        raw_connection = connection.connection
+        try:
+            select.select([raw_connection], [], [], timeout)
+            raw_connection.poll()
+            raw_connection.notifies.clear()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(f'UNLISTEN {CHANNEL}')
+
+
+update_queue = UpdateQueue()
@@ -1,7 +1,9 @@
 from django.urls import path
 
-from bot.views import VerifyUserView
+from bot.views import OutboxStatsView, VerifyUserView, WebhookView
 
 urlpatterns = [
     path('verify', VerifyUserView.as_view(), name='verify_bot'),
+    path('webhook', WebhookView.as_view(), name='webhook'),
+    path('outbox/stats', OutboxStatsView.as_view(), name='outbox-stats'),
 ]
@@ -1,13 +1,18 @@
 from typing import Any
 
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from pydantic import ValidationError
 from rest_framework import generics, permissions
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from bot.models import TgUser
 from bot.serializer import TgUserSerializer
-from bot.tg.client import TgClient
+from bot.outbox import outbox
+from bot.tg.schemas import UpdateObj
+from bot.updates import update_queue
 
 
 # Create your views here.
@@ -40,6 +45,47 @@ class VerifyUserView(generics.GenericAPIView):
         tg_user.user = request.user
         tg_user.save()
 
-        TgClient().send_message(chat_id=tg_user.chat_id, text='Bot verificated')
+        outbox.send(chat_id=tg_user.chat_id, text='Bot verificated')
 
         return Response(TgUserSerializer(tg_user).data)
+
+
+class WebhookView(generics.GenericAPIView):
+    """
+    Receive updates from Telegram and put them to queue of runbot --queue
+    workers, response is returned without handling update
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Check secret token and queue update
+        :param request:
+        :param args:
+        :param kwargs:
+        :return: empty response
+        """
+        secret = settings.BOT_WEBHOOK_SECRET
+        token = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+        if not secret or not constant_time_compare(token, secret):
+            raise PermissionDenied
+        try:
+            update = UpdateObj(**request.data)
+        except (TypeError, ValidationError):
+            # Updates without message are not handled, Telegram must not resend them
+            return Response()
+        update_queue.put(update.update_id, update.message.chat.id, request.data)
+        return Response()
+
+
+class OutboxStatsView(generics.GenericAPIView):
+    """
+    Outgoing messages stats view of current process
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(outbox.stats())
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponseBase
+from rest_framework.request import Request
+
+
+class AsyncAPIViewMixin:
+    """
+    Dispatch of API view as coroutine. Async handlers run on event loop,
+    sync handlers of other methods run in thread like sync views under ASGI.
+    Authentication is run in thread, permissions with async methods are awaited,
+    sync permission methods are called on event loop and must not query database
+    """
+
+    view_is_async = True
+
+    async def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request: Request, *args: Any, **kwargs: Any) -> None:
+        """
+        Run content negotiation, authentication, permission and throttle checks
+        :param request: request
+        :return: None
+        """
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        negotiated = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = negotiated
+        request.version, request.versioning_scheme = self.determine_version(
+            request, *args, **kwargs
+        )
+        await sync_to_async(self.perform_authentication)(request)
+        await self.acheck_permissions(request)
+        self.check_throttles(request)
+
+    async def acheck_permissions(self, request: Request) -> None:
+        """
+        Check request permissions, raise exception if request is not permitted
+        :param request: request
+        :return: None
+        """
+        for permission in self.get_permissions():
+            if hasattr(permission, 'ahas_permission'):
+                allowed = await permission.ahas_permission(request, self)
+            else:
+                allowed = permission.has_permission(request, self)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
+
+    async def acheck_object_permissions(self, request: Request, obj: Any) -> None:
+        """
+        Check object permissions, raise exception if request is not permitted
+        :param request: request
+        :param obj: object
+        :return: None
+        """
+        for permission in self.get_permissions():
+            if hasattr(permission, 'ahas_object_permission'):
+                allowed = await permission.ahas_object_permission(request, self, obj)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None),
+                )
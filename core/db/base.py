@@ -0,0 +1,79 @@
+from functools import partial
+from typing import Any
+
+import psycopg2.extras
+from django.db.backends.postgresql import base, creation
+
+from core.db.pool import ConnectionPool, close_pools, get_pool
+
+
+def connect(conn_params: dict) -> base.Database.extensions.connection:
+    """
+    Open connection like PostgreSQL backend does
+    :param conn_params: connection params
+    :return: connection
+    """
+    connection = base.Database.connect(**conn_params)
+    psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+    return connection
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name: str, verbosity: int) -> None:
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend with connections from pool of process. Connection is
+    returned to pool when Django closes it, so with CONN_MAX_AGE = 0 request
+    holds connection only while it is handled. Pool is set by POOL settings:
+    MIN_SIZE, MAX_SIZE, TIMEOUT of wait for free connection and MAX_IDLE time
+    """
+
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params: dict) -> Any:
+        connection = self.get_pool(conn_params).acquire()
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self) -> None:
+        if self.connection is None:
+            return
+        pool = self.get_pool(self.get_connection_params())
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Connection stays referenced by atomic block until it exits
+                pool.discard(self.connection)
+            else:
+                pool.release(self.connection)
+
+    def get_pool(self, conn_params: dict) -> ConnectionPool:
+        """
+        Get pool of connections with these params in current process
+        :param conn_params: connection params
+        :return: connection pool
+        """
+        options = self.settings_dict.get('POOL', {})
+        return get_pool(
+            f'{self.alias}:{sorted(conn_params.items())}',
+            partial(
+                ConnectionPool,
+                connect=partial(connect, conn_params),
+                name=self.alias,
+                min_size=options.get('MIN_SIZE', 0),
+                max_size=options.get('MAX_SIZE', 10),
+                timeout=options.get('TIMEOUT', 10),
+                max_idle=options.get('MAX_IDLE', 300),
+                health_checks=self.settings_dict['CONN_HEALTH_CHECKS'],
+            ),
+        )
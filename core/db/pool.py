@@ -0,0 +1,245 @@
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+from psycopg2 import extensions
+
+PoolConnection = extensions.connection
+
+
+class PoolTimeout(Exception):
+    """
+    No connection was released while waiting
+    """
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of database connections of one process. Released
+    connections are kept open for reuse, connections idle longer than max idle
+    are closed except min size of them
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], PoolConnection],
+        name: str = 'default',
+        min_size: int = 0,
+        max_size: int = 10,
+        timeout: float = 10,
+        max_idle: float = 300,
+        health_checks: bool = True,
+    ) -> None:
+        self.connect = connect
+        self.name = name
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_checks = health_checks
+        self.pid = os.getpid()
+        self.size = 0
+        self.idle: deque[tuple[PoolConnection, float]] = deque()
+        self.condition = threading.Condition()
+        self.counters = {
+            'connections_created': 0,
+            'connections_closed': 0,
+            'requests': 0,
+            'waits': 0,
+            'timeouts': 0,
+        }
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def acquire(self) -> PoolConnection:
+        """
+        Get idle connection or open new one, wait for release if pool is full
+        :return: connection
+        """
+        started = time.monotonic()
+        waited = False
+        with self.condition:
+            self.counters['requests'] += 1
+            while True:
+                self.close_expired()
+                if self.idle:
+                    connection, _ = self.idle.pop()
+                    break
+                if self.size < self.max_size:
+                    self.size += 1
+                    connection = None
+                    break
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self.counters['timeouts'] += 1
+                    raise PoolTimeout(
+                        f'No free connection in pool of {self.max_size} '
+                        f'after {self.timeout} seconds'
+                    )
+                if not waited:
+                    waited = True
+                    self.counters['waits'] += 1
+                self.condition.wait(remaining)
+            if waited:
+                wait_time = time.monotonic() - started
+                self.wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+
+        if connection is not None and self.is_usable(connection):
+            return connection
+        if connection is not None:
+            self.discard(connection, reserved=True)
+        return self.open()
+
+    def release(self, connection: PoolConnection) -> None:
+        """
+        Return connection to pool, broken connections are closed
+        :param connection: connection
+        :return: None
+        """
+        if connection.closed:
+            self.discard(connection)
+            return
+        try:
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def open(self) -> PoolConnection:
+        """
+        Open new connection for reserved place in pool
+        :return: connection
+        """
+        try:
+            connection = self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+        with self.condition:
+            self.counters['connections_created'] += 1
+        return connection
+
+    def discard(self, connection: PoolConnection, reserved: bool = False) -> None:
+        """
+        Close connection and free its place in pool
+        :param connection: connection
+        :param reserved: keep place for new connection of acquiring thread
+        :return: None
+        """
+        if not connection.closed:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        with self.condition:
+            self.counters['connections_closed'] += 1
+            if not reserved:
+                self.size -= 1
+                self.condition.notify()
+
+    def is_usable(self, connection: PoolConnection) -> bool:
+        """
+        Check connection before reuse
+        :param connection: idle connection
+        :return: True if connection can be used
+        """
+        if connection.closed:
+            return False
+        if not self.health_checks:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def close_expired(self) -> None:
+        """
+        Close connections idle longer than max idle, called with lock held
+        :return: None
+        """
+        deadline = time.monotonic() - self.max_idle
+        while self.idle and self.size > self.min_size and self.idle[0][1] < deadline:
+            connection, _ = self.idle.popleft()
+            connection.close()
+            self.size -= 1
+            self.counters['connections_closed'] += 1
+
+    def close(self) -> None:
+        """
+        Close all idle connections
+        :return: None
+        """
+        with self.condition:
+            while self.idle:
+                connection, _ = self.idle.popleft()
+                connection.close()
+                self.size -= 1
+                self.counters['connections_closed'] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get pool size, usage counters and wait time
+        :return: dict of pool stats
+        """
+        with self.condition:
+            return {
+                'name': self.name,
+                'size': self.size,
+                'idle': len(self.idle),
+                'in_use': self.size - len(self.idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                **self.counters,
+                'wait_time': round(self.wait_time, 6),
+                'max_wait_time': round(self.max_wait_time, 6),
+            }
+
+
+pools: dict[str, ConnectionPool] = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(key: str, factory: Callable[[], ConnectionPool]) -> ConnectionPool:
+    """
+    Get pool of current process, forked process gets new pool
+    :param key: database alias and connection params
+    :param factory: function which creates pool
+    :return: connection pool
+    """
+    with pools_lock:
+        pool = pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            pool = pools[key] = factory()
+        return pool
+
+
+def close_pools() -> None:
+    """
+    Close idle connections of all pools of current process
+    :return: None
+    """
+    with pools_lock:
+        for pool in pools.values():
+            pool.close()
+
+
+def pools_stats() -> list[dict[str, Any]]:
+    """
+    Get stats of all pools of current process
+    :return: list of pool stats
+    """
+    with pools_lock:
+        return [pool.stats() for pool in pools.values() if pool.pid == os.getpid()]
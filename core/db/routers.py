@@ -0,0 +1,106 @@
+import random
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import Model
+
+
+@dataclass
+class ReplicaRouting:
+    """
+    Routing of reads in current request or bot command
+    """
+
+    use_replicas: bool = False
+    wrote: bool = False
+    replica: str | None = None
+
+
+routing: ContextVar[ReplicaRouting | None] = ContextVar('routing', default=None)
+
+# Replica alias and time until which it is not used after failed connection
+unavailable: dict[str, float] = {}
+
+
+@contextmanager
+def use_replicas(enabled: bool = True) -> Iterator[ReplicaRouting]:
+    """
+    Route reads in block to replicas until first write
+    :param enabled: read from replicas, reads go to primary if False
+    :return: routing of block
+    """
+    state = ReplicaRouting(use_replicas=enabled)
+    token = routing.set(state)
+    try:
+        yield state
+    finally:
+        routing.reset(token)
+
+
+def is_available(alias: str) -> bool:
+    """
+    Connect to replica if it is not connected, replica which can not be
+    connected is skipped for DATABASE_REPLICA_RETRY seconds
+    :param alias: replica alias
+    :return: True if replica can be used
+    """
+    if unavailable.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        unavailable[alias] = time.monotonic() + settings.DATABASE_REPLICA_RETRY
+        return False
+    unavailable.pop(alias, None)
+    return True
+
+
+class ReplicaRouter:
+    """
+    Send reads inside use_replicas block to one of DATABASE_REPLICAS and all
+    other queries to primary. Reads go to primary after write in the same
+    block, inside transaction of primary and when no replica is available
+    """
+
+    # Session missing on lagging replica would log user out
+    primary_apps = {'sessions'}
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str:
+        state = routing.get()
+        if (
+            state is None
+            or model._meta.app_label in self.primary_apps
+            or not state.use_replicas
+            or state.wrote
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        if state.replica is None or not is_available(state.replica):
+            replicas = [
+                alias for alias in settings.DATABASE_REPLICAS if is_available(alias)
+            ]
+            state.replica = random.choice(replicas) if replicas else None
+        return state.replica or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        state = routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool | None:
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,14 @@
+from django.db.models import CharField, lookups
+
+
+@CharField.register_lookup
+class ILikePrefix(lookups.StartsWith):
+    """
+    Case insensitive prefix match as column ILIKE 'prefix%'. Unlike istartswith
+    column is not wrapped in UPPER(), so trigram index of column serves it
+    """
+
+    lookup_name = 'ilike_prefix'
+
+    def get_rhs_op(self, connection, rhs: str) -> str:
+        return f'ILIKE {rhs}'
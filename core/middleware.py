@@ -0,0 +1,66 @@
+import asyncio
+from collections.abc import Callable
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.decorators import sync_and_async_middleware
+
+from core.db.routers import ReplicaRouting, use_replicas
+
+PRIMARY_COOKIE = 'use_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def reads_from_replicas(request: HttpRequest) -> bool:
+    """
+    Check that request may read from replicas: method is safe and client
+    did not write during stickiness window
+    :param request: request
+    :return: True if reads are routed to replicas
+    """
+    return request.method in SAFE_METHODS and PRIMARY_COOKIE not in request.COOKIES
+
+
+def stick_to_primary(
+    state: ReplicaRouting, request: HttpRequest, response: HttpResponseBase
+) -> None:
+    """
+    Send reads of client to primary for DATABASE_REPLICA_STICKINESS seconds
+    after write, so client sees its changes before replicas receive them
+    :param state: routing of request
+    :param request: request
+    :param response: response
+    :return: None
+    """
+    if request.method not in SAFE_METHODS or state.wrote:
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            '1',
+            max_age=settings.DATABASE_REPLICA_STICKINESS,
+            httponly=True,
+            samesite='Lax',
+        )
+
+
+@sync_and_async_middleware
+def replica_routing_middleware(get_response: Callable) -> Callable:
+    """
+    Route reads of safe method requests to replicas
+    """
+    if asyncio.iscoroutinefunction(get_response):
+
+        async def middleware(request: HttpRequest) -> HttpResponseBase:
+            with use_replicas(reads_from_replicas(request)) as state:
+                response = await get_response(request)
+            stick_to_primary(state, request, response)
+            return response
+
+    else:
+
+        def middleware(request: HttpRequest) -> HttpResponseBase:
+            with use_replicas(reads_from_replicas(request)) as state:
+                response = get_response(request)
+            stick_to_primary(state, request, response)
+            return response
+
+    return middleware
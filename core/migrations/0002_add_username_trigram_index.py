@@ -0,0 +1,25 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:01
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['username'],
+                name='user_username_trgm_idx',
+                opclasses=['gin_trgm_ops'],
+            ),
+        ),
+    ]
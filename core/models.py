@@ -1,4 +1,5 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 
 
 # Create your models here.
@@ -13,3 +14,10 @@ class User(AbstractUser):
     class Meta:
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = [
+            GinIndex(
+                fields=['username'],
+                name='user_username_trgm_idx',
+                opclasses=['gin_trgm_ops'],
+            ),
+        ]
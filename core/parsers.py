@@ -0,0 +1,61 @@
+from typing import IO, Any
+
+import msgpack
+import orjson
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class ORJSONParser(parsers.JSONParser):
+    """
+    Parser of JSON request body with orjson
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: dict | None = None,
+    ) -> Any:
+        """
+        Parse JSON request body
+        :param stream: request body stream
+        :param media_type: request media type
+        :param parser_context: parser context
+        :return: parsed data
+        """
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackParser(parsers.BaseParser):
+    """
+    Parser of MessagePack request body
+    """
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: str | None = None,
+        parser_context: dict | None = None,
+    ) -> Any:
+        """
+        Parse MessagePack request body
+        :param stream: request body stream
+        :param media_type: request media type
+        :param parser_context: parser context
+        :return: parsed data
+        """
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,180 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import msgpack
+import orjson
+from rest_framework import renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+# Dates are passed to DRF encoder, so they are formatted like by JSONRenderer,
+# int keys are converted to strings like by json module
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+JSON_ENCODER = JSONEncoder()
+
+
+def encode_default(obj: Any) -> Any:
+    """
+    Convert object which has no native representation like DRF JSONEncoder
+    :param obj: date, datetime, Decimal, lazy string or other object
+    :return: json compatible value
+    """
+    return JSON_ENCODER.default(obj)
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    Renderer which serializes to JSON with orjson,
+    output is equal to JSONRenderer output
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        """
+        Render data into JSON, pretty printed JSON is rendered by JSONRenderer
+        :param data: response data
+        :param accepted_media_type: accepted media type
+        :param renderer_context: renderer context
+        :return: JSON bytes
+        """
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace(
+            '\u2029'.encode(), b'\\u2029'
+        )
+
+
+class MessagePackRenderer(renderers.BaseRenderer):
+    """
+    Renderer which serializes to MessagePack, values are the same as in JSON
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        """
+        Render data into MessagePack
+        :param data: response data
+        :param accepted_media_type: accepted media type
+        :param renderer_context: renderer context
+        :return: MessagePack bytes
+        """
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+def flatten_row(row: dict, prefix: str = '') -> dict:
+    """
+    Flatten nested dicts of row to keys joined with dot
+    :param row: serialized object
+    :param prefix: key prefix of nested dict
+    :return: flat dict
+    """
+    flat = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            flat |= flatten_row(value, f'{prefix}{key}.')
+        else:
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+class StreamingRenderer(renderers.BaseRenderer):
+    """
+    Base renderer of rows which can be streamed row by row
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: dict | None = None,
+    ) -> bytes:
+        """
+        Render list of rows or one row, used for not streamed responses like errors
+        :param data: response data
+        :param accepted_media_type: accepted media type
+        :param renderer_context: renderer context
+        :return: rendered bytes
+        """
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        rows = [row if isinstance(row, dict) else {'detail': row} for row in rows]
+        fields = list(flatten_row(rows[0])) if rows else []
+        return b''.join(self.render_stream(rows, fields))
+
+    def render_stream(self, rows: Iterable[dict], fields: list[str]) -> Iterator[bytes]:
+        """
+        Render rows one by one
+        :param rows: serialized objects
+        :param fields: flat field names
+        :return: iterator of rendered chunks
+        """
+        raise NotImplementedError
+
+
+class CSVRenderer(StreamingRenderer):
+    """
+    Renderer which serializes rows to CSV with nested fields flattened
+    """
+
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render_stream(self, rows: Iterable[dict], fields: list[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        yield self.flush(buffer)
+        for row in rows:
+            writer.writerow(flatten_row(row))
+            yield self.flush(buffer)
+
+    @staticmethod
+    def flush(buffer: io.StringIO) -> bytes:
+        """
+        Get written text and clear buffer
+        :param buffer: text buffer
+        :return: encoded text
+        """
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text.encode()
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """
+    Renderer which serializes rows to newline delimited JSON
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render_stream(self, rows: Iterable[dict], fields: list[str]) -> Iterator[bytes]:
+        for row in rows:
+            yield orjson.dumps(
+                row, default=encode_default, option=ORJSON_OPTIONS
+            ) + b'\n'
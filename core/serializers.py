@@ -60,6 +60,15 @@ class ProfileSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'first_name', 'last_name', 'email')
 
 
+class UserAutocompleteSerializer(serializers.Serializer):
+    """
+    Username autocomplete serializer
+    """
+
+    id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+
+
 class LoginSerializer(serializers.Serializer):
     """
     Login serializer
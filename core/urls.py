@@ -1,10 +1,23 @@
 from django.urls import path
 
-from core.views import SingUpView, LoginView, ProfileView, UpdatePasswordView
+from core.views import (
+    SingUpView,
+    LoginView,
+    ProfileView,
+    UpdatePasswordView,
+    UserAutocompleteView,
+    DatabasePoolStatsView,
+)
 
 urlpatterns = [
     path('signup', SingUpView.as_view(), name='signup'),
     path('login', LoginView.as_view(), name='login'),
     path('profile', ProfileView.as_view(), name='profile'),
     path('update_password', UpdatePasswordView.as_view(), name='update_password'),
+    path(
+        'users/autocomplete',
+        UserAutocompleteView.as_view(),
+        name='user-autocomplete',
+    ),
+    path('db/pool/stats', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
 ]
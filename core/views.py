@@ -1,17 +1,24 @@
 from django.contrib.auth import authenticate, login, logout
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import BooleanField, ExpressionWrapper, Q, QuerySet
 from rest_framework import generics, status
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.serializers import Serializer
 from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.pagination import _positive_int
 from core.models import User
 from core.serializers import (
     CreateUserSerializer,
     ProfileSerializer,
     LoginSerializer,
     UpdatePasswordSerializer,
+    UserAutocompleteSerializer,
 )
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from core.db.pool import pools_stats
+from goals.models import Board
 
 
 # Create your views here.
@@ -85,6 +92,15 @@ class ProfileView(generics.RetrieveUpdateDestroyAPIView):
         """
         return self.request.user
 
+    def perform_update(self, serializer: Serializer) -> None:
+        """
+        Update profile and versions of boards which show user data
+        :param serializer: profile serializer
+        :return: None
+        """
+        super().perform_update(serializer)
+        Board.bump_user_versions(serializer.instance.id)
+
     def delete(self, request, *args, **kwargs) -> status.HTTP_204_NO_CONTENT:
         """Logout"""
         logout(request)
@@ -120,3 +136,67 @@ class UpdatePasswordView(generics.GenericAPIView):
         user.save(update_fields=['password'])
 
         return Response(serializer.data)
+
+
+class UserAutocompleteView(generics.ListAPIView):
+    """
+    Username autocomplete view
+    """
+
+    serializer_class = UserAutocompleteSerializer
+    permission_classes = [
+        IsAuthenticated,
+    ]
+    pagination_class = None
+    search_query_param = 'username'
+    limit_query_param = 'limit'
+    default_limit = 10
+    max_limit = 50
+
+    def get_limit(self) -> int:
+        """
+        Get number of returned users
+        :return: limit
+        """
+        try:
+            return _positive_int(
+                self.request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Get users with username starting with or similar to search term
+        :return: users with matched prefix first, then by similarity
+        """
+        term = self.request.query_params.get(self.search_query_param, '').strip()
+        if not term:
+            return User.objects.none()
+        return (
+            User.objects.filter(
+                Q(username__ilike_prefix=term) | Q(username__trigram_similar=term),
+                is_active=True,
+            )
+            .annotate(
+                is_prefix=ExpressionWrapper(
+                    Q(username__ilike_prefix=term), output_field=BooleanField()
+                ),
+                similarity=TrigramSimilarity('username', term),
+            )
+            .order_by('-is_prefix', '-similarity', 'username')
+            .values('id', 'username')[: self.get_limit()]
+        )
+
+
+class DatabasePoolStatsView(generics.GenericAPIView):
+    """
+    Database connection pools stats view of current process
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        return Response(pools_stats())
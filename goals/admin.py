@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from goals.models import GoalCategory, Goal, GoalComment
+from goals.models import GoalCategory, Goal, GoalComment, GoalCounter, CascadeTask
 
 
 # Register your models here.
@@ -34,3 +34,23 @@ class GoalCommentAdmin(admin.ModelAdmin):
 
     list_display = ('text', 'user', 'goal', 'created', 'updated')
     search_fields = ('text', 'user')
+
+
+@admin.register(CascadeTask)
+class CascadeTaskAdmin(admin.ModelAdmin):
+    """
+    Cascade task admin settings
+    """
+
+    list_display = ('board', 'category', 'status', 'processed', 'total', 'updated')
+    list_filter = ('status',)
+
+
+@admin.register(GoalCounter)
+class GoalCounterAdmin(admin.ModelAdmin):
+    """
+    Goal counter admin settings
+    """
+
+    list_display = ('board', 'category', 'status', 'priority', 'overdue', 'count')
+    list_filter = ('status', 'priority')
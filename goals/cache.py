@@ -0,0 +1,73 @@
+import threading
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+
+class ResponseCache:
+    """
+    Cache of response data with hit, miss and set counters of current process.
+    Keys contain board versions, so entries are never invalidated explicitly,
+    outdated ones are evicted by cache backend
+    """
+
+    key_prefix = 'response'
+
+    def __init__(self, alias: str = 'responses') -> None:
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.alias]
+
+    def make_key(self, etag: str) -> str:
+        return f'{self.key_prefix}:{etag.strip(chr(34))}'
+
+    def get(self, etag: str) -> Any | None:
+        """
+        Get cached response data
+        :param etag: response ETag
+        :return: response data or None if it is not cached
+        """
+        data = self.cache.get(self.make_key(etag))
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def set(self, etag: str, data: Any) -> None:
+        """
+        Cache response data
+        :param etag: response ETag
+        :param data: response data
+        :return: None
+        """
+        self.cache.set(self.make_key(etag), data)
+        with self._lock:
+            self.sets += 1
+
+    def stats(self) -> dict:
+        """
+        Get cache counters and configured size limit, size of backend storage
+        is not exposed by cache API
+        :return: dict with cache stats
+        """
+        options = settings.CACHES[self.alias].get('OPTIONS', {})
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'sets': self.sets,
+                'max_entries': options.get('MAX_ENTRIES'),
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,58 @@
+from datetime import timedelta
+from typing import Callable
+
+from django.db import transaction
+from django.utils import timezone
+
+from goals.models import Board, CascadeTask, Goal, GoalComment
+
+
+def run_cascade_task(
+    task: CascadeTask,
+    chunk_size: int = 1000,
+    on_progress: Callable[[CascadeTask], None] | None = None,
+    lease: timedelta | None = None,
+) -> CascadeTask:
+    """
+    Archive goals of deleted board or category in id range chunks.
+    Every chunk is committed with task position, so task can be resumed
+    :param task: cascade task
+    :param chunk_size: max number of goals archived in one transaction
+    :param on_progress: callback called after every chunk
+    :param lease: claim of task is extended by lease with every chunk
+    :return: done task
+    """
+    goals = task.get_goals().exclude(status=Goal.Status.archived)
+    board_id = task.board_id or task.category.board_id
+    if task.status == CascadeTask.Status.pending:
+        task.total = goals.count()
+        task.status = CascadeTask.Status.running
+        task.save(update_fields=('total', 'status', 'updated'))
+
+    while True:
+        chunk = list(
+            goals.filter(id__gt=task.last_goal_id)
+            .order_by('id')
+            .values_list('id', flat=True)[:chunk_size]
+        )
+        if not chunk:
+            break
+        with transaction.atomic():
+            task.processed += goals.filter(
+                id__gt=task.last_goal_id, id__lte=chunk[-1]
+            ).update(status=Goal.Status.archived)
+            GoalComment.objects.filter(goal_id__in=chunk).update(goal_archived=True)
+            task.last_goal_id = chunk[-1]
+            update_fields = ['processed', 'last_goal_id', 'updated']
+            if lease is not None:
+                task.claimed_until = timezone.now() + lease
+                update_fields.append('claimed_until')
+            task.save(update_fields=update_fields)
+            Board.bump_version(board_id)
+        if on_progress:
+            on_progress(task)
+
+    task.status = CascadeTask.Status.done
+    task.claimed_until = None
+    task.save(update_fields=('status', 'claimed_until', 'updated'))
+    return task
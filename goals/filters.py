@@ -1,8 +1,22 @@
+import re
+
 import django_filters
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramSimilarity,
+)
 from django.db import models
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Greatest
 from django_filters import rest_framework
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.views import APIView
+
+from goals.models import Goal, GOAL_SEARCH_CONFIG, goal_search_vector
 
-from goals.models import Goal
+SEARCH_RANK = 'search_rank'
 
 
 class GoalDateFilter(rest_framework.FilterSet):
@@ -22,3 +36,88 @@ class GoalDateFilter(rest_framework.FilterSet):
     filter_overrides = {
         models.DateTimeField: {'filter_class': django_filters.IsoDateTimeFilter},
     }
+
+
+class GoalSearchFilter(filters.SearchFilter):
+    """
+    Full text prefix search by goal title and description
+    """
+
+    search_config = GOAL_SEARCH_CONFIG
+
+    def get_search_query(self, request: Request) -> SearchQuery | None:
+        """
+        Build prefix query which matches all words of search terms
+        :param request: request
+        :return: search query or None if there is no words to search
+        """
+        words = [
+            word
+            for term in self.get_search_terms(request)
+            for word in re.findall(r'\w+', term)
+        ]
+        if not words:
+            return None
+        return SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            search_type='raw',
+            config=self.search_config,
+        )
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: APIView
+    ) -> QuerySet:
+        if not self.get_search_terms(request):
+            return queryset
+        query = self.get_search_query(request)
+        if query is None:
+            return queryset.none()
+        vector = goal_search_vector()
+        return (
+            queryset.alias(search_vector=vector)
+            .filter(search_vector=query)
+            .annotate(**{SEARCH_RANK: SearchRank(vector, query)})
+        )
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """
+    Search with trigram similarity in similar search mode
+    """
+
+    search_mode_param = 'search_mode'
+    similar_search_mode = 'similar'
+
+    def filter_queryset(
+        self, request: Request, queryset: QuerySet, view: APIView
+    ) -> QuerySet:
+        if request.query_params.get(self.search_mode_param) != self.similar_search_mode:
+            return super().filter_queryset(request, queryset, view)
+
+        term = ' '.join(self.get_search_terms(request))
+        search_fields = self.get_search_fields(view, request)
+        if not term or not search_fields:
+            return queryset
+
+        condition = Q()
+        for field in search_fields:
+            condition |= Q(**{f'{field}__trigram_similar': term})
+        similarities = [TrigramSimilarity(field, term) for field in search_fields]
+        rank = Greatest(*similarities) if len(similarities) > 1 else similarities[0]
+        return queryset.filter(condition).annotate(**{SEARCH_RANK: rank})
+
+
+class RankedOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter which puts best search matches first by default
+    """
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet, view: APIView
+    ) -> list[str]:
+        if (
+            self.ordering_param not in request.query_params
+            and SEARCH_RANK in queryset.query.annotations
+        ):
+            return [f'-{SEARCH_RANK}', *self.get_default_ordering(view)]
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,168 @@
+import csv
+import io
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import IO, Any
+
+import orjson
+from django.db import transaction
+from rest_framework.exceptions import PermissionDenied
+
+from core.models import User
+from goals.models import Board, Goal, GoalCategory, GoalCounter
+from goals.roles import BoardRoles
+from goals.serializers import GoalImportSerializer
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+@dataclass
+class ImportResult:
+    """
+    Progress of goals import
+    """
+
+    rows: int = 0
+    created: int = 0
+    committed_rows: int = 0
+    errors_count: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+
+def read_rows(file: IO[bytes], file_format: str) -> Iterator[dict | Exception]:
+    """
+    Read rows from file one by one
+    :param file: binary file
+    :param file_format: csv or ndjson
+    :return: iterator of rows or parse errors of rows
+    """
+    if file_format == 'csv':
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                break
+            except csv.Error as error:
+                yield error
+                continue
+            except UnicodeDecodeError as error:
+                # Rest of file can not be decoded
+                yield ValueError(f'File is not UTF-8 encoded: {error.reason}')
+                break
+            yield {key: value for key, value in row.items() if value not in ('', None)}
+        text.detach()
+        return
+
+    for line in file:
+        if not line.strip():
+            continue
+        try:
+            row = orjson.loads(line)
+        except orjson.JSONDecodeError as error:
+            yield error
+            continue
+        yield row if isinstance(row, dict) else ValueError('Expected an object')
+
+
+class GoalImporter:
+    """
+    Import goals of user in batches, every batch is validated with batched
+    lookup of categories and is committed in its own transaction
+    """
+
+    def __init__(
+        self, user: User, batch_size: int = 1000, max_errors: int = 1000
+    ) -> None:
+        self.user = user
+        self.board_roles = BoardRoles(user.id)
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    def run(
+        self,
+        rows: Iterable[dict | Exception],
+        offset: int = 0,
+        on_batch: Callable[[ImportResult], None] | None = None,
+    ) -> ImportResult:
+        """
+        Import rows after offset
+        :param rows: rows or parse errors of rows
+        :param offset: number of rows imported before, from committed_rows
+        :param on_batch: callback called after every committed batch
+        :return: import result
+        """
+        result = ImportResult(rows=offset, committed_rows=offset)
+        rows = islice(rows, offset, None)
+        while batch := list(islice(rows, self.batch_size)):
+            start = result.rows + 1
+            result.rows += len(batch)
+            result.created += self.import_batch(enumerate(batch, start), result)
+            result.committed_rows = result.rows
+            if on_batch:
+                on_batch(result)
+        return result
+
+    def import_batch(
+        self, batch: Iterable[tuple[int, dict | Exception]], result: ImportResult
+    ) -> int:
+        """
+        Validate and create goals of batch
+        :param batch: numbered rows
+        :param result: import result for row errors
+        :return: number of created goals
+        """
+        valid: list[tuple[int, dict]] = []
+        for number, row in batch:
+            if isinstance(row, Exception):
+                self.add_error(result, number, {'detail': [str(row)]})
+                continue
+            serializer = GoalImportSerializer(data=row)
+            if serializer.is_valid():
+                valid.append((number, serializer.validated_data))
+            else:
+                self.add_error(result, number, dict(serializer.errors))
+
+        categories: dict[int, GoalCategory] = GoalCategory.objects.filter(
+            is_deleted=False
+        ).in_bulk({data['category'] for _, data in valid})
+
+        goals: list[Goal] = []
+        for number, data in valid:
+            category = categories.get(data.pop('category'))
+            if category is None:
+                self.add_error(result, number, {'category': ['Category not found']})
+                continue
+            if not self.board_roles.can_write(category.board_id):
+                self.add_error(
+                    result, number, {'detail': [PermissionDenied.default_detail]}
+                )
+                continue
+            goals.append(
+                Goal(
+                    category=category,
+                    board_id=category.board_id,
+                    user_id=self.user.id,
+                    **data,
+                )
+            )
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(goals)
+            GoalCounter.apply_changes([(None, goal.counter_key) for goal in goals])
+            Board.bump_version(*{goal.board_id for goal in goals})
+        return len(goals)
+
+    def add_error(self, result: ImportResult, number: int, errors: Any) -> None:
+        """
+        Add row errors to result, errors over limit are only counted
+        :param result: import result
+        :param number: row number
+        :param errors: row errors
+        :return: None
+        """
+        result.errors_count += 1
+        if len(result.errors) < self.max_errors:
+            result.errors.append({'row': number, 'errors': errors})
@@ -0,0 +1,92 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import requests
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+
+class Command(BaseCommand):
+    """
+    Measure throughput and latency of API under concurrent clients
+    """
+
+    help = 'Benchmark concurrent GET requests to running API server'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('url', help='Base url of server, http://127.0.0.1:8000')
+        parser.add_argument('--username', required=True, help='User to login')
+        parser.add_argument('--password', required=True, help='Password of user')
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help='Requested path, goal list and board list by default',
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=32, help='Number of clients'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=2000, help='Total number of requests'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=100, help='Requests before measurement'
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Login, warm up server and send requests from concurrent clients
+        :param args:
+        :param options:
+        :return: None
+        """
+        url = options['url'].rstrip('/')
+        paths = options['paths'] or [
+            '/goals/goal/list?limit=100',
+            '/goals/board/list',
+        ]
+        cookies = self.login(url, options['username'], options['password'])
+        local = threading.local()
+
+        def send(number: int) -> tuple[float, int]:
+            if not hasattr(local, 'session'):
+                local.session = requests.Session()
+                local.session.cookies.update(cookies)
+            started = time.perf_counter()
+            response = local.session.get(url + paths[number % len(paths)])
+            return time.perf_counter() - started, response.status_code
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            list(executor.map(send, range(options['warmup'])))
+            started = time.perf_counter()
+            results = list(executor.map(send, range(options['requests'])))
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status in results if status != 200)
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{len(results)} requests, {options["concurrency"]} clients: '
+            f'{len(results) / elapsed:.0f} req/s, '
+            f'p50 {percentiles[49] * 1000:.1f} ms, '
+            f'p99 {percentiles[98] * 1000:.1f} ms, '
+            f'{errors} errors'
+        )
+
+    @staticmethod
+    def login(url: str, username: str, password: str) -> dict:
+        """
+        Get session cookies of user
+        :param url: base url of server
+        :param username: username
+        :param password: password
+        :return: cookies
+        """
+        response = requests.post(
+            f'{url}/core/login', json={'username': username, 'password': password}
+        )
+        if response.status_code != 200:
+            raise CommandError(f'Login failed: {response.status_code}')
+        return response.cookies.get_dict()
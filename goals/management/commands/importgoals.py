@@ -0,0 +1,78 @@
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+from core.models import User
+from goals.importer import IMPORT_FORMATS, GoalImporter, ImportResult, read_rows
+
+
+class Command(BaseCommand):
+    """
+    Import goals from CSV or NDJSON file
+    """
+
+    help = 'Import goals from CSV or NDJSON file'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help='Path to CSV or NDJSON file')
+        parser.add_argument(
+            '--user',
+            required=True,
+            help='Username of importing user, goals are created on his boards',
+        )
+        parser.add_argument(
+            '--file-format',
+            choices=IMPORT_FORMATS,
+            help='File format, file extension by default',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Max number of goals created in one transaction',
+        )
+        parser.add_argument(
+            '--offset',
+            type=int,
+            default=0,
+            help='Number of rows imported before, to resume import',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Import file and write progress after every batch
+        :param args:
+        :param options:
+        :return: None
+        """
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} not found')
+        file_format = options['file_format'] or options['path'].rsplit('.', 1)[-1]
+        if file_format not in IMPORT_FORMATS:
+            raise CommandError(f'Unknown file format {file_format}')
+
+        importer = GoalImporter(user, batch_size=options['batch_size'])
+        with open(options['path'], 'rb') as file:
+            result = importer.run(
+                read_rows(file, file_format),
+                offset=options['offset'],
+                on_batch=self.report_progress,
+            )
+        for error in result.errors:
+            self.stderr.write(f'Row {error["row"]}: {error["errors"]}')
+        self.stdout.write(
+            f'Imported {result.created} goals from {result.rows} rows, '
+            f'{result.errors_count} errors'
+        )
+
+    def report_progress(self, result: ImportResult) -> None:
+        """
+        Write import progress
+        :param result: import result
+        :return: None
+        """
+        self.stdout.write(
+            f'Committed {result.committed_rows} rows: {result.created} goals'
+        )
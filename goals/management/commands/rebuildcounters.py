@@ -0,0 +1,63 @@
+from datetime import timedelta
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+from django.utils import timezone
+
+from goals.models import Board, GoalCounter
+
+
+class Command(BaseCommand):
+    """
+    Recount goal counters of boards from goals
+    """
+
+    help = 'Recount goal counters of boards'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--board',
+            type=int,
+            action='append',
+            dest='boards',
+            help='Board id, all boards are recounted by default',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Max number of boards recounted in one transaction',
+        )
+        parser.add_argument(
+            '--rollover',
+            type=int,
+            metavar='DAYS',
+            help='Recount only boards with goals which became overdue during '
+            'last days, run daily after midnight with 1',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Recount boards in batches, every batch is committed separately
+        :param args:
+        :param options:
+        :return: None
+        """
+        batch_size = options['batch_size']
+        if options['rollover'] is not None:
+            since = timezone.now().date() - timedelta(days=options['rollover'])
+            boards = GoalCounter.roll_over(since, batch_size)
+            self.stdout.write(
+                f'Rolled over {boards} boards with goals due since {since}'
+            )
+            return
+
+        board_ids = options['boards'] or list(
+            Board.objects.filter(is_deleted=False)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        rows = 0
+        for start in range(0, len(board_ids), batch_size):
+            rows += GoalCounter.rebuild(board_ids[start : start + batch_size])
+        self.stdout.write(f'Recounted {len(board_ids)} boards: {rows} counters')
@@ -0,0 +1,75 @@
+import time
+from datetime import timedelta
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from goals.cascade import run_cascade_task
+from goals.models import CascadeTask
+
+
+class Command(BaseCommand):
+    """
+    Run background archiving of goals of deleted boards and categories
+    """
+
+    help = 'Archive goals of deleted boards and categories'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--once', action='store_true', help='Run queued tasks and exit'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Max number of goals archived in one transaction',
+        )
+        parser.add_argument(
+            '--lease',
+            type=float,
+            default=300,
+            help='Seconds task stays claimed by worker without progress',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait for new tasks',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """
+        Run pending and interrupted tasks claimed one by one, so several
+        workers can run tasks concurrently, then wait for new ones
+        :param args:
+        :param options:
+        :return: None
+        """
+        lease = timedelta(seconds=options['lease'])
+        while True:
+            while (task := CascadeTask.claim(lease)) is not None:
+                try:
+                    run_cascade_task(
+                        task,
+                        chunk_size=options['chunk_size'],
+                        on_progress=self.report_progress,
+                        lease=lease,
+                    )
+                finally:
+                    if task.status != CascadeTask.Status.done:
+                        task.release()
+                self.stdout.write(f'Task {task.id} done: {task.processed} goals')
+            if options['once']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def report_progress(self, task: CascadeTask) -> None:
+        """
+        Write task progress
+        :param task: cascade task
+        :return: None
+        """
+        self.stdout.write(f'Task {task.id}: {task.processed}/{task.total}')
@@ -0,0 +1,99 @@
+# Generated by Django 4.1.7 on 2026-10-18 02:57
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0007_alter_board_created_alter_board_updated_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='board',
+            index=models.Index(
+                condition=models.Q(('is_deleted', False)),
+                fields=['title'],
+                name='board_title_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='boardparticipant',
+            index=models.Index(
+                fields=['user', 'board', 'role'], name='participant_user_board_idx'
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['category', 'title', 'id'],
+                name='goal_category_title_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['category', 'created', 'id'],
+                name='goal_category_created_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['category', 'due_date'],
+                name='goal_category_due_date_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['title', 'id'],
+                name='goal_title_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['created', 'id'],
+                name='goal_created_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['user', 'category'],
+                name='goal_user_category_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(
+                condition=models.Q(('is_deleted', False)),
+                fields=['board', 'title', 'id'],
+                name='category_board_title_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=models.Index(
+                condition=models.Q(('is_deleted', False)),
+                fields=['board', 'created', 'id'],
+                name='category_board_created_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(
+                fields=['goal', 'created'], name='comment_goal_created_idx'
+            ),
+        ),
+    ]
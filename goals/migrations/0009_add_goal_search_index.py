@@ -0,0 +1,27 @@
+# Generated by Django 4.1.7 on 2026-10-18 02:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0008_add_list_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goal',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.SearchVector(
+                    'title', 'description', config='simple'
+                ),
+                condition=models.Q(('status', 4), _negated=True),
+                name='goal_search_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:01
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('core', '0002_add_username_trigram_index'),
+        ('goals', '0009_add_goal_search_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goalcategory',
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(('is_deleted', False)),
+                fields=['title'],
+                name='category_title_trgm_idx',
+                opclasses=['gin_trgm_ops'],
+            ),
+        ),
+    ]
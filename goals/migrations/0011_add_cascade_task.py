@@ -0,0 +1,78 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0010_add_category_title_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CascadeTask',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                (
+                    'status',
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, 'В очереди'),
+                            (2, 'Выполняется'),
+                            (3, 'Выполнено'),
+                        ],
+                        default=1,
+                        verbose_name='Статус',
+                    ),
+                ),
+                (
+                    'last_goal_id',
+                    models.BigIntegerField(
+                        default=0, verbose_name='Последняя обработанная цель'
+                    ),
+                ),
+                (
+                    'processed',
+                    models.PositiveIntegerField(default=0, verbose_name='Обработано'),
+                ),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Всего')),
+                (
+                    'board',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name='cascade_tasks',
+                        to='goals.board',
+                        verbose_name='Доска',
+                    ),
+                ),
+                (
+                    'category',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name='cascade_tasks',
+                        to='goals.goalcategory',
+                        verbose_name='Категория',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Каскадное удаление',
+                'verbose_name_plural': 'Каскадные удаления',
+            },
+        ),
+    ]
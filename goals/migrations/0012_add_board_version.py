@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0011_add_cascade_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='version',
+            field=models.PositiveIntegerField(default=0, verbose_name='Версия'),
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 10000
+
+
+def backfill_board(apps, schema_editor):
+    """
+    Copy board of category to goals and board of goal to comments
+    in id range batches, every batch is committed separately
+    """
+    GoalCategory = apps.get_model('goals', 'GoalCategory')
+    Goal = apps.get_model('goals', 'Goal')
+    GoalComment = apps.get_model('goals', 'GoalComment')
+    sources = (
+        (Goal, GoalCategory, 'category_id'),
+        (GoalComment, Goal, 'goal_id'),
+    )
+    for model, parent, parent_field in sources:
+        board_id = models.Subquery(
+            parent.objects.filter(id=models.OuterRef(parent_field)).values('board_id')[
+                :1
+            ]
+        )
+        last_id = 0
+        while True:
+            ids = list(
+                model.objects.filter(id__gt=last_id)
+                .order_by('id')
+                .values_list('id', flat=True)[:BATCH_SIZE]
+            )
+            if not ids:
+                break
+            model.objects.filter(id__gt=last_id, id__lte=ids[-1]).update(
+                board_id=board_id
+            )
+            last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0012_add_board_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='goals',
+                to='goals.board',
+                verbose_name='Доска',
+            ),
+        ),
+        migrations.AddField(
+            model_name='goalcomment',
+            name='board',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='comments',
+                to='goals.board',
+                verbose_name='Доска',
+            ),
+        ),
+        migrations.RunPython(backfill_board, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='goal',
+            name='board',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='goals',
+                to='goals.board',
+                verbose_name='Доска',
+            ),
+        ),
+        migrations.AlterField(
+            model_name='goalcomment',
+            name='board',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='comments',
+                to='goals.board',
+                verbose_name='Доска',
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:13
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0013_add_goal_comment_board'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['board', 'title', 'id'],
+                name='goal_board_title_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goal',
+            index=models.Index(
+                condition=models.Q(('status', 4), _negated=True),
+                fields=['board', 'created', 'id'],
+                name='goal_board_created_idx',
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(
+                fields=['board', 'created'], name='comment_board_created_idx'
+            ),
+        ),
+    ]
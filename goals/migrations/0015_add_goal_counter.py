@@ -0,0 +1,108 @@
+# Generated by Django 4.1.7 on 2026-10-18 03:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.utils import timezone
+
+
+def count_goals(apps, schema_editor):
+    """
+    Fill counters from active goals, goals not done after due date are overdue
+    """
+    Goal = apps.get_model('goals', 'Goal')
+    GoalCounter = apps.get_model('goals', 'GoalCounter')
+    overdue = models.Case(
+        models.When(~models.Q(status=3), due_date__lt=timezone.now().date(), then=True),
+        default=False,
+        output_field=models.BooleanField(),
+    )
+    GoalCounter.objects.bulk_create(
+        GoalCounter(**row)
+        for row in Goal.objects.filter(category__is_deleted=False)
+        .exclude(status=4)
+        .values('board_id', 'category_id', 'status', 'priority', overdue=overdue)
+        .annotate(count=models.Count('id'))
+        .order_by()
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0014_add_board_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalCounter',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'status',
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, 'К выполнению'),
+                            (2, 'В процессе'),
+                            (3, 'Выполнено'),
+                            (4, 'Архив'),
+                        ],
+                        verbose_name='Статус',
+                    ),
+                ),
+                (
+                    'priority',
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, 'Низкий'),
+                            (2, 'Средний'),
+                            (3, 'Высокий'),
+                            (4, 'Критический'),
+                        ],
+                        verbose_name='Приоритет',
+                    ),
+                ),
+                (
+                    'overdue',
+                    models.BooleanField(default=False, verbose_name='Просрочены'),
+                ),
+                ('count', models.IntegerField(default=0, verbose_name='Количество')),
+                (
+                    'board',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='goal_counters',
+                        to='goals.board',
+                        verbose_name='Доска',
+                    ),
+                ),
+                (
+                    'category',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='goal_counters',
+                        to='goals.goalcategory',
+                        verbose_name='Категория',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Счетчик целей',
+                'verbose_name_plural': 'Счетчики целей',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='goalcounter',
+            constraint=models.UniqueConstraint(
+                fields=('board', 'category', 'status', 'priority', 'overdue'),
+                name='goal_counter_key',
+            ),
+        ),
+        migrations.RunPython(count_goals, migrations.RunPython.noop),
+    ]
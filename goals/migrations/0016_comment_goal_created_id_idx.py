@@ -0,0 +1,28 @@
+# Generated by Django 4.1.7 on 2026-10-18 09:40
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0015_add_goal_counter'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='goalcomment',
+            index=models.Index(
+                fields=['goal', 'created', 'id'], name='comment_goal_created_id_idx'
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name='goalcomment',
+            name='comment_goal_created_idx',
+        ),
+    ]
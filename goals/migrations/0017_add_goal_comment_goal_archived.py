@@ -0,0 +1,42 @@
+# Generated by Django 4.1.7 on 2026-10-18 10:20
+
+from django.db import migrations, models
+
+BATCH_SIZE = 10000
+ARCHIVED = 4
+
+
+def backfill_goal_archived(apps, schema_editor):
+    """
+    Mark comments of archived goals in goal id range batches,
+    every batch is committed separately
+    """
+    Goal = apps.get_model('goals', 'Goal')
+    GoalComment = apps.get_model('goals', 'GoalComment')
+    archived = Goal.objects.filter(status=ARCHIVED).order_by('id')
+    last_id = 0
+    while True:
+        goal_ids = list(
+            archived.filter(id__gt=last_id).values_list('id', flat=True)[:BATCH_SIZE]
+        )
+        if not goal_ids:
+            break
+        GoalComment.objects.filter(goal_id__in=goal_ids).update(goal_archived=True)
+        last_id = goal_ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('goals', '0016_comment_goal_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goalcomment',
+            name='goal_archived',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_goal_archived, migrations.RunPython.noop),
+    ]
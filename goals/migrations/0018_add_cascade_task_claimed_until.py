@@ -0,0 +1,19 @@
+# Generated by Django 4.1.7 on 2026-10-18 11:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('goals', '0017_add_goal_comment_goal_archived'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cascadetask',
+            name='claimed_until',
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name='Захвачена до'
+            ),
+        ),
+    ]
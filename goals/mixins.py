@@ -0,0 +1,322 @@
+import hashlib
+import json
+from calendar import timegm
+from datetime import datetime
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db.models import Model
+from django.http import Http404, HttpResponseBase, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from core.async_views import AsyncAPIViewMixin
+from core.renderers import CSVRenderer, NDJSONRenderer
+from goals.cache import ResponseCache, response_cache
+from goals.models import Board, GoalCategory, Goal, GoalComment
+from goals.roles import get_board_roles, get_board_id
+from goals.values import ValuesSerializer
+
+
+class BoardVersionMixin:
+    """
+    Bump version of board after create, update or delete of its content
+    """
+
+    def perform_create(self, serializer: BaseSerializer) -> None:
+        super().perform_create(serializer)
+        Board.bump_version(get_board_id(serializer.instance))
+
+    def perform_update(self, serializer: BaseSerializer) -> None:
+        board_id = get_board_id(serializer.instance)
+        super().perform_update(serializer)
+        Board.bump_version(board_id, get_board_id(serializer.instance))
+
+    def perform_destroy(
+        self, instance: Board | GoalCategory | Goal | GoalComment
+    ) -> None:
+        super().perform_destroy(instance)
+        Board.bump_version(get_board_id(instance))
+
+
+class ConditionalGetMixin:
+    """
+    Answer 304 Not Modified to conditional GET before queryset is evaluated.
+    Validators are built from versions of user boards, so they are changed
+    by any write to board content, by change of user boards and by profile
+    change of users shown on boards
+    """
+
+    def get_validators(self) -> tuple[str | None, datetime | None]:
+        """
+        Get ETag and last modified date of response
+        :return: ETag of all user boards versions and no last modified date
+        """
+        boards = get_board_roles(self.request).boards
+        versions = sorted(
+            (board_id, state.version) for board_id, state in boards.items()
+        )
+        return self.make_etag(versions), None
+
+    def get_board_validators(self, board_id: int) -> tuple[str | None, datetime | None]:
+        """
+        Get ETag and last modified date from version of one board
+        :param board_id: board id
+        :return: ETag and last modified date or None if board is not available
+        """
+        state = get_board_roles(self.request).boards.get(board_id)
+        if state is None or state.is_deleted:
+            return None, None
+        return self.make_etag(state.version), state.updated
+
+    def make_etag(self, state: Any) -> str:
+        """
+        Make ETag of state, request user, renderer and normalized query params
+        :param state: boards state which response depends on
+        :return: quoted ETag
+        """
+        request: Request = self.request
+        key = json.dumps(
+            [
+                request.user.id,
+                request.path,
+                request.accepted_renderer.format,
+                sorted(request.query_params.lists()),
+                state,
+            ]
+        )
+        return quote_etag(hashlib.md5(key.encode()).hexdigest())
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+
+        response = self.get_cached_response(request, etag, last_modified)
+        if response is None:
+            response = self.cache_response(etag, super().get(request, *args, **kwargs))
+        return self.set_validators(response, etag, last_modified)
+
+    def get_cached_response(
+        self, request: Request, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase | None:
+        """
+        Get response which is answered without building of response data
+        :param request: request
+        :param etag: ETag of response
+        :param last_modified: last modified date of response
+        :return: Not Modified or Precondition Failed response or None
+        """
+        return get_conditional_response(
+            request, etag=etag, last_modified=self.get_timestamp(last_modified)
+        )
+
+    def cache_response(self, etag: str, response: HttpResponseBase) -> HttpResponseBase:
+        """
+        Save full response data, not cached by default
+        :param etag: ETag of response
+        :param response: full response
+        :return: response
+        """
+        return response
+
+    def set_validators(
+        self, response: HttpResponseBase, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase:
+        """
+        Add ETag and Last-Modified headers to successful or conditional response
+        :param response: response
+        :param etag: ETag of response
+        :param last_modified: last modified date of response
+        :return: response
+        """
+        if response.status_code not in (200, 304, 412):
+            return response
+        response.headers['ETag'] = etag
+        timestamp = self.get_timestamp(last_modified)
+        if timestamp:
+            response.headers['Last-Modified'] = http_date(timestamp)
+        return response
+
+    @staticmethod
+    def get_timestamp(last_modified: datetime | None) -> int | None:
+        return timegm(last_modified.utctimetuple()) if last_modified else None
+
+
+class CachedResponseMixin(ConditionalGetMixin):
+    """
+    Cache response data by ETag. ETag is changed by board version bump,
+    so write to board content makes cached responses unreachable
+    """
+
+    response_cache: ResponseCache = response_cache
+
+    def get_cached_response(
+        self, request: Request, etag: str, last_modified: datetime | None
+    ) -> HttpResponseBase | None:
+        response = super().get_cached_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        data = self.response_cache.get(etag)
+        if data is None:
+            return None
+        response = Response(data)
+        response.headers['X-Cache'] = 'HIT'
+        return response
+
+    def cache_response(self, etag: str, response: HttpResponseBase) -> HttpResponseBase:
+        if response.status_code == 200:
+            self.response_cache.set(etag, response.data)
+        response.headers['X-Cache'] = 'MISS'
+        return response
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """
+    Conditional GET of async view, roles of user are loaded with async query,
+    full response is built by aget_response of async list or retrieve mixin
+    """
+
+    async def get(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        await get_board_roles(request).aload()
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return await self.aget_response(request, *args, **kwargs)
+
+        response = self.get_cached_response(request, etag, last_modified)
+        if response is None:
+            response = self.cache_response(
+                etag, await self.aget_response(request, *args, **kwargs)
+            )
+        return self.set_validators(response, etag, last_modified)
+
+
+class ValuesListMixin:
+    """
+    List objects from queryset values() with read only fast serialization,
+    output is equal to output of view serializer
+    """
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        values_serializer = ValuesSerializer(self.get_serializer())
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *values_serializer.columns
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                values_serializer.to_representation_many(page)
+            )
+        return Response(values_serializer.to_representation_many(queryset))
+
+
+class AsyncValuesListMixin(AsyncAPIViewMixin, ValuesListMixin):
+    """
+    List objects from queryset values() in async view
+    """
+
+    async def get(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        return await self.aget_response(request, *args, **kwargs)
+
+    async def aget_response(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        """
+        Get list response, filters are applied in thread because filter
+        forms validate model choices with queries
+        :param request: request
+        :return: response
+        """
+        values_serializer = ValuesSerializer(self.get_serializer())
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        queryset = queryset.values(*values_serializer.columns)
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, self)
+            if page is not None:
+                return self.get_paginated_response(
+                    values_serializer.to_representation_many(page)
+                )
+        rows = [row async for row in queryset]
+        return Response(values_serializer.to_representation_many(rows))
+
+
+class AsyncRetrieveMixin(AsyncAPIViewMixin):
+    """
+    Retrieve object in async view
+    """
+
+    async def get(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        return await self.aget_response(request, *args, **kwargs)
+
+    async def aget_response(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> Response:
+        """
+        Get retrieve response
+        :param request: request
+        :return: response
+        """
+        instance = await self.aget_object()
+        return Response(self.get_serializer(instance).data)
+
+    async def aget_object(self) -> Model:
+        """
+        Get object by lookup field and check object permissions
+        :return: object or not found error
+        """
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await self.acheck_object_permissions(self.request, obj)
+        return obj
+
+
+class ExportMixin:
+    """
+    Stream all filtered objects of list view as CSV or NDJSON.
+    Rows are read from server side cursor, so memory does not depend on
+    number of objects and first rows are sent before query is finished
+    """
+
+    renderer_classes = [CSVRenderer, NDJSONRenderer]
+    # Rows are read while response is iterated, ASGI application serves
+    # these views by WSGI handler in thread
+    sync_streaming = True
+    pagination_class = None
+    chunk_size = 2000
+    export_name = 'export'
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        values_serializer = ValuesSerializer(self.get_serializer())
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *values_serializer.columns
+        )
+        rows = map(
+            values_serializer.to_representation,
+            queryset.iterator(chunk_size=self.chunk_size),
+        )
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.render_stream(rows, values_serializer.field_names()),
+            content_type=renderer.media_type,
+        )
+        response.headers[
+            'Content-Disposition'
+        ] = f'attachment; filename="{self.export_name}.{renderer.format}"'
+        return response
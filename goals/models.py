@@ -1,8 +1,26 @@
-from django.db import models
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, models, transaction
+from django.utils import timezone
 
 from core.models import User
 
 
+GOAL_SEARCH_CONFIG = 'simple'
+
+
+def goal_search_vector() -> SearchVector:
+    """
+    Full text search vector of goal title and description
+    :return: search vector expression
+    """
+    return SearchVector('title', 'description', config=GOAL_SEARCH_CONFIG)
+
+
 class BaseModel(models.Model):
     """
     Base model with created and updated date
@@ -23,9 +41,47 @@ class Board(BaseModel):
     class Meta:
         verbose_name = 'Доска'
         verbose_name_plural = 'Доски'
+        indexes = [
+            models.Index(
+                fields=['title'],
+                name='board_title_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     title = models.CharField(verbose_name='Название', max_length=255)
     is_deleted = models.BooleanField(verbose_name='Удалена', default=False)
+    version = models.PositiveIntegerField(verbose_name='Версия', default=0)
+
+    @classmethod
+    def bump_version(cls, *board_ids: int) -> None:
+        """
+        Increase version of boards after change of board or its content
+        :param board_ids: board ids
+        :return: None
+        """
+        cls.objects.filter(id__in=set(board_ids)).update(
+            version=models.F('version') + 1, updated=timezone.now()
+        )
+
+    @classmethod
+    def bump_user_versions(cls, user_id: int) -> None:
+        """
+        Increase version of boards which show data of user after profile change:
+        boards of user and boards with user categories, goals or comments
+        :param user_id: user id
+        :return: None
+        """
+        board_ids = (
+            BoardParticipant.objects.filter(user_id=user_id)
+            .values_list('board_id', flat=True)
+            .union(
+                GoalCategory.objects.filter(user_id=user_id).values_list('board_id'),
+                Goal.objects.filter(user_id=user_id).values_list('board_id'),
+                GoalComment.objects.filter(user_id=user_id).values_list('board_id'),
+            )
+        )
+        cls.bump_version(*board_ids)
 
 
 class BoardParticipant(BaseModel):
@@ -37,6 +93,11 @@ class BoardParticipant(BaseModel):
         unique_together = ('board', 'user')
         verbose_name = 'Участник'
         verbose_name_plural = 'Участники'
+        indexes = [
+            models.Index(
+                fields=['user', 'board', 'role'], name='participant_user_board_idx'
+            ),
+        ]
 
     class Role(models.IntegerChoices):
         """
@@ -75,6 +136,24 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
+        indexes = [
+            models.Index(
+                fields=['board', 'title', 'id'],
+                name='category_board_title_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['board', 'created', 'id'],
+                name='category_board_created_idx',
+                condition=models.Q(is_deleted=False),
+            ),
+            GinIndex(
+                fields=['title'],
+                name='category_title_trgm_idx',
+                opclasses=['gin_trgm_ops'],
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
     board = models.ForeignKey(
         Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='categories'
@@ -86,6 +165,27 @@ class GoalCategory(BaseModel):
     def __str__(self) -> str:
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_board_id = instance.__dict__.get('board_id')
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Save category, move its goals and comments if board was changed
+        """
+        loaded_board_id = getattr(self, '_loaded_board_id', None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if loaded_board_id is not None and loaded_board_id != self.board_id:
+                Goal.objects.filter(category=self).update(board_id=self.board_id)
+                GoalComment.objects.filter(goal__category=self).update(
+                    board_id=self.board_id
+                )
+                GoalCounter.objects.filter(category=self).update(board_id=self.board_id)
+        self._loaded_board_id = self.board_id
+
 
 class Goal(BaseModel):
     """
@@ -95,6 +195,54 @@ class Goal(BaseModel):
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        # Partial indexes skip archived goals (status 4), they are never listed
+        indexes = [
+            models.Index(
+                fields=['category', 'title', 'id'],
+                name='goal_category_title_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['category', 'created', 'id'],
+                name='goal_category_created_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['category', 'due_date'],
+                name='goal_category_due_date_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['title', 'id'],
+                name='goal_title_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['created', 'id'],
+                name='goal_created_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['user', 'category'],
+                name='goal_user_category_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['board', 'title', 'id'],
+                name='goal_board_title_idx',
+                condition=~models.Q(status=4),
+            ),
+            models.Index(
+                fields=['board', 'created', 'id'],
+                name='goal_board_created_idx',
+                condition=~models.Q(status=4),
+            ),
+            GinIndex(
+                goal_search_vector(),
+                name='goal_search_idx',
+                condition=~models.Q(status=4),
+            ),
+        ]
 
     class Status(models.IntegerChoices):
         """
@@ -121,6 +269,10 @@ class Goal(BaseModel):
     category = models.ForeignKey(
         'goals.GoalCategory', on_delete=models.PROTECT, related_name='goals'
     )
+    # Copy of category board, kept by save to filter goals without joins
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='goals'
+    )
     due_date = models.DateField(null=True, blank=True)
     user = models.ForeignKey('core.User', on_delete=models.PROTECT)
     status = models.PositiveSmallIntegerField(
@@ -133,6 +285,79 @@ class Goal(BaseModel):
     def __str__(self) -> str:
         return self.title
 
+    @property
+    def counter_key(self) -> tuple | None:
+        """
+        Key of goal counter row
+        :return: board, category, status, priority and overdue flag or None
+            if archived
+        """
+        if self.status == self.Status.archived:
+            return None
+        return (
+            self.board_id,
+            self.category_id,
+            self.status,
+            self.priority,
+            self.is_overdue,
+        )
+
+    @property
+    def is_overdue(self) -> bool:
+        """
+        Goal is not done after its due date
+        :return: True if goal is overdue today
+        """
+        return (
+            self.due_date is not None
+            and self.due_date < timezone.now().date()
+            and self.status != self.Status.done
+        )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_category_id = instance.__dict__.get('category_id')
+        instance._loaded_status = instance.__dict__.get('status')
+        instance._loaded_counter_key = instance.counter_key
+        return instance
+
+    @property
+    def archived_changed(self) -> bool:
+        """
+        Goal was archived or restored since it was loaded
+        :return: True if archived status is changed
+        """
+        loaded_status = getattr(self, '_loaded_status', None)
+        archived = self.Status.archived
+        return loaded_status is not None and (loaded_status == archived) != (
+            self.status == archived
+        )
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Save goal with board of its category, move comments if board was changed,
+        copy archived status to comments, update goal counters
+        """
+        loaded_board_id = self.board_id
+        loaded_counter_key = getattr(self, '_loaded_counter_key', None)
+        if self.board_id is None or self.category_id != getattr(
+            self, '_loaded_category_id', None
+        ):
+            self.board_id = self.category.board_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'board'}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if loaded_board_id is not None and loaded_board_id != self.board_id:
+                GoalComment.objects.filter(goal=self).update(board_id=self.board_id)
+            GoalComment.set_goal_archived([self])
+            GoalCounter.apply_changes([(loaded_counter_key, self.counter_key)])
+        self._loaded_category_id = self.category_id
+        self._loaded_status = self.status
+        self._loaded_counter_key = self.counter_key
+
 
 class GoalComment(BaseModel):
     """
@@ -142,7 +367,290 @@ class GoalComment(BaseModel):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['goal', 'created', 'id'], name='comment_goal_created_id_idx'
+            ),
+            models.Index(fields=['board', 'created'], name='comment_board_created_idx'),
+        ]
 
     user = models.ForeignKey('core.User', on_delete=models.CASCADE)
     text = models.TextField()
     goal = models.ForeignKey('goals.Goal', on_delete=models.CASCADE)
+    # Copy of goal board, kept by save and by goal and category moves
+    board = models.ForeignKey(
+        Board, verbose_name='Доска', on_delete=models.PROTECT, related_name='comments'
+    )
+    # Copy of goal archived status, kept by save and by goal archiving
+    goal_archived = models.BooleanField(default=False)
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Save comment with board and archived status of its goal
+        """
+        if self.board_id is None:
+            self.board_id = self.goal.board_id
+            self.goal_archived = self.goal.status == Goal.Status.archived
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def set_goal_archived(cls, goals: Iterable[Goal]) -> None:
+        """
+        Copy archived status of archived or restored goals to their comments
+        :param goals: saved goals
+        :return: None
+        """
+        changed: dict[bool, list[int]] = {True: [], False: []}
+        for goal in goals:
+            if goal.archived_changed:
+                changed[goal.status == Goal.Status.archived].append(goal.id)
+        for goal_archived, goal_ids in changed.items():
+            if goal_ids:
+                cls.objects.filter(goal_id__in=goal_ids).update(
+                    goal_archived=goal_archived
+                )
+
+
+class GoalCounter(models.Model):
+    """
+    Number of active goals of category with same status, priority and overdue
+    flag. Rows are changed in transactions which write goals, goals of deleted
+    categories are not counted. Goals become overdue without write, so boards
+    with goals due since last day are recounted by daily rollover
+    """
+
+    class Meta:
+        verbose_name = 'Счетчик целей'
+        verbose_name_plural = 'Счетчики целей'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'category', 'status', 'priority', 'overdue'],
+                name='goal_counter_key',
+            ),
+        ]
+
+    board = models.ForeignKey(
+        Board,
+        verbose_name='Доска',
+        on_delete=models.CASCADE,
+        related_name='goal_counters',
+    )
+    category = models.ForeignKey(
+        GoalCategory,
+        verbose_name='Категория',
+        on_delete=models.CASCADE,
+        related_name='goal_counters',
+    )
+    status = models.PositiveSmallIntegerField(
+        verbose_name='Статус', choices=Goal.Status.choices
+    )
+    priority = models.PositiveSmallIntegerField(
+        verbose_name='Приоритет', choices=Goal.Priority.choices
+    )
+    overdue = models.BooleanField(verbose_name='Просрочены', default=False)
+    count = models.IntegerField(verbose_name='Количество', default=0)
+
+    @classmethod
+    def apply_changes(
+        cls, changes: Iterable[tuple[tuple | None, tuple | None]]
+    ) -> None:
+        """
+        Move goals between counter rows with one upsert
+        :param changes: pairs of goal counter keys before and after change
+        :return: None
+        """
+        deltas: Counter = Counter()
+        for old_key, new_key in changes:
+            if old_key == new_key:
+                continue
+            if old_key is not None:
+                deltas[old_key] -= 1
+            if new_key is not None:
+                deltas[new_key] += 1
+        # Rows are locked in the same order by all writers to avoid deadlocks
+        rows = sorted((*key, delta) for key, delta in deltas.items() if delta)
+        if not rows:
+            return
+
+        table = cls._meta.db_table
+        values = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} '
+                f'(board_id, category_id, status, priority, overdue, count) '
+                f'VALUES {values} '
+                f'ON CONFLICT (board_id, category_id, status, priority, overdue) '
+                f'DO UPDATE SET count = {table}.count + EXCLUDED.count',
+                [value for row in rows for value in row],
+            )
+        cls.objects.filter(board_id__in={row[0] for row in rows}, count=0).delete()
+
+    @classmethod
+    def rebuild(cls, board_ids: Iterable[int] | None = None) -> int:
+        """
+        Recount counters of boards from goals, concurrent goal writers wait
+        until recount is committed. Versions of recounted boards are bumped, so
+        cached summaries are not used
+        :param board_ids: board ids or None for all boards
+        :return: number of counter rows
+        """
+        goals = Goal.objects.filter(category__is_deleted=False).exclude(
+            status=Goal.Status.archived
+        )
+        counters = cls.objects.all()
+        boards = Board.objects.all()
+        if board_ids is not None:
+            board_ids = list(board_ids)
+            goals = goals.filter(board_id__in=board_ids)
+            counters = counters.filter(board_id__in=board_ids)
+            boards = boards.filter(id__in=board_ids)
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'LOCK TABLE {cls._meta.db_table} IN SHARE ROW EXCLUSIVE MODE'
+                )
+            counters.delete()
+            boards.update(version=models.F('version') + 1, updated=timezone.now())
+            return len(
+                cls.objects.bulk_create(
+                    cls(**row)
+                    for row in goals.values(
+                        'board_id',
+                        'category_id',
+                        'status',
+                        'priority',
+                        overdue=cls.overdue_expression(),
+                    )
+                    .annotate(count=models.Count('id'))
+                    .order_by()
+                )
+            )
+
+    @staticmethod
+    def overdue_expression() -> models.Case:
+        """
+        Overdue flag of goal computed by database for current date
+        :return: expression
+        """
+        return models.Case(
+            models.When(
+                ~models.Q(status=Goal.Status.done),
+                due_date__lt=timezone.now().date(),
+                then=True,
+            ),
+            default=False,
+            output_field=models.BooleanField(),
+        )
+
+    @classmethod
+    def roll_over(cls, since: date, batch_size: int = 100) -> int:
+        """
+        Recount boards with goals which became overdue since date
+        :param since: first due date which could be not overdue at last rollover
+        :param batch_size: max number of boards recounted in one transaction
+        :return: number of recounted boards
+        """
+        board_ids = list(
+            Goal.objects.filter(due_date__gte=since, due_date__lt=timezone.now().date())
+            .exclude(status=Goal.Status.archived)
+            .order_by('board_id')
+            .values_list('board_id', flat=True)
+            .distinct()
+        )
+        for start in range(0, len(board_ids), batch_size):
+            cls.rebuild(board_ids[start : start + batch_size])
+        return len(board_ids)
+
+
+class CascadeTask(BaseModel):
+    """
+    Background archiving of goals of deleted board or category
+    """
+
+    class Meta:
+        verbose_name = 'Каскадное удаление'
+        verbose_name_plural = 'Каскадные удаления'
+
+    class Status(models.IntegerChoices):
+        """
+        Status choices
+        """
+
+        pending = 1, 'В очереди'
+        running = 2, 'Выполняется'
+        done = 3, 'Выполнено'
+
+    board = models.ForeignKey(
+        Board,
+        verbose_name='Доска',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='cascade_tasks',
+    )
+    category = models.ForeignKey(
+        GoalCategory,
+        verbose_name='Категория',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='cascade_tasks',
+    )
+    status = models.PositiveSmallIntegerField(
+        verbose_name='Статус', choices=Status.choices, default=Status.pending
+    )
+    last_goal_id = models.BigIntegerField(
+        verbose_name='Последняя обработанная цель', default=0
+    )
+    processed = models.PositiveIntegerField(verbose_name='Обработано', default=0)
+    total = models.PositiveIntegerField(verbose_name='Всего', default=0)
+    claimed_until = models.DateTimeField(
+        verbose_name='Захвачена до', null=True, blank=True
+    )
+
+    def __str__(self) -> str:
+        return f'{self.get_status_display()} {self.processed}/{self.total}'
+
+    @classmethod
+    def claim(cls, lease: timedelta) -> 'CascadeTask | None':
+        """
+        Take oldest not done task which is not claimed by other worker or whose
+        claim is expired. Task row is locked until claim is committed, rows
+        locked by other workers are skipped
+        :param lease: time task stays claimed without progress
+        :return: claimed task or None
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            task = (
+                cls.objects.select_for_update(skip_locked=True)
+                .exclude(status=cls.Status.done)
+                .filter(
+                    models.Q(claimed_until__isnull=True)
+                    | models.Q(claimed_until__lt=now)
+                )
+                .order_by('id')
+                .first()
+            )
+            if task is not None:
+                task.claimed_until = now + lease
+                task.save(update_fields=('claimed_until', 'updated'))
+        return task
+
+    def release(self) -> None:
+        """
+        Drop claim of interrupted task, so other worker can resume it
+        :return: None
+        """
+        self.claimed_until = None
+        self.save(update_fields=('claimed_until', 'updated'))
+
+    def get_goals(self) -> models.QuerySet:
+        """
+        Get goals of deleted board or category
+        :return: goals queryset
+        """
+        if self.category_id:
+            return Goal.objects.filter(category_id=self.category_id)
+        return Goal.objects.filter(board_id=self.board_id)
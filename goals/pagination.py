@@ -0,0 +1,272 @@
+import base64
+import json
+from collections import OrderedDict
+from typing import Any
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Model, Q, QuerySet
+from rest_framework import filters
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import (
+    BasePagination,
+    LimitOffsetPagination,
+    _positive_int,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+from rest_framework.views import APIView
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination on (ordering field, id) with opaque cursors
+    """
+
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = 100
+    max_limit = 1000
+    invalid_cursor_message = 'Invalid cursor'
+    invalid_ordering_message = 'Cursor requires ordering by field, set ordering'
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list:
+        """
+        Get page of objects after or before cursor position
+        :param queryset: filtered queryset
+        :param request: request
+        :param view: view
+        :return: page of objects
+        """
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list:
+        """
+        Get page of objects after or before cursor position from async view
+        :param queryset: filtered queryset
+        :param request: request
+        :param view: view
+        :return: page of objects
+        """
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([item async for item in page_queryset])
+
+    def get_page_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None
+    ) -> QuerySet:
+        """
+        Get queryset of page objects with one extra object to detect more pages
+        :param queryset: filtered queryset
+        :param request: request
+        :param view: view
+        :return: ordered and sliced queryset
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        self.field, self.descending = self.get_ordering(request, queryset, view)
+        value, self.pk, self.reverse = self.decode_cursor(request, queryset.model)
+
+        descending = self.descending != self.reverse
+        sign = '-' if descending else ''
+        queryset = queryset.order_by(f'{sign}{self.field}', f'{sign}id')
+        if self.pk is not None:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': value})
+                | Q(**{self.field: value, f'id__{lookup}': self.pk})
+            )
+        return queryset[: self.limit + 1]
+
+    def set_page(self, page: list) -> list:
+        """
+        Cut extra object from page and set links state
+        :param page: objects of page queryset
+        :return: page of objects
+        """
+        has_more = len(page) > self.limit
+        page = page[: self.limit]
+        if self.reverse:
+            page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.pk is not None
+        self.page = page
+        return page
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ('next', self.get_next_link()),
+                    ('previous', self.get_previous_link()),
+                    ('results', data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_limit(self, request: Request) -> int:
+        """
+        Get page size from request
+        :param request: request
+        :return: page size
+        """
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_ordering(
+        self, request: Request, queryset: QuerySet, view: APIView | None
+    ) -> tuple[str, bool]:
+        """
+        Get first ordering field of view ordering filter and its direction,
+        ordering by annotation, e.g. search rank, can`t be paged by cursor
+        :param request: request
+        :param queryset: queryset
+        :param view: view
+        :return: field name and descending flag
+        """
+        ordering_filter = next(
+            (
+                backend()
+                for backend in getattr(view, 'filter_backends', [])
+                if issubclass(backend, filters.OrderingFilter)
+            ),
+            filters.OrderingFilter(),
+        )
+        ordering = ordering_filter.get_ordering(request, queryset, view)
+        if not ordering:
+            return 'id', False
+        field = ordering[0].lstrip('-')
+        try:
+            queryset.model._meta.get_field(field)
+        except FieldDoesNotExist as error:
+            raise ParseError(self.invalid_ordering_message) from error
+        return field, ordering[0].startswith('-')
+
+    def decode_cursor(
+        self, request: Request, model: type[Model]
+    ) -> tuple[Any, int | None, bool]:
+        """
+        Decode cursor from request
+        :param request: request
+        :param model: queryset model
+        :return: ordering field value, id and reverse flag
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, None, False
+        try:
+            raw_value, pk, reverse = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii'))
+            )
+            value = model._meta.get_field(self.field).to_python(raw_value)
+            return value, int(pk), bool(reverse)
+        except (TypeError, ValueError, ValidationError) as error:
+            raise NotFound(self.invalid_cursor_message) from error
+
+    def encode_cursor(self, item: Any, reverse: bool) -> str:
+        """
+        Encode position of item to url with cursor
+        :param item: first or last object or values() row of page
+        :param reverse: is cursor pointed to previous page
+        :return: url
+        """
+        if isinstance(item, dict):
+            value, pk = item[self.field], item['id']
+        else:
+            value, pk = getattr(item, self.field), item.pk
+        if not isinstance(value, (str, int, float)):
+            value = value.isoformat()
+        position = json.dumps([value, pk, int(reverse)])
+        cursor = base64.urlsafe_b64encode(position.encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class LimitOffsetCursorPagination(LimitOffsetPagination):
+    """
+    Limit offset pagination with opt-in keyset mode by cursor query param
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def use_keyset(self, request: Request) -> bool:
+        """
+        Check if page is requested by cursor
+        :param request: request
+        :return: True for keyset mode
+        """
+        return self.keyset_pagination_class.cursor_query_param in request.query_params
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list | None:
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: APIView | None = None
+    ) -> list | None:
+        """
+        Get page of objects from async view
+        :param queryset: filtered queryset
+        :param request: request
+        :param view: view
+        :return: page of objects or None if pagination is not requested
+        """
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_pagination_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.count = await queryset.acount()
+        self.offset = self.get_offset(request)
+        if self.count > self.limit and self.template is not None:
+            self.display_page_controls = True
+        if self.count == 0 or self.offset > self.count:
+            return []
+        page_queryset = queryset[self.offset : self.offset + self.limit]
+        return [item async for item in page_queryset]
+
+    def get_paginated_response(self, data: list) -> Response:
+        if self.keyset:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
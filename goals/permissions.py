@@ -2,7 +2,8 @@ from rest_framework import permissions
 from rest_framework.generics import GenericAPIView
 from rest_framework.request import Request
 
-from goals.models import BoardParticipant, GoalCategory, Goal, GoalComment, Board
+from goals.models import GoalCategory, Goal, GoalComment, Board
+from goals.roles import get_board_roles, get_board_id
 
 
 class BoardPermissions(permissions.BasePermission):
@@ -16,76 +17,62 @@ class BoardPermissions(permissions.BasePermission):
         """Check has user permission for current board"""
         if not request.user.is_authenticated:
             return False
+        board_roles = get_board_roles(request)
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user, board=obj, role=BoardParticipant.Role.owner
-        ).exists()
+            return board_roles.can_read(obj.id)
+        return board_roles.is_owner(obj.id)
+
+    async def ahas_object_permission(
+        self, request: Request, view: GenericAPIView, obj: Board
+    ) -> bool:
+        """Check permission for current board from async view"""
+        await get_board_roles(request).aload()
+        return self.has_object_permission(request, view, obj)
 
 
-class GoalCategoryPermission(permissions.BasePermission):
+class BoardObjectPermission(permissions.BasePermission):
     """
-    Class with category permissions
+    Base class with permissions for objects which belong to board
     """
 
     def has_object_permission(
-        self, request: Request, view: GenericAPIView, obj: GoalCategory
+        self,
+        request: Request,
+        view: GenericAPIView,
+        obj: GoalCategory | Goal | GoalComment,
     ) -> bool:
-        """Check has user permission for current category"""
+        """Check has user permission for board of current object"""
         if not request.user.is_authenticated:
             return False
+        board_roles = get_board_roles(request)
         if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj.board_id
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board=obj.board_id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-        ).exists()
+            return board_roles.can_read(get_board_id(obj))
+        return board_roles.can_write(get_board_id(obj))
+
+    async def ahas_object_permission(
+        self,
+        request: Request,
+        view: GenericAPIView,
+        obj: GoalCategory | Goal | GoalComment,
+    ) -> bool:
+        """Check permission for board of current object from async view"""
+        await get_board_roles(request).aload()
+        return self.has_object_permission(request, view, obj)
 
 
-class GoalPermission(permissions.BasePermission):
+class GoalCategoryPermission(BoardObjectPermission):
     """
-    Class with goal permissions
+    Class with category permissions
     """
 
-    def has_object_permission(
-        self, request: Request, view: GenericAPIView, obj: Goal
-    ) -> bool:
-        """Check has user permission for current goal"""
-        if not request.user.is_authenticated:
-            return False
-        if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj.category.board_id
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board=obj.category.board_id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-        ).exists()
+
+class GoalPermission(BoardObjectPermission):
+    """
+    Class with goal permissions
+    """
 
 
-class CommentPermission(permissions.BasePermission):
+class CommentPermission(BoardObjectPermission):
     """
     Class with comment permissions
     """
-
-    def has_object_permission(
-        self, request: Request, view: GenericAPIView, obj: GoalComment
-    ) -> bool:
-        """Check has user permission for current comment"""
-        if not request.user.is_authenticated:
-            return False
-        if request.method in permissions.SAFE_METHODS:
-            return BoardParticipant.objects.filter(
-                user=request.user, board=obj.goal.category.board_id
-            ).exists()
-        return BoardParticipant.objects.filter(
-            user=request.user,
-            board=obj.goal.category.board_id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-        ).exists()
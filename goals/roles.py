@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import NamedTuple
+
+from django.db.models import QuerySet
+from rest_framework.request import Request
+
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+class BoardState(NamedTuple):
+    """
+    User role and board version
+    """
+
+    role: int
+    version: int
+    updated: datetime
+    is_deleted: bool
+
+
+class BoardRoles:
+    """
+    User roles on boards, loaded with one query on first access
+    """
+
+    editor_roles = (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+
+    def __init__(self, user_id: int | None) -> None:
+        self.user_id = user_id
+        self._boards: dict[int, BoardState] | None = None
+
+    @property
+    def boards(self) -> dict[int, BoardState]:
+        """
+        Map of board id to user role and board version
+        :return: dict with board id as key and board state as value
+        """
+        if self._boards is None:
+            self._boards = {
+                board_id: BoardState(*state) for board_id, *state in self.get_queryset()
+            }
+        return self._boards
+
+    async def aload(self) -> dict[int, BoardState]:
+        """
+        Load boards from async context, later access to boards does not query
+        :return: dict with board id as key and board state as value
+        """
+        if self._boards is None:
+            self._boards = {
+                board_id: BoardState(*state)
+                async for board_id, *state in self.get_queryset()
+            }
+        return self._boards
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Get roles and boards state of user
+        :return: queryset of board id, role, version, updated and is_deleted
+        """
+        return BoardParticipant.objects.filter(user_id=self.user_id).values_list(
+            'board_id',
+            'role',
+            'board__version',
+            'board__updated',
+            'board__is_deleted',
+        )
+
+    def get_role(self, board_id: int) -> int | None:
+        """
+        Get user role on board
+        :param board_id: board id
+        :return: role or None if user is not a participant
+        """
+        state = self.boards.get(board_id)
+        return state.role if state else None
+
+    def can_read(self, board_id: int) -> bool:
+        """Check that user is a board participant"""
+        return self.get_role(board_id) is not None
+
+    def can_write(self, board_id: int) -> bool:
+        """Check that user is a board owner or writer"""
+        return self.get_role(board_id) in self.editor_roles
+
+    def is_owner(self, board_id: int) -> bool:
+        """Check that user is a board owner"""
+        return self.get_role(board_id) == BoardParticipant.Role.owner
+
+
+def get_board_roles(request: Request) -> BoardRoles:
+    """
+    Get board roles of request user, cached on the request
+    :param request: request
+    :return: board roles
+    """
+    http_request = getattr(request, '_request', request)
+    user_id = request.user.id
+    board_roles: BoardRoles | None = getattr(http_request, '_board_roles', None)
+    if board_roles is None or board_roles.user_id != user_id:
+        board_roles = BoardRoles(user_id)
+        http_request._board_roles = board_roles
+    return board_roles
+
+
+def get_board_id(obj: Board | GoalCategory | Goal | GoalComment) -> int:
+    """
+    Get board id of board, category, goal or comment
+    :param obj: board or object which belongs to board
+    :return: board id
+    """
+    if isinstance(obj, Board):
+        return obj.id
+    return obj.board_id
@@ -1,6 +1,6 @@
 from datetime import date
 
-from django.db import transaction
+from django.db import models, transaction
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError, PermissionDenied
@@ -8,6 +8,7 @@ from rest_framework.exceptions import ValidationError, PermissionDenied
 from core.models import User
 from core.serializers import ProfileSerializer
 from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant
+from goals.roles import get_board_roles
 
 
 class GoalCategoryCreateSerializer(serializers.ModelSerializer):
@@ -31,11 +32,7 @@ class GoalCategoryCreateSerializer(serializers.ModelSerializer):
         if board.is_deleted:
             raise ValidationError('Board is deleted')
 
-        if not BoardParticipant.objects.filter(
-            board_id=board.id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-            user_id=self.context['request'].user.id,
-        ).exists():
+        if not get_board_roles(self.context['request']).can_write(board.id):
             raise PermissionDenied
         return board
 
@@ -62,6 +59,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
             'created',
             'updated',
             'user',
+            'board',
         )
         fields = '__all__'
 
@@ -74,11 +72,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
         if value.is_deleted:
             raise ValidationError('Category not found')
 
-        if not BoardParticipant.objects.filter(
-            board_id=value.board.id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-            user_id=self.context['request'].user.id,
-        ).exists():
+        if not get_board_roles(self.context['request']).can_write(value.board_id):
             raise PermissionDenied
         return value
 
@@ -102,16 +96,95 @@ class GoalSerializer(GoalCreateSerializer):
     user = ProfileSerializer(read_only=True)
 
 
+class GoalBulkItemSerializer(GoalCreateSerializer):
+    """
+    Goal bulk change serializer, categories are checked for whole batch in view
+    """
+
+    class Action(models.TextChoices):
+        """
+        Bulk change actions
+        """
+
+        create = 'create'
+        update = 'update'
+        archive = 'archive'
+
+    action = serializers.ChoiceField(choices=Action.choices)
+    id = serializers.IntegerField(required=False)
+    category = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Goal
+        fields = (
+            'action',
+            'id',
+            'user',
+            'title',
+            'description',
+            'category',
+            'due_date',
+            'status',
+            'priority',
+        )
+        extra_kwargs = {'title': {'required': False}}
+
+    def validate_category(self, value: int) -> int:
+        return value
+
+    def validate(self, attrs: dict) -> dict:
+        """
+        Check required fields of action
+        :param attrs: item data
+        :return: item data or validation error
+        """
+        if attrs['action'] == self.Action.create:
+            required_fields = ('title', 'category')
+        else:
+            required_fields = ('id',)
+        missing = [field for field in required_fields if field not in attrs]
+        if missing:
+            raise ValidationError(
+                {field: [self.error_messages['required']] for field in missing}
+            )
+        return attrs
+
+
+class GoalImportSerializer(GoalCreateSerializer):
+    """
+    Goal import row serializer, categories are checked for whole batch by
+    importer, goals are created by importing user like by create view
+    """
+
+    category = serializers.IntegerField()
+    user = None
+
+    class Meta:
+        model = Goal
+        fields = (
+            'title',
+            'description',
+            'category',
+            'due_date',
+            'status',
+            'priority',
+        )
+
+    def validate_category(self, value: int) -> int:
+        return value
+
+
 class GoalCommentCreateSerializer(serializers.ModelSerializer):
     """
     Comment create serializer
     """
 
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    goal = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.all())
 
     class Meta:
         model = GoalComment
-        read_only_fields = ['id', 'created', 'updated', 'user']
+        read_only_fields = ['id', 'created', 'updated', 'user', 'board']
         fields = '__all__'
 
     def validate_goal(self, value: Goal) -> Goal:
@@ -123,11 +196,7 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
         if value.status == Goal.Status.archived:
             raise ValidationError('Goal not found')
 
-        if not BoardParticipant.objects.filter(
-            board_id=value.category.board.id,
-            role__in=[BoardParticipant.Role.owner, BoardParticipant.Role.writer],
-            user_id=self.context['request'].user.id,
-        ).exists():
+        if not get_board_roles(self.context['request']).can_write(value.board_id):
             raise PermissionDenied
         return value
 
@@ -150,7 +219,7 @@ class BoardCreateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Board
-        read_only_fields = ('id', 'created', 'updated')
+        read_only_fields = ('id', 'created', 'updated', 'version')
         fields = '__all__'
 
     def create(self, validated_data):
@@ -169,6 +238,57 @@ class BoardCreateSerializer(serializers.ModelSerializer):
         return board
 
 
+class UsernameField(serializers.SlugRelatedField):
+    """
+    Username of user, users are resolved by participant list serializer
+    """
+
+    def to_internal_value(self, data: str) -> str:
+        """
+        Keep username, user is looked up for the whole list at once
+        :param data: username
+        :return: username or validation error
+        """
+        if not isinstance(data, str):
+            self.fail('invalid')
+        return data
+
+
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """
+    Board participant list serializer
+    """
+
+    def to_internal_value(self, data: list) -> list[dict]:
+        """
+        Resolve usernames of participants in one query
+        :param data: participants with usernames
+        :return: participants with users or validation error
+        """
+        attrs = super().to_internal_value(data)
+        users = User.objects.in_bulk(
+            {participant['user'] for participant in attrs}, field_name='username'
+        )
+        user_field = self.child.fields['user']
+        errors = [
+            {}
+            if participant['user'] in users
+            else {
+                'user': [
+                    user_field.error_messages['does_not_exist'].format(
+                        slug_name=user_field.slug_field, value=participant['user']
+                    )
+                ]
+            }
+            for participant in attrs
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+        return [
+            {**participant, 'user': users[participant['user']]} for participant in attrs
+        ]
+
+
 class BoardParticipantSerializer(serializers.ModelSerializer):
     """
     Board participant serializer
@@ -177,24 +297,23 @@ class BoardParticipantSerializer(serializers.ModelSerializer):
     role = serializers.ChoiceField(
         required=True, choices=BoardParticipant.editable_choices
     )
-    user = serializers.SlugRelatedField(
-        slug_field='username', queryset=User.objects.all()
-    )
+    user = UsernameField(slug_field='username', queryset=User.objects.all())
 
-    def validate_user(self, user: User) -> User:
+    def validate_user(self, username: str) -> str:
         """
         Validate that owner can`t change him role
-        :param user: user
-        :return: user or validation error
+        :param username: username
+        :return: username or validation error
         """
-        if self.context['request'].user == user:
+        if self.context['request'].user.username == username:
             raise ValidationError('Owner can`t change him role')
-        return user
+        return username
 
     class Meta:
         model = BoardParticipant
         fields = '__all__'
         read_only_fields = ('id', 'created', 'updated', 'board')
+        list_serializer_class = BoardParticipantListSerializer
 
 
 class BoardSerializer(serializers.ModelSerializer):
@@ -208,7 +327,7 @@ class BoardSerializer(serializers.ModelSerializer):
     class Meta:
         model = Board
         fields = '__all__'
-        read_only_fields = ('id', 'created', 'updated')
+        read_only_fields = ('id', 'created', 'updated', 'version')
 
     def update(self, instance: Board, validated_data) -> Board:
         """
@@ -219,24 +338,54 @@ class BoardSerializer(serializers.ModelSerializer):
         """
         request = self.context['request']
         with transaction.atomic():
-            BoardParticipant.objects.filter(board=instance).exclude(
-                user=request.user
-            ).delete()
-            new_participants = []
-            for participant in validated_data.get('participants', []):
-                new_participants.append(
-                    BoardParticipant(
-                        user=participant['user'],
-                        role=participant['role'],
-                        board=instance,
-                    )
+            if 'participants' in validated_data:
+                self.sync_participants(
+                    instance, request.user, validated_data['participants']
                 )
-            BoardParticipant.objects.bulk_create(
-                new_participants, ignore_conflicts=True
-            )
 
             title = validated_data.get('title')
             if title:
                 instance.title = title
             instance.save()
+            Board.bump_version(instance.id)
+        instance.refresh_from_db(fields=('version', 'updated'))
         return instance
+
+    @staticmethod
+    def sync_participants(board: Board, user: User, participants: list[dict]) -> None:
+        """
+        Apply difference between current and submitted participants of board
+        :param board: board
+        :param user: user who updates board, his participation is kept
+        :param participants: submitted participants with users and roles
+        :return: None
+        """
+        roles: dict[int, int] = {}
+        for participant in participants:
+            roles.setdefault(participant['user'].id, participant['role'])
+
+        now = timezone.now()
+        removed: list[int] = []
+        changed: list[BoardParticipant] = []
+        current = BoardParticipant.objects.filter(board=board).exclude(user=user)
+        for participant in current.only('id', 'user_id', 'role'):
+            role = roles.pop(participant.user_id, None)
+            if role is None:
+                removed.append(participant.id)
+            elif role != participant.role:
+                participant.role = role
+                participant.updated = now
+                changed.append(participant)
+
+        if removed:
+            BoardParticipant.objects.filter(id__in=removed).delete()
+        if changed:
+            BoardParticipant.objects.bulk_update(changed, ['role', 'updated'])
+        if roles:
+            BoardParticipant.objects.bulk_create(
+                [
+                    BoardParticipant(board=board, user_id=user_id, role=role)
+                    for user_id, role in roles.items()
+                ],
+                ignore_conflicts=True,
+            )
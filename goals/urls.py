@@ -6,6 +6,11 @@ urlpatterns = [
     path('board/create', views.BoardCreateView.as_view(), name='board-create'),
     path('board/list', views.BoardListView.as_view(), name='board-list'),
     path('board/<int:pk>', views.BoardDetailView.as_view(), name='board'),
+    path(
+        'board/<int:pk>/summary',
+        views.BoardSummaryView.as_view(),
+        name='board-summary',
+    ),
     # Category
     path(
         'goal_category/create',
@@ -19,6 +24,9 @@ urlpatterns = [
     # Goals
     path('goal/create', views.GoalCreateView.as_view(), name='goal-create'),
     path('goal/list', views.GoalListView.as_view(), name='goal-list'),
+    path('goal/bulk', views.GoalBulkView.as_view(), name='goal-bulk'),
+    path('goal/export', views.GoalExportView.as_view(), name='goal-export'),
+    path('goal/import', views.GoalImportView.as_view(), name='goal-import'),
     path('goal/<int:pk>', views.GoalView.as_view(), name='goal'),
     # Comments
     path(
@@ -27,5 +35,12 @@ urlpatterns = [
         name='comment-create',
     ),
     path('goal_comment/list', views.GoalCommentListView.as_view(), name='comment-list'),
+    path(
+        'goal_comment/export',
+        views.GoalCommentExportView.as_view(),
+        name='comment-export',
+    ),
     path('goal_comment/<int:pk>', views.GoalCommentView.as_view(), name='comment'),
+    # Cache
+    path('cache/stats', views.ResponseCacheStatsView.as_view(), name='cache-stats'),
 ]
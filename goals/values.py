@@ -0,0 +1,99 @@
+from typing import Any
+
+from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject
+
+
+class ValuesSerializer:
+    """
+    Read only serialization of queryset values() rows with fields of model
+    serializer. Fields are bound once per response instead of once per object,
+    rows are converted by the same field to_representation without model instances
+    """
+
+    def __init__(self, serializer: serializers.Serializer) -> None:
+        self.columns: list[str] = []
+        self.plan = self.build_plan(serializer)
+
+    def build_plan(self, serializer: serializers.Serializer, prefix: str = '') -> list:
+        """
+        Map readable serializer fields to values() columns
+        :param serializer: model serializer
+        :param prefix: lookup of nested serializer relation
+        :return: list of field name, column and converter or nested plan
+        """
+        plan: list[tuple[str, str, Any]] = []
+        for field in serializer._readable_fields:
+            if isinstance(
+                field,
+                (serializers.SerializerMethodField, serializers.ManyRelatedField),
+            ) or (
+                isinstance(field, serializers.RelatedField)
+                and not isinstance(field, serializers.PrimaryKeyRelatedField)
+            ):
+                raise TypeError(f'Field {field.field_name} has no column')
+            column = prefix + '__'.join(field.source_attrs)
+            self.columns.append(column)
+            if isinstance(field, serializers.BaseSerializer):
+                plan.append(
+                    (field.field_name, column, self.build_plan(field, f'{column}__'))
+                )
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                plan.append((field.field_name, column, self.pk_converter(field)))
+            else:
+                plan.append((field.field_name, column, field.to_representation))
+        return plan
+
+    @staticmethod
+    def pk_converter(field: serializers.PrimaryKeyRelatedField) -> Any:
+        """
+        Converter of foreign key column by related field
+        :param field: primary key related field
+        :return: function which converts column value
+        """
+
+        def convert(value: Any) -> Any:
+            return field.to_representation(PKOnlyObject(pk=value))
+
+        return convert
+
+    def field_names(self, plan: list | None = None, prefix: str = '') -> list[str]:
+        """
+        Get output field names, names of nested fields are joined with dot
+        :param plan: fields plan, plan of serializer by default
+        :param prefix: name prefix of nested serializer fields
+        :return: list of flat field names
+        """
+        names = []
+        for name, column, converter in self.plan if plan is None else plan:
+            if isinstance(converter, list):
+                names += self.field_names(converter, f'{prefix}{name}.')
+            else:
+                names.append(f'{prefix}{name}')
+        return names
+
+    def to_representation(self, row: dict, plan: list | None = None) -> dict:
+        """
+        Convert values() row to serializer output
+        :param row: dict of column values
+        :param plan: fields plan, plan of serializer by default
+        :return: dict equal to serializer data
+        """
+        data = {}
+        for name, column, converter in self.plan if plan is None else plan:
+            value = row[column]
+            if value is None:
+                data[name] = None
+            elif isinstance(converter, list):
+                data[name] = self.to_representation(row, converter)
+            else:
+                data[name] = converter(value)
+        return data
+
+    def to_representation_many(self, rows: Any) -> list[dict]:
+        """
+        Convert values() rows to serializer output
+        :param rows: queryset values or list of dicts
+        :return: list of dicts equal to list serializer data
+        """
+        return [self.to_representation(row) for row in rows]
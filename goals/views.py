@@ -1,19 +1,56 @@
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any
+
 from django.db import transaction
-from django.db.models import QuerySet
+from django.db.models import Exists, QuerySet
+from django.utils import timezone
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import generics, filters
-from rest_framework import permissions
-from rest_framework.pagination import LimitOffsetPagination
-
-from goals.filters import GoalDateFilter
-from goals.models import GoalCategory, Goal, GoalComment, Board
+from rest_framework import generics, filters, status
+from rest_framework import parsers, permissions
+from rest_framework.exceptions import (
+    APIException,
+    NotFound,
+    PermissionDenied,
+    ValidationError,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals.filters import (
+    GoalDateFilter,
+    GoalSearchFilter,
+    RankedOrderingFilter,
+    TrigramSearchFilter,
+)
+from goals.cache import response_cache
+from goals.importer import IMPORT_FORMATS, GoalImporter, read_rows
+from goals.mixins import (
+    AsyncConditionalGetMixin,
+    AsyncRetrieveMixin,
+    AsyncValuesListMixin,
+    BoardVersionMixin,
+    CachedResponseMixin,
+    ExportMixin,
+)
+from goals.models import (
+    GoalCategory,
+    Goal,
+    GoalComment,
+    GoalCounter,
+    Board,
+    CascadeTask,
+)
+from goals.pagination import LimitOffsetCursorPagination
 from goals.permissions import (
     BoardPermissions,
     GoalCategoryPermission,
     GoalPermission,
     CommentPermission,
 )
+from goals.roles import get_board_roles
 from goals.serializers import (
+    GoalBulkItemSerializer,
     GoalCreateSerializer,
     GoalCategoryCreateSerializer,
     GoalCategoryListSerializer,
@@ -25,7 +62,7 @@ from goals.serializers import (
 )
 
 
-class GoalCategoryCreateView(generics.CreateAPIView):
+class GoalCategoryCreateView(BoardVersionMixin, generics.CreateAPIView):
     """
     Category create view
     """
@@ -34,7 +71,12 @@ class GoalCategoryCreateView(generics.CreateAPIView):
     serializer_class = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(generics.ListAPIView):
+class GoalCategoryListView(
+    AsyncConditionalGetMixin,
+    CachedResponseMixin,
+    AsyncValuesListMixin,
+    generics.ListAPIView,
+):
     """
     Category list view
     """
@@ -43,11 +85,11 @@ class GoalCategoryListView(generics.ListAPIView):
         permissions.IsAuthenticated,
     ]
     serializer_class = GoalCategoryListSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetCursorPagination
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        TrigramSearchFilter,
+        RankedOrderingFilter,
     ]
     filterset_fields = ['board']
     ordering_fields = ['title', 'created']
@@ -56,11 +98,13 @@ class GoalCategoryListView(generics.ListAPIView):
 
     def get_queryset(self) -> QuerySet:
         return GoalCategory.objects.filter(
-            board__participants__user=self.request.user
+            board_id__in=list(get_board_roles(self.request).boards)
         ).exclude(is_deleted=True)
 
 
-class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
+class GoalCategoryView(
+    AsyncRetrieveMixin, BoardVersionMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Category retrieve update delete views
     """
@@ -69,21 +113,24 @@ class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = GoalCategoryListSerializer
 
     def get_queryset(self) -> QuerySet:
-        return GoalCategory.objects.filter(is_deleted=False)
+        return GoalCategory.objects.select_related('user').filter(is_deleted=False)
 
     def perform_destroy(self, instance: GoalCategory) -> None:
         """
-        If categories were delete, they mark as delete in database
+        If categories were delete, they mark as delete in database,
+        goals are archived in background by runcascades command
         :param instance: category
         :return: none
         """
         with transaction.atomic():
             instance.is_deleted = True
             instance.save(update_fields=('is_deleted',))
-            instance.goals.update(status=Goal.Status.archived)
+            CascadeTask.objects.create(category=instance)
+            GoalCounter.objects.filter(category=instance).delete()
+            Board.bump_version(instance.board_id)
 
 
-class GoalCreateView(generics.CreateAPIView):
+class GoalCreateView(BoardVersionMixin, generics.CreateAPIView):
     """
     Goal create view
     """
@@ -92,7 +139,12 @@ class GoalCreateView(generics.CreateAPIView):
     serializer_class = GoalCreateSerializer
 
 
-class GoalListView(generics.ListAPIView):
+class GoalListView(
+    AsyncConditionalGetMixin,
+    CachedResponseMixin,
+    AsyncValuesListMixin,
+    generics.ListAPIView,
+):
     """
     Goal list view
     """
@@ -101,11 +153,11 @@ class GoalListView(generics.ListAPIView):
         permissions.IsAuthenticated,
     ]
     serializer_class = GoalSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetCursorPagination
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        GoalSearchFilter,
+        RankedOrderingFilter,
     ]
     filterset_class = GoalDateFilter
     ordering_fields = ['title', 'created']
@@ -113,14 +165,35 @@ class GoalListView(generics.ListAPIView):
     search_fields = ['title', 'description']
 
     def get_queryset(self) -> QuerySet:
+        """
+        Goals of user boards are read by board index without join of categories,
+        goals of deleted categories not archived yet are excluded by
+        uncorrelated subquery of deleted categories
+        :return: goals queryset
+        """
+        boards = list(get_board_roles(self.request).boards)
+        deleted_categories = GoalCategory.objects.filter(
+            board_id__in=boards, is_deleted=True
+        ).values('id')
         return (
             Goal.objects.select_related('user')
-            .filter(category__is_deleted=False)
+            .filter(board_id__in=boards)
+            .exclude(category_id__in=deleted_categories)
             .exclude(status=Goal.Status.archived)
         )
 
 
-class GoalView(generics.RetrieveUpdateDestroyAPIView):
+class GoalExportView(ExportMixin, GoalListView):
+    """
+    Goal export view
+    """
+
+    export_name = 'goals'
+
+
+class GoalView(
+    AsyncRetrieveMixin, BoardVersionMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Goal retrieve update destroy view
     """
@@ -141,11 +214,194 @@ class GoalView(generics.RetrieveUpdateDestroyAPIView):
         :param instance:
         :return: none
         """
-        instance.status = Goal.Status.archived
-        instance.save(update_fields=('status',))
+        with transaction.atomic():
+            instance.status = Goal.Status.archived
+            instance.save(update_fields=('status',))
+            Board.bump_version(instance.board_id)
 
 
-class GoalCommentCreateView(generics.CreateAPIView):
+class GoalBulkView(generics.GenericAPIView):
+    """
+    Goal bulk create update archive view
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalBulkItemSerializer
+    max_items = 1000
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Apply list of goal changes in one transaction
+        :param request: request with list of changes
+        :param args: args
+        :param kwargs: kwargs
+        :return: response with result of every change
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError('Expected a list of changes')
+        if len(request.data) > self.max_items:
+            raise ValidationError(f'Expected no more than {self.max_items} changes')
+
+        results: list[dict | None] = [None] * len(request.data)
+        changes: list[tuple[int, dict]] = []
+        for index, item in enumerate(request.data):
+            serializer = self.get_serializer(data=item)
+            if serializer.is_valid():
+                changes.append((index, serializer.validated_data))
+            else:
+                results[index] = self.error_result(ValidationError(serializer.errors))
+
+        goals: dict[int, Goal] = (
+            Goal.objects.filter(category__is_deleted=False)
+            .exclude(status=Goal.Status.archived)
+            .in_bulk({data['id'] for _, data in changes if 'id' in data})
+        )
+        categories: dict[int, GoalCategory] = GoalCategory.objects.filter(
+            is_deleted=False
+        ).in_bulk({data['category'] for _, data in changes if 'category' in data})
+        board_roles = get_board_roles(request)
+
+        created: dict[int, Goal] = {}
+        updated: dict[int, Goal] = {}
+        update_fields: set[str] = set()
+        board_ids: set[int] = set()
+        moved: dict[int, set[int]] = {}
+        for index, data in changes:
+            action = data.pop('action')
+            goal = goals.get(data.pop('id', None))
+            if action != GoalBulkItemSerializer.Action.create:
+                if goal is None or not board_roles.can_read(goal.board_id):
+                    results[index] = self.error_result(NotFound())
+                    continue
+                if not board_roles.can_write(goal.board_id):
+                    results[index] = self.error_result(PermissionDenied())
+                    continue
+                if action == GoalBulkItemSerializer.Action.archive:
+                    data = {'status': Goal.Status.archived}
+                else:
+                    data.pop('user')
+
+            if 'category' in data:
+                category = categories.get(data['category'])
+                if category is None:
+                    results[index] = self.error_result(
+                        ValidationError({'category': ['Category not found']})
+                    )
+                    continue
+                if not board_roles.can_write(category.board_id):
+                    results[index] = self.error_result(PermissionDenied())
+                    continue
+                data['category'] = category
+
+            if action == GoalBulkItemSerializer.Action.create:
+                created[index] = Goal(board_id=category.board_id, **data)
+                board_ids.add(category.board_id)
+                continue
+            board_ids.add(goal.board_id)
+            if 'category' in data:
+                data['board_id'] = category.board_id
+                board_ids.add(category.board_id)
+                moved.setdefault(category.board_id, set()).add(goal.id)
+            for field, value in data.items():
+                setattr(goal, field, value)
+            goal.updated = timezone.now()
+            update_fields.update(data, ['updated'])
+            updated[index] = goal
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(created.values())
+            GoalCounter.apply_changes(
+                [(None, goal.counter_key) for goal in created.values()]
+                + [
+                    (goal._loaded_counter_key, goal.counter_key)
+                    for goal in {goal.id: goal for goal in updated.values()}.values()
+                ]
+            )
+            if updated:
+                Goal.objects.bulk_update(
+                    {goal.id: goal for goal in updated.values()}.values(),
+                    update_fields,
+                )
+                GoalComment.set_goal_archived(updated.values())
+            for board_id, goal_ids in moved.items():
+                GoalComment.objects.filter(goal_id__in=goal_ids).exclude(
+                    board_id=board_id
+                ).update(board_id=board_id)
+            Board.bump_version(*board_ids)
+
+        for index, goal in created.items():
+            results[index] = self.goal_result(status.HTTP_201_CREATED, goal)
+        for index, goal in updated.items():
+            results[index] = self.goal_result(status.HTTP_200_OK, goal)
+        return Response(results)
+
+    def goal_result(self, status_code: int, goal: Goal) -> dict:
+        """
+        Result of successful change
+        :param status_code: status code
+        :param goal: changed goal
+        :return: result with goal data
+        """
+        return {
+            'status': status_code,
+            'data': GoalCreateSerializer(
+                goal, context=self.get_serializer_context()
+            ).data,
+        }
+
+    @staticmethod
+    def error_result(error: APIException) -> dict:
+        """
+        Result of failed change
+        :param error: change error
+        :return: result with error details
+        """
+        detail = error.detail
+        if not isinstance(detail, dict):
+            detail = {'detail': detail}
+        return {'status': error.status_code, 'errors': detail}
+
+
+class GoalImportView(generics.GenericAPIView):
+    """
+    Goal import from CSV or NDJSON file view
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [parsers.MultiPartParser]
+    batch_size = 1000
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Import goals from uploaded file, file is read row by row and goals are
+        committed in batches, so failed import is resumed by offset
+        :param request: request with file, offset of imported rows and file format
+        :param args: args
+        :param kwargs: kwargs
+        :return: response with import result and row errors
+        """
+        file = request.FILES.get('file')
+        if file is None:
+            raise ValidationError({'file': ['No file was submitted.']})
+        file_format = request.data.get(
+            'file_format', file.name.rsplit('.', 1)[-1].lower()
+        )
+        if file_format not in IMPORT_FORMATS:
+            raise ValidationError(
+                {'file_format': [f'Expected one of: {", ".join(IMPORT_FORMATS)}']}
+            )
+        try:
+            offset = int(request.data.get('offset', 0))
+        except ValueError:
+            raise ValidationError({'offset': ['A valid integer is required.']})
+
+        result = GoalImporter(request.user, batch_size=self.batch_size).run(
+            read_rows(file, file_format), offset=max(offset, 0)
+        )
+        return Response(asdict(result))
+
+
+class GoalCommentCreateView(BoardVersionMixin, generics.CreateAPIView):
     """
     Comment create view
     """
@@ -154,7 +410,9 @@ class GoalCommentCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated, CommentPermission]
 
 
-class GoalCommentListView(generics.ListAPIView):
+class GoalCommentListView(
+    AsyncConditionalGetMixin, AsyncValuesListMixin, generics.ListAPIView
+):
     """
     Comment list view
     """
@@ -163,16 +421,40 @@ class GoalCommentListView(generics.ListAPIView):
     permission_classes = [
         permissions.IsAuthenticated,
     ]
+    pagination_class = LimitOffsetCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering_fields = ['created', 'updated']
     ordering = ['-created']
 
     def get_queryset(self) -> QuerySet:
-        return GoalComment.objects.all().exclude(goal__status=Goal.Status.archived)
+        """
+        Comments of one goal are read by goal index without join of goals,
+        goal membership is checked once by uncorrelated subquery. Comments of
+        all boards are filtered by copied board and archived status of goal
+        :return: comments queryset
+        """
+        boards = list(get_board_roles(self.request).boards)
+        goal_id = self.request.query_params.get('goal', '')
+        if goal_id.isdigit():
+            goal = Goal.objects.filter(id=goal_id, board_id__in=boards).exclude(
+                status=Goal.Status.archived
+            )
+            return GoalComment.objects.filter(goal_id=goal_id).filter(Exists(goal))
+        return GoalComment.objects.filter(board_id__in=boards, goal_archived=False)
 
 
-class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
+class GoalCommentExportView(ExportMixin, GoalCommentListView):
+    """
+    Comment export view
+    """
+
+    export_name = 'comments'
+
+
+class GoalCommentView(
+    AsyncRetrieveMixin, BoardVersionMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Comment retrieve update destroy view
     """
@@ -201,13 +483,19 @@ class BoardCreateView(generics.CreateAPIView):
     serializer_class = BoardCreateSerializer
 
 
-class BoardListView(generics.ListAPIView):
+class BoardListView(
+    AsyncConditionalGetMixin,
+    CachedResponseMixin,
+    AsyncValuesListMixin,
+    generics.ListAPIView,
+):
     """
     Board list view
     """
 
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = BoardCreateSerializer
+    pagination_class = LimitOffsetCursorPagination
     filter_backends = [filters.OrderingFilter]
     ordering = ['title']
 
@@ -217,7 +505,12 @@ class BoardListView(generics.ListAPIView):
         )
 
 
-class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
+class BoardDetailView(
+    AsyncConditionalGetMixin,
+    CachedResponseMixin,
+    AsyncRetrieveMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """
     Board retrieve update destroy view
     """
@@ -230,15 +523,112 @@ class BoardDetailView(generics.RetrieveUpdateDestroyAPIView):
             is_deleted=False
         )
 
+    def get_validators(self) -> tuple[str | None, datetime | None]:
+        """
+        Get ETag and last modified date from board version
+        :return: ETag and last modified date or None if board is not available
+        """
+        return self.get_board_validators(self.kwargs['pk'])
+
     def perform_destroy(self, instance: Board):
         """
-        If boards were delete, categories mark as delete in database goal mark as archived
+        If boards were delete, categories mark as delete in database,
+        goals are archived in background by runcascades command
         :param instance: board
         :return: none
         """
         with transaction.atomic():
             Board.objects.filter(id=instance.id).update(is_deleted=True)
             instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(
-                status=Goal.Status.archived
-            )
+            CascadeTask.objects.create(board=instance)
+            GoalCounter.objects.filter(board=instance).delete()
+            Board.bump_version(instance.id)
+
+
+class BoardSummaryView(CachedResponseMixin, generics.RetrieveAPIView):
+    """
+    Board goal counters view
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_validators(self) -> tuple[str | None, datetime | None]:
+        """
+        Get ETag from board version and current date, overdue goals depend on it
+        :return: ETag and no last modified date
+        """
+        state = get_board_roles(self.request).boards.get(self.kwargs['pk'])
+        if state is None or state.is_deleted:
+            return None, None
+        return self.make_etag([state.version, str(timezone.now().date())]), None
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Get numbers of board goals by status, priority and overdue goals
+        from goal counters
+        :param request: request
+        :param args: args
+        :param kwargs: kwargs
+        :return: response with board and categories summary
+        """
+        board_id = self.kwargs['pk']
+        state = get_board_roles(request).boards.get(board_id)
+        if state is None or state.is_deleted:
+            raise NotFound
+
+        board = self.empty_summary()
+        categories: dict[int, dict] = {}
+        for (
+            category_id,
+            goal_status,
+            priority,
+            overdue,
+            count,
+        ) in GoalCounter.objects.filter(board_id=board_id).values_list(
+            'category_id', 'status', 'priority', 'overdue', 'count'
+        ):
+            category = categories.setdefault(category_id, self.empty_summary())
+            for summary in (board, category):
+                summary['total'] += count
+                summary['overdue'] += count if overdue else 0
+                summary['status'][goal_status] += count
+                summary['priority'][priority] += count
+
+        return Response(
+            {
+                'board': board_id,
+                **board,
+                'categories': [
+                    {'category': category_id, **summary}
+                    for category_id, summary in sorted(categories.items())
+                ],
+            }
+        )
+
+    @staticmethod
+    def empty_summary() -> dict:
+        """
+        Summary with zero numbers of active goals
+        :return: summary dict
+        """
+        return {
+            'total': 0,
+            'overdue': 0,
+            'status': {
+                value: 0
+                for value in Goal.Status.values
+                if value != Goal.Status.archived
+            },
+            'priority': {value: 0 for value in Goal.Priority.values},
+        }
+
+
+class ResponseCacheStatsView(generics.GenericAPIView):
+    """
+    Response cache stats view of current process
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        return Response(response_cache.stats())
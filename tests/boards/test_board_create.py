@@ -38,3 +38,13 @@ class TestBoardCreate:
         assert response.status_code == status.HTTP_201_CREATED
         assert response.data['id'] == board_participant.board.id
         assert board_participant.role == BoardParticipant.Role.owner
+
+    @pytest.mark.django_db()
+    def test_version_is_read_only(self, auth_client, board_create_data):
+        """
+        New board starts from initial version whatever is submitted
+        """
+        response = auth_client.post(self.url, data=board_create_data(version=1000))
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Board.objects.get(id=response.json()['id']).version != 1000
@@ -0,0 +1,177 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals.models import Goal, GoalCounter
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestBoardSummaryView:
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        caches['responses'].clear()
+        self.board = BoardFactory.create(with_owner=user)
+        self.url = reverse('goals:board-summary', args=[self.board.id])
+        self.categories = CategoryFactory.create_batch(
+            size=2, board=self.board, user=user
+        )
+        yesterday = timezone.now().date() - timedelta(days=1)
+        GoalFactory.create(category=self.categories[0], user=user)
+        GoalFactory.create(
+            category=self.categories[0],
+            user=user,
+            priority=Goal.Priority.high,
+            due_date=yesterday,
+        )
+        GoalFactory.create(
+            category=self.categories[1],
+            user=user,
+            status=Goal.Status.done,
+            due_date=yesterday,
+        )
+        GoalFactory.create(
+            category=self.categories[1], user=user, status=Goal.Status.archived
+        )
+
+    def counters(self) -> list[tuple]:
+        return sorted(
+            GoalCounter.objects.exclude(count=0).values_list(
+                'category_id', 'status', 'priority', 'overdue', 'count'
+            ),
+            key=str,
+        )
+
+    def test_auth_required(self, client):
+        """
+        Unauthorized user get Authorization error
+        """
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_foreign_board(self, client, user_factory):
+        """
+        Not participant can`t get board summary
+        """
+        client.force_login(user_factory.create())
+        response = client.get(self.url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_summary(self, auth_client):
+        """
+        Summary counts active goals by status, priority and overdue
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['total'] == 3
+        assert data['overdue'] == 1
+        assert data['status'] == {'1': 2, '2': 0, '3': 1}
+        assert data['priority'] == {'1': 0, '2': 2, '3': 1, '4': 0}
+        assert [category['total'] for category in data['categories']] == [2, 1]
+        assert not [q for q in context.captured_queries if 'goals_goal"' in q['sql']]
+
+    def test_overdue_by_category(self, auth_client, user):
+        """
+        Overdue goals are counted for each category, done goals are not overdue
+        """
+        yesterday = timezone.now().date() - timedelta(days=1)
+        GoalFactory.create(
+            category=self.categories[1],
+            user=user,
+            status=Goal.Status.in_progress,
+            due_date=yesterday,
+        )
+
+        data = auth_client.get(self.url).json()
+
+        assert data['overdue'] == 2
+        assert [category['overdue'] for category in data['categories']] == [1, 1]
+
+    def test_rollover(self, auth_client, user):
+        """
+        Daily rollover recounts boards with goals which became overdue
+        """
+        etag = auth_client.get(self.url).headers['ETag']
+        # Goal due yesterday counted as not overdue before midnight
+        goal = GoalFactory.create(
+            category=self.categories[1],
+            user=user,
+            due_date=timezone.now().date() + timedelta(days=1),
+        )
+        Goal.objects.filter(id=goal.id).update(
+            due_date=timezone.now().date() - timedelta(days=1)
+        )
+        assert auth_client.get(self.url).json()['overdue'] == 1
+
+        call_command('rebuildcounters', rollover=1)
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['overdue'] == 2
+        counters = self.counters()
+        call_command('rebuildcounters')
+        assert self.counters() == counters
+
+    def test_counters_follow_goal_writes(self, auth_client):
+        """
+        Goal create, update and archive change counters like recount does
+        """
+        auth_client.post(
+            reverse('goals:goal-create'),
+            data={'title': 'new', 'category': self.categories[1].id},
+        )
+        goal = Goal.objects.filter(category=self.categories[0]).first()
+        auth_client.patch(
+            reverse('goals:goal', args=[goal.id]),
+            data={'status': Goal.Status.in_progress, 'category': self.categories[1].id},
+        )
+        auth_client.delete(reverse('goals:goal', args=[goal.id]))
+        other_goal = Goal.objects.filter(category=self.categories[0]).first()
+        auth_client.post(
+            reverse('goals:goal-bulk'),
+            data=[
+                {
+                    'action': 'create',
+                    'title': 'bulk',
+                    'category': self.categories[0].id,
+                },
+                {'action': 'archive', 'id': other_goal.id},
+            ],
+            format='json',
+        )
+
+        counters = self.counters()
+        call_command('rebuildcounters')
+        assert counters == self.counters()
+        assert auth_client.get(self.url).json()['total'] == 3
+
+    def test_category_delete_removes_counters(self, auth_client):
+        """
+        Goals of deleted category are not counted before they are archived
+        """
+        auth_client.delete(reverse('goals:category', args=[self.categories[0].id]))
+
+        assert auth_client.get(self.url).json()['total'] == 1
+        call_command('runcascades', once=True)
+        assert auth_client.get(self.url).json()['total'] == 1
+
+    def test_rebuild(self):
+        """
+        Recount repairs broken counters
+        """
+        counters = self.counters()
+        GoalCounter.objects.update(count=100)
+
+        call_command('rebuildcounters', board=[self.board.id])
+
+        assert self.counters() == counters
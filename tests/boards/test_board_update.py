@@ -0,0 +1,173 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import BoardParticipant
+from tests.factories import BoardFactory
+
+
+@pytest.mark.django_db()
+class TestBoardUpdate:
+    @pytest.fixture(autouse=True)
+    def setup(self, user, user_factory):
+        self.board = BoardFactory.create(with_owner=user)
+        self.url = reverse('goals:board', kwargs={'pk': self.board.id})
+        self.users = user_factory.create_batch(size=4)
+        for member, role in zip(
+            self.users[:3],
+            [
+                BoardParticipant.Role.writer,
+                BoardParticipant.Role.reader,
+                BoardParticipant.Role.reader,
+            ],
+        ):
+            BoardParticipant.objects.create(board=self.board, user=member, role=role)
+        self.participant_ids = dict(
+            BoardParticipant.objects.values_list('user_id', 'id')
+        )
+
+    def put(self, client, participants: list[tuple[int, int]]):
+        return client.put(
+            self.url,
+            data={
+                'title': 'New title',
+                'participants': [
+                    {'user': self.users[index].username, 'role': role}
+                    for index, role in participants
+                ],
+            },
+            format='json',
+        )
+
+    def test_participants_diff(self, auth_client, user):
+        """
+        Only removed, changed and new participants are touched
+        """
+        response = self.put(
+            auth_client,
+            [
+                (0, BoardParticipant.Role.writer),
+                (1, BoardParticipant.Role.writer),
+                (3, BoardParticipant.Role.reader),
+            ],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        participants = {
+            participant.user_id: participant
+            for participant in BoardParticipant.objects.filter(board=self.board)
+        }
+        assert {user_id: p.role for user_id, p in participants.items()} == {
+            user.id: BoardParticipant.Role.owner,
+            self.users[0].id: BoardParticipant.Role.writer,
+            self.users[1].id: BoardParticipant.Role.writer,
+            self.users[3].id: BoardParticipant.Role.reader,
+        }
+        for member in (user, *self.users[:2]):
+            assert participants[member.id].id == self.participant_ids[member.id]
+        assert len(response.json()['participants']) == 4
+
+    def test_unchanged_participants_are_not_written(self, auth_client):
+        """
+        Resubmitted participants produce no write queries on participants
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.put(
+                auth_client,
+                [
+                    (0, BoardParticipant.Role.writer),
+                    (1, BoardParticipant.Role.reader),
+                    (2, BoardParticipant.Role.reader),
+                ],
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        writes = [
+            query['sql']
+            for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+            and 'goals_boardparticipant' in query['sql']
+        ]
+        assert writes == []
+
+    def test_usernames_resolved_in_one_query(self, auth_client):
+        """
+        Users of participants are loaded with a single query
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.put(
+                auth_client,
+                [(index, BoardParticipant.Role.reader) for index in range(4)],
+            )
+
+        user_queries = [
+            query['sql']
+            for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "core_user"' in query['sql']
+            and '"core_user"."username" IN' in query['sql']
+        ]
+        assert len(user_queries) == 1
+
+    def test_unknown_username(self, auth_client):
+        """
+        Unknown username is reported for its list item
+        """
+        response = auth_client.put(
+            self.url,
+            data={
+                'title': 'New title',
+                'participants': [
+                    {'user': self.users[0].username, 'role': 2},
+                    {'user': 'nobody', 'role': 2},
+                ],
+            },
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        errors = response.json()['participants']
+        assert errors[0] == {}
+        assert list(errors[1]) == ['user']
+
+    def test_title_patch_keeps_participants(self, auth_client):
+        """
+        Partial update without participants keeps members and their roles,
+        before participants sync it removed every participant except owner
+        """
+        participants = set(
+            BoardParticipant.objects.filter(board=self.board).values_list(
+                'id', 'user_id', 'role', 'updated'
+            )
+        )
+
+        response = auth_client.patch(self.url, data={'title': 'Renamed'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert {
+            participant['user'] for participant in response.json()['participants']
+        } >= {member.username for member in self.users[:3]}
+        assert (
+            set(
+                BoardParticipant.objects.filter(board=self.board).values_list(
+                    'id', 'user_id', 'role', 'updated'
+                )
+            )
+            == participants
+        )
+
+    def test_version_is_read_only(self, auth_client):
+        """
+        Submitted version is ignored, board version is bumped by update only
+        """
+        self.board.refresh_from_db()
+        version = self.board.version
+
+        response = auth_client.patch(self.url, data={'version': 1000}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['version'] == version + 1
+        self.board.refresh_from_db()
+        assert self.board.version == version + 1
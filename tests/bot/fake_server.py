@@ -0,0 +1,72 @@
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeTelegram(ThreadingHTTPServer):
+    """
+    Local HTTP server with Telegram bot API responses. Scripted responses
+    are returned first, then message is echoed back
+    """
+
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+        self.requests: list[dict] = []
+        self.responses: deque[tuple[int, dict]] = deque()
+        self.clients: set[int] = set()
+        self.delay = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def add_response(self, status: int, data: dict) -> None:
+        self.responses.append((status, data))
+
+    def handle_error(self, request, client_address) -> None:
+        # Client closed connection after timeout
+        pass
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: FakeTelegram
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.lock:
+            self.server.clients.add(self.client_address[1])
+            self.server.requests.append(
+                {
+                    'path': self.path,
+                    'content_type': self.headers['Content-Type'],
+                    'json': json.loads(body),
+                }
+            )
+            if self.server.responses:
+                status, data = self.server.responses.popleft()
+            else:
+                status, data = 200, self.default_response(json.loads(body))
+        if self.server.delay:
+            threading.Event().wait(self.server.delay)
+        content = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def default_response(self, payload: dict) -> dict:
+        if self.path.endswith('/getUpdates'):
+            return {'ok': True, 'result': []}
+        return {
+            'ok': True,
+            'result': {'chat': {'id': payload['chat_id']}, 'text': payload['text']},
+        }
+
+    def log_message(self, *args) -> None:
+        pass
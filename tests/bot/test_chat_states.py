@@ -0,0 +1,87 @@
+import pytest
+from django.core.cache import caches
+
+from bot.management.commands.runbot import Command
+from bot.outbox import Outbox
+from bot.models import TgUser
+from bot.states import ChatStateStore
+from bot.tg.client import TgClient
+from bot.tg.schemas import Message
+from goals.models import Goal
+from tests.factories import BoardFactory, CategoryFactory, UserFactory
+
+
+@pytest.fixture()
+def states():
+    yield ChatStateStore()
+    caches['bot_states'].clear()
+
+
+def make_command(tg_server) -> Command:
+    command = Command()
+    command.tg_client = TgClient(token='token', base_url=tg_server.url)
+    command.outbox = Outbox(command.tg_client, chat_rate=100, chat_burst=100, window=0)
+    return command
+
+
+def send(command: Command, chat_id: int, text: str) -> None:
+    command.handle_message(Message(chat={'id': chat_id}, text=text))
+
+
+@pytest.mark.django_db()
+def test_concurrent_dialogs(tg_server, states):
+    """
+    Dialogs of chats do not share state and survive restart of bot
+    """
+    categories = {}
+    for chat_id in (1, 2):
+        user = UserFactory.create()
+        TgUser.objects.create(chat_id=chat_id, user=user)
+        board = BoardFactory.create(with_owner=user)
+        categories[chat_id] = CategoryFactory.create(board=board, user=user)
+
+    command = make_command(tg_server)
+    send(command, 1, '/create')
+    send(command, 2, '/create')
+    send(command, 1, str(categories[1].id))
+    send(command, 2, str(categories[2].id))
+
+    assert states.get(1)['user_category_id'] == categories[1].id
+    assert states.get(2)['user_category_id'] == categories[2].id
+
+    restarted = make_command(tg_server)
+    send(restarted, 2, 'second')
+    send(restarted, 1, 'first')
+
+    assert Goal.objects.get(category=categories[1]).title == 'first'
+    assert Goal.objects.get(category=categories[2]).title == 'second'
+    assert states.get(1) == {}
+    assert states.get(2) == {}
+    command.outbox.close()
+    restarted.outbox.close()
+
+
+def test_timeout(states, settings):
+    """
+    State of chat expires after cache timeout
+    """
+    settings.CACHES = {
+        **settings.CACHES,
+        'bot_states': {**settings.CACHES['bot_states'], 'TIMEOUT': 0},
+    }
+    store = ChatStateStore()
+    store.set(1, {'state': 'creating'})
+
+    assert store.get(1) == {}
+
+
+def test_eviction(states):
+    """
+    Number of stored states is bounded by max entries of cache
+    """
+    max_entries = states.cache._max_entries
+    for chat_id in range(max_entries + 1):
+        states.set(chat_id, {'state': 'creating'})
+
+    assert len(states.cache._cache) <= max_entries
+    assert states.get(max_entries) == {'state': 'creating'}
@@ -0,0 +1,168 @@
+import io
+import random
+import threading
+import time
+
+import pytest
+
+from bot.dispatcher import ChatDispatcher
+from bot.management.commands.runbot import Command
+from bot.models import TgUser
+from bot.outbox import Outbox
+from bot.tg.client import TgClient
+from bot.tg.schemas import UpdateObj
+
+
+def make_updates(chats: int, per_chat: int) -> list[UpdateObj]:
+    return [
+        UpdateObj(
+            update_id=number * chats + chat,
+            message={'chat': {'id': chat}, 'text': f'message {number}'},
+        )
+        for number in range(per_chat)
+        for chat in range(1, chats + 1)
+    ]
+
+
+def test_chat_order():
+    """
+    Updates of chat are handled in order, chats are handled concurrently
+    """
+    handled: dict[int, list[int]] = {}
+    running = []
+    max_running = 0
+    lock = threading.Lock()
+
+    def handler(update: UpdateObj) -> None:
+        nonlocal max_running
+        with lock:
+            running.append(update)
+            max_running = max(max_running, len(running))
+        time.sleep(random.random() / 100)
+        with lock:
+            running.remove(update)
+            handled.setdefault(update.message.chat.id, []).append(update.update_id)
+
+    dispatcher = ChatDispatcher(handler, workers=4)
+    updates = make_updates(chats=8, per_chat=5)
+    dispatcher.dispatch(updates)
+    dispatcher.close()
+
+    assert sum(len(chat_updates) for chat_updates in handled.values()) == 40
+    for chat, chat_updates in handled.items():
+        assert chat_updates == [
+            update.update_id for update in updates if update.message.chat.id == chat
+        ]
+    assert max_running == 4
+
+
+def test_handler_error():
+    """
+    Error of handler is raised after other chats are handled
+    """
+    handled = []
+
+    def handler(update: UpdateObj) -> None:
+        if update.message.chat.id == 1:
+            raise ValueError('failed')
+        handled.append(update.update_id)
+
+    dispatcher = ChatDispatcher(handler, workers=2)
+    with pytest.raises(ValueError):
+        dispatcher.dispatch(make_updates(chats=3, per_chat=2))
+    dispatcher.close()
+
+    assert sorted(handled) == [2, 3, 5, 6]
+
+
+def test_poll_skips_failed_update(tg_server):
+    """
+    Failed handler of one chat is logged, other chats are handled and offset
+    is moved past the batch
+    """
+
+    class Stop(Exception):
+        pass
+
+    updates = make_updates(chats=3, per_chat=2)
+    tg_server.add_response(
+        200, {'ok': True, 'result': [update.dict() for update in updates]}
+    )
+    handled = []
+    polls = 0
+
+    def handle_message(message) -> None:
+        if message.chat.id == 1:
+            raise ValueError('failed')
+        handled.append(message.chat.id)
+
+    def report_stats() -> None:
+        nonlocal polls
+        polls += 1
+        if polls == 2:
+            raise Stop
+
+    command = Command(stderr=io.StringIO())
+    command.tg_client = TgClient(token='token', base_url=tg_server.url)
+    command.handle_message = handle_message
+    command.report_stats = report_stats
+    dispatcher = ChatDispatcher(command.handle_update, workers=2)
+    try:
+        with pytest.raises(Stop):
+            command.poll(dispatcher)
+    finally:
+        dispatcher.close()
+        command.outbox.close()
+        command.tg_client.close()
+
+    assert sorted(handled) == [2, 2, 3, 3]
+    offsets = [request['json']['offset'] for request in tg_server.requests]
+    assert offsets == [0, updates[-1].update_id + 1]
+    assert command.stderr.getvalue().splitlines() == [
+        f"Update {update.update_id} failed: ValueError('failed')"
+        for update in updates
+        if update.message.chat.id == 1
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_chats(tg_server):
+    """
+    First updates of 8 chats are handled by 8 workers at once: handlers wait
+    for each other on barrier which is broken if they run one by one
+    """
+    updates = make_updates(chats=8, per_chat=2)
+    barrier = threading.Barrier(8, timeout=10)
+    command = Command()
+    command.tg_client = TgClient(token='token', base_url=tg_server.url)
+    command.outbox = Outbox(
+        command.tg_client,
+        rate=1000,
+        chat_rate=100,
+        chat_burst=100,
+        window=0,
+        workers=8,
+    )
+
+    def handle_update(update: UpdateObj) -> None:
+        if update.update_id <= 8:
+            barrier.wait()
+        command.handle_update(update)
+
+    dispatcher = ChatDispatcher(handle_update, workers=8)
+    try:
+        dispatcher.dispatch(updates)
+        command.outbox.flush()
+    finally:
+        dispatcher.close()
+        command.outbox.close()
+        command.tg_client.close()
+
+    assert TgUser.objects.count() == 8
+    assert (
+        sum(
+            request['json']['text'].count('verification code')
+            for request in tg_server.requests
+        )
+        == len(updates)
+    )
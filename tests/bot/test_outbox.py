@@ -0,0 +1,150 @@
+import time
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework import status
+
+from bot.outbox import MAX_MESSAGE_LENGTH, Outbox, split_text
+from bot.tg.client import TgClient
+
+
+@pytest.fixture()
+def make_outbox(tg_server):
+    caches['bot_limits'].clear()
+    outboxes = []
+
+    def _wrapper(**kwargs) -> Outbox:
+        client = TgClient(token='token', base_url=tg_server.url)
+        outbox = Outbox(client, **kwargs)
+        outboxes.append(outbox)
+        return outbox
+
+    yield _wrapper
+    for outbox in outboxes:
+        outbox.close()
+        outbox.client.close()
+
+
+def sent_texts(tg_server) -> list[str]:
+    return [request['json']['text'] for request in tg_server.requests]
+
+
+def test_split_text():
+    """
+    Long text is split by lines, long line is split by length
+    """
+    lines = ['a' * 3000, 'b' * 3000, 'c' * 5000]
+    parts = split_text('\n'.join(lines))
+
+    assert parts == ['a' * 3000, 'b' * 3000, 'c' * 4096, 'c' * 904]
+    assert split_text('text') == ['text']
+
+
+def test_send_off_critical_path(tg_server, make_outbox):
+    """
+    Message is queued without waiting for slow Telegram
+    """
+    tg_server.delay = 0.3
+    outbox = make_outbox(window=0)
+    started = time.monotonic()
+    outbox.send(chat_id=1, text='text')
+
+    assert time.monotonic() - started < 0.1
+    assert outbox.stats()['depth'] + outbox.stats()['in_flight'] == 1
+    assert outbox.flush(timeout=5)
+    assert sent_texts(tg_server) == ['text']
+    stats = outbox.stats()
+    assert stats['sent'] == 1
+    assert stats['depth'] == 0
+    assert stats['max_latency'] >= 0.3
+
+
+def test_coalesce(tg_server, make_outbox):
+    """
+    Messages to chat queued during window are sent as one message
+    """
+    outbox = make_outbox(window=0.2)
+    for number in range(3):
+        outbox.send(chat_id=1, text=f'message {number}')
+    outbox.send(chat_id=2, text='other chat')
+    outbox.flush(timeout=5)
+
+    assert sorted(sent_texts(tg_server)) == [
+        'message 0\nmessage 1\nmessage 2',
+        'other chat',
+    ]
+    assert outbox.stats()['merged'] == 2
+
+
+def test_split_long_message(tg_server, make_outbox):
+    """
+    Message longer than Telegram limit is sent in parts, merged parts fit limit
+    """
+    outbox = make_outbox(window=0.1, chat_rate=100)
+    outbox.send(chat_id=1, text='a' * 5000)
+    outbox.send(chat_id=1, text='b')
+    outbox.flush(timeout=5)
+
+    assert sent_texts(tg_server) == ['a' * MAX_MESSAGE_LENGTH, 'a' * 904 + '\nb']
+    assert outbox.stats()['split'] == 1
+
+
+def test_chat_rate(tg_server, make_outbox):
+    """
+    Messages to one chat are sent not faster than chat rate
+    """
+    outbox = make_outbox(window=0, chat_rate=5)
+    started = time.monotonic()
+    for number in range(4):
+        outbox.send(chat_id=1, text=f'message {number}')
+        outbox.flush(timeout=5)
+
+    assert time.monotonic() - started >= 0.39
+    assert sent_texts(tg_server) == [f'message {number}' for number in range(4)]
+
+
+def test_global_rate(tg_server, make_outbox):
+    """
+    Messages to all chats are sent not faster than global rate
+    """
+    outbox = make_outbox(window=0, rate=10)
+    started = time.monotonic()
+    for chat_id in range(30):
+        outbox.send(chat_id=chat_id, text='text')
+    outbox.flush(timeout=5)
+
+    assert time.monotonic() - started >= 0.99
+    assert len(tg_server.requests) == 30
+
+
+def test_shared_limits(tg_server, make_outbox):
+    """
+    Outboxes of different processes share limits of chat
+    """
+    outboxes = [make_outbox(window=0, chat_rate=4) for _ in range(2)]
+    started = time.monotonic()
+    for number in range(4):
+        outbox = outboxes[number % 2]
+        outbox.send(chat_id=1, text=f'message {number}')
+        outbox.flush(timeout=5)
+
+    assert time.monotonic() - started >= 0.49
+    assert sent_texts(tg_server) == [f'message {number}' for number in range(4)]
+
+
+@pytest.mark.django_db()
+def test_stats_view(client, user_factory):
+    """
+    Outbox stats are available for admin only
+    """
+    url = reverse('bot:outbox-stats')
+    user = user_factory.create()
+    client.force_login(user)
+    assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    user.is_staff = True
+    user.save()
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()) >= {'depth', 'avg_latency', 'max_latency'}
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from bot.tg.client import TgClient, TgClientError
+
+
+@pytest.fixture()
+def tg_client(tg_server) -> TgClient:
+    client = TgClient(token='token', base_url=tg_server.url, backoff=0)
+    yield client
+    client.close()
+
+
+def test_send_message(tg_server, tg_client):
+    """
+    Messages are sent as JSON by one keep-alive connection
+    """
+    for number in range(3):
+        response = tg_client.send_message(chat_id=1, text=f'text & {number}')
+        assert response.result.text == f'text & {number}'
+
+    assert [request['json'] for request in tg_server.requests] == [
+        {'chat_id': 1, 'text': f'text & {number}'} for number in range(3)
+    ]
+    assert tg_server.requests[0]['path'] == '/bottoken/sendMessage'
+    assert tg_server.requests[0]['content_type'] == 'application/json'
+    assert len(tg_server.clients) == 1
+
+
+def test_retry_after(tg_server, tg_client):
+    """
+    Flood limit is waited for retry_after seconds before retry
+    """
+    tg_server.add_response(
+        429,
+        {
+            'ok': False,
+            'error_code': 429,
+            'description': 'Too Many Requests: retry after 1',
+            'parameters': {'retry_after': 1},
+        },
+    )
+    started = time.monotonic()
+    response = tg_client.get_updates(offset=5, timeout=0)
+
+    assert response.result == []
+    assert time.monotonic() - started >= 1
+    assert len(tg_server.requests) == 2
+    assert tg_server.requests[1]['json'] == {'offset': 5, 'timeout': 0}
+
+
+def test_server_error_retries(tg_server, tg_client):
+    """
+    Server errors are retried limited number of times
+    """
+    for _ in range(tg_client.retries + 1):
+        tg_server.add_response(502, {'ok': False, 'description': 'Bad Gateway'})
+
+    with pytest.raises(TgClientError, match='Bad Gateway'):
+        tg_client.send_message(chat_id=1, text='text')
+    assert len(tg_server.requests) == tg_client.retries + 1
+
+
+def test_client_error(tg_server, tg_client):
+    """
+    Client errors are not retried
+    """
+    tg_server.add_response(400, {'ok': False, 'description': 'chat not found'})
+
+    with pytest.raises(TgClientError, match='chat not found'):
+        tg_client.send_message(chat_id=1, text='text')
+    assert len(tg_server.requests) == 1
+
+
+def test_read_timeout(tg_server):
+    """
+    Hung request fails by read timeout, message is not sent again
+    """
+    tg_server.delay = 0.5
+    client = TgClient(token='token', base_url=tg_server.url, read_timeout=0.1)
+
+    with pytest.raises(TgClientError):
+        client.send_message(chat_id=1, text='text')
+    assert len(tg_server.requests) == 1
+    client.close()
@@ -0,0 +1,158 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+from django.db import connection, connections
+from django.urls import reverse
+from rest_framework import status
+
+from bot.dispatcher import ChatDispatcher
+from bot.management.commands.runbot import Command
+from bot.outbox import Outbox
+from bot.models import TgUpdate
+from bot.tg.client import TgClient
+from bot.updates import update_queue
+
+SECRET = 'secret'
+
+
+def make_update(update_id: int, chat_id: int, text: str = 'text') -> dict:
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'chat': {'id': chat_id, 'type': 'private'},
+            'text': text,
+        },
+    }
+
+
+@pytest.fixture()
+def command(tg_server) -> Command:
+    command = Command()
+    command.tg_client = TgClient(token='token', base_url=tg_server.url)
+    command.outbox = Outbox(command.tg_client, chat_rate=100, chat_burst=100, window=0)
+    yield command
+    command.outbox.close()
+    command.tg_client.close()
+
+
+@pytest.mark.django_db()
+class TestWebhookView:
+    url = reverse('bot:webhook')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.BOT_WEBHOOK_SECRET = SECRET
+
+    def post(self, client, data: dict, token: str = SECRET):
+        return client.post(
+            self.url,
+            data=data,
+            format='json',
+            HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN=token,
+        )
+
+    def test_secret_token(self, client, settings):
+        """
+        Updates are accepted only with secret token
+        """
+        assert self.post(client, make_update(1, 1), token='wrong').status_code == (
+            status.HTTP_403_FORBIDDEN
+        )
+        settings.BOT_WEBHOOK_SECRET = ''
+        assert self.post(client, make_update(1, 1), token='').status_code == (
+            status.HTTP_403_FORBIDDEN
+        )
+        assert not TgUpdate.objects.exists()
+
+    def test_queue(self, client):
+        """
+        Update is queued once, updates without message are skipped
+        """
+        for _ in range(2):
+            response = self.post(client, make_update(1, 10))
+            assert response.status_code == status.HTTP_200_OK
+        response = self.post(client, {'update_id': 2, 'edited_message': {}})
+        assert response.status_code == status.HTTP_200_OK
+
+        update = TgUpdate.objects.get()
+        assert update.update_id == 1
+        assert update.chat_id == 10
+        assert update.data == make_update(1, 10)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drain_queue(tg_server, command):
+    """
+    Workers handle queued updates of each chat in order and empty queue
+    """
+    for update_id in range(1, 7):
+        chat_id = 100 + update_id % 2
+        update_queue.put(update_id, chat_id, make_update(update_id, chat_id))
+
+    assert update_queue.chats(limit=10) == [101, 100]
+    handled = []
+    handle_update = command.handle_update
+    command.handle_update = lambda update: (
+        handled.append(update.update_id),
+        handle_update(update),
+    )
+
+    dispatcher = ChatDispatcher(command.handle_update, workers=2)
+    command.drain_queue(dispatcher, chats=2, wait=0, once=True)
+    dispatcher.close()
+    command.outbox.flush()
+
+    assert not TgUpdate.objects.exists()
+    assert [update_id for update_id in handled if update_id % 2] == [1, 3, 5]
+    assert [update_id for update_id in handled if not update_id % 2] == [2, 4, 6]
+    for chat_id in (100, 101):
+        texts = [
+            request['json']['text']
+            for request in tg_server.requests
+            if request['json']['chat_id'] == chat_id
+        ]
+        assert '\n'.join(texts).count('verification code') == 3
+
+
+@pytest.mark.django_db()
+def test_locked_chat(tg_server, command):
+    """
+    Chat locked by other worker is skipped
+    """
+    update_queue.put(1, 100, make_update(1, 100))
+    with psycopg2.connect(**connection.get_connection_params()) as other:
+        with other.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_lock(100)')
+        command.drain_chat(100)
+        assert TgUpdate.objects.count() == 1
+        with other.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(100)')
+
+    command.drain_chat(100)
+    command.outbox.flush()
+    assert not TgUpdate.objects.exists()
+    assert len(tg_server.requests) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_wait_notification():
+    """
+    Waiting worker wakes up when update is queued
+    """
+
+    def put() -> None:
+        time.sleep(0.2)
+        update_queue.put(1, 100, make_update(1, 100))
+        connections.close_all()
+
+    thread = threading.Thread(target=put)
+    thread.start()
+    started = time.monotonic()
+    update_queue.wait(timeout=5)
+    thread.join()
+
+    assert time.monotonic() - started < 2
+    assert update_queue.chats(limit=1) == [100]
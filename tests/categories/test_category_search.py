@@ -0,0 +1,36 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tests.factories import BoardFactory, CategoryFactory
+
+
+@pytest.mark.django_db()
+class TestCategorySearch:
+    url = reverse('goals:category-list')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        board = BoardFactory.create(with_owner=user)
+        self.categories = {
+            title: CategoryFactory.create(board=board, user=user, title=title)
+            for title in ('Shopping', 'Shoping list', 'Work', 'Homework')
+        }
+
+    def search(self, client, **params) -> list[str]:
+        response = client.get(self.url, data=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [category['title'] for category in response.json()]
+
+    def test_substring_search(self, auth_client):
+        """
+        Default search matches title substring
+        """
+        assert self.search(auth_client, search='work') == ['Homework', 'Work']
+
+    def test_similar_search(self, auth_client):
+        """
+        Similar search mode matches misspelled titles ordered by similarity
+        """
+        result = self.search(auth_client, search='shoping', search_mode='similar')
+        assert result == ['Shopping', 'Shoping list']
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+
+from goals.models import BoardParticipant
+from tests.factories import BoardParticipantFactory, CommentFactory
+
+
+def membership_queries(context: CaptureQueriesContext) -> list[str]:
+    return [
+        q['sql']
+        for q in context.captured_queries
+        if 'goals_boardparticipant' in q['sql']
+    ]
+
+
+@pytest.mark.django_db()
+class TestCommentUpdateView:
+    @staticmethod
+    def get_url(comment_pk: int) -> str:
+        return reverse('goals:comment', kwargs={'pk': comment_pk})
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        self.comment = CommentFactory.create(user=user)
+        self.participant = BoardParticipantFactory.create(
+            user=user,
+            board=self.comment.goal.category.board,
+            role=BoardParticipant.Role.writer,
+        )
+        self.url = self.get_url(self.comment.id)
+
+    def test_update_comment_checks_membership_once(self, auth_client):
+        """
+        Comment update loads user board roles with one query
+        """
+        with CaptureQueriesContext(connection) as context:
+            response: Response = auth_client.patch(self.url, data={'text': 'new text'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['text'] == 'new text'
+        assert len(membership_queries(context)) == 1
+
+    def test_reader_failed_to_update_comment(self, auth_client):
+        """
+        Reader can`t update comment
+        """
+        self.participant.role = BoardParticipant.Role.reader
+        self.participant.save()
+
+        response: Response = auth_client.patch(self.url, data={'text': 'new text'})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_create_comment_checks_membership_once(self, auth_client):
+        """
+        Comment create loads user board roles with one query
+        """
+        with CaptureQueriesContext(connection) as context:
+            response: Response = auth_client.post(
+                reverse('goals:comment-create'),
+                data={'text': 'text', 'goal': self.comment.goal_id},
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(membership_queries(context)) == 1
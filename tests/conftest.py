@@ -1,4 +1,26 @@
+import pytest
+
 pytest_plugins = [
     'tests.factories',
     'tests.fixtures',
 ]
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        '--benchmark', action='store_true', help='Run benchmark tests with timings'
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """
+    Skip benchmark tests unless they are requested, timings depend on machine
+    """
+    if config.getoption('--benchmark'):
+        return
+    skip = pytest.mark.skip(reason='benchmark, run with --benchmark')
+    for item in items:
+        if 'benchmark' in item.keywords:
+            item.add_marker(skip)
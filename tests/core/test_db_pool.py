@@ -0,0 +1,149 @@
+import threading
+import time
+
+import psycopg2
+import pytest
+from django.db import connection
+from django.urls import reverse
+from psycopg2 import extensions
+from rest_framework import status
+
+from core.db.base import DatabaseWrapper
+from core.db.pool import ConnectionPool, PoolTimeout, close_pools
+
+
+@pytest.mark.django_db()
+class TestConnectionPool:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        params = connection.get_connection_params()
+        self.connect = lambda: psycopg2.connect(**params)
+        self.pools = []
+        yield
+        for pool in self.pools:
+            pool.close()
+
+    def make_pool(self, **kwargs) -> ConnectionPool:
+        pool = ConnectionPool(self.connect, **kwargs)
+        self.pools.append(pool)
+        return pool
+
+    def test_reuse(self):
+        """
+        Released connection is reused instead of opening new one
+        """
+        pool = self.make_pool()
+        first = pool.acquire()
+        pool.release(first)
+
+        assert pool.acquire() is first
+        assert pool.stats()['connections_created'] == 1
+        assert pool.stats()['in_use'] == 1
+
+    def test_wait_for_release(self):
+        """
+        Full pool waits for released connection and counts wait time
+        """
+        pool = self.make_pool(max_size=1, timeout=5)
+        held = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.1)
+        pool.release(held)
+        waiter.join()
+
+        stats = pool.stats()
+        assert acquired == [held]
+        assert stats['waits'] == 1
+        assert stats['max_wait_time'] >= 0.05
+        assert stats['size'] == 1
+
+    def test_timeout(self):
+        """
+        Waiting for connection of full pool is limited by timeout
+        """
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        held = pool.acquire()
+
+        with pytest.raises(PoolTimeout):
+            pool.acquire()
+        assert pool.stats()['timeouts'] == 1
+        pool.release(held)
+
+    def test_release_rolls_back(self):
+        """
+        Transaction left open by user of connection is rolled back
+        """
+        pool = self.make_pool()
+        conn = pool.acquire()
+        conn.cursor().execute('SELECT 1')
+        pool.release(conn)
+
+        transaction_status = conn.info.transaction_status
+        assert transaction_status == extensions.TRANSACTION_STATUS_IDLE
+
+    def test_health_check(self):
+        """
+        Idle connection closed by server is replaced by new connection
+        """
+        pool = self.make_pool()
+        conn = pool.acquire()
+        pool.release(conn)
+        with self.connect() as other, other.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [conn.info.backend_pid])
+
+        new_conn = pool.acquire()
+
+        assert new_conn is not conn
+        assert pool.stats()['connections_created'] == 2
+        assert pool.stats()['size'] == 1
+
+    def test_idle_timeout(self):
+        """
+        Connections idle longer than max idle are closed except min size
+        """
+        pool = self.make_pool(max_idle=0)
+        conn = pool.acquire()
+        pool.release(conn)
+
+        assert pool.acquire() is not conn
+        assert conn.closed
+
+    def test_backend(self):
+        """
+        Database backend returns closed connections to pool
+        """
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'ENGINE': 'core.db', 'CONN_MAX_AGE': 0},
+            alias=connection.alias,
+        )
+        for _ in range(3):
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            wrapper.close()
+
+        pool = wrapper.get_pool(wrapper.get_connection_params())
+        stats = pool.stats()
+        assert stats['connections_created'] == 1
+        assert stats['requests'] == 3
+        assert stats['idle'] == 1
+        close_pools()
+        assert pool.stats()['size'] == 0
+
+
+@pytest.mark.django_db()
+def test_pool_stats_view(client, user_factory):
+    """
+    Pool stats are available for admin only
+    """
+    url = reverse('core:db-pool-stats')
+    user = user_factory.create()
+    client.force_login(user)
+    assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    user.is_staff = True
+    user.save()
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json(), list)
@@ -0,0 +1,98 @@
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.urls import reverse
+from rest_framework import status
+
+from core.db import routers
+from core.db.routers import use_replicas
+from core.middleware import PRIMARY_COOKIE
+from goals.models import Goal
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.fixture()
+def replica(transactional_db, settings):
+    """
+    Copy of test database as replica which lags behind primary
+    """
+    name = f'{connection.settings_dict["NAME"]}_replica'
+    template = connection.settings_dict['NAME']
+    connection.close()
+    with connection._nodb_cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{name}"')
+        cursor.execute(f'CREATE DATABASE "{name}" TEMPLATE "{template}"')
+    connections.settings['replica'] = {**connection.settings_dict, 'NAME': name}
+    settings.DATABASE_REPLICAS = ['replica']
+    routers.unavailable.clear()
+    yield 'replica'
+    connections['replica'].close()
+    del connections['replica']
+    del connections.settings['replica']
+    routers.unavailable.clear()
+    with connection._nodb_cursor() as cursor:
+        cursor.execute(f'DROP DATABASE "{name}"')
+
+
+@pytest.fixture()
+def goal(replica, user):
+    board = BoardFactory.create(with_owner=user)
+    category = CategoryFactory.create(board=board, user=user)
+    return GoalFactory.create(category=category, user=user)
+
+
+class TestReplicaRouter:
+    def test_reads_from_replica(self, goal):
+        """
+        Reads go to replica until write in the same block
+        """
+        with use_replicas():
+            assert Goal.objects.all().db == 'replica'
+            assert not Goal.objects.filter(id=goal.id).exists()
+
+            Goal.objects.filter(id=goal.id).update(title='updated')
+
+            assert Goal.objects.all().db == DEFAULT_DB_ALIAS
+            assert Goal.objects.get(id=goal.id).title == 'updated'
+
+        assert Goal.objects.filter(id=goal.id).exists()
+
+    def test_unavailable_replica(self, goal, settings):
+        """
+        Reads fall back to primary when replica can not be connected
+        """
+        connections.settings['broken'] = {
+            **connection.settings_dict,
+            'HOST': '127.0.0.1',
+            'PORT': '1',
+        }
+        settings.DATABASE_REPLICAS = ['broken']
+        try:
+            with use_replicas():
+                assert Goal.objects.filter(id=goal.id).exists()
+                assert Goal.objects.all().db == DEFAULT_DB_ALIAS
+            assert 'broken' in routers.unavailable
+
+            settings.DATABASE_REPLICAS = ['broken', 'replica']
+            with use_replicas():
+                assert Goal.objects.all().db == 'replica'
+        finally:
+            del connections['broken']
+            del connections.settings['broken']
+
+    def test_sticky_primary(self, goal, client, user):
+        """
+        Client reads from primary after write, other clients read from replica
+        """
+        client.force_login(user)
+        url = reverse('goals:goal', kwargs={'pk': goal.id})
+        # User exists only on primary
+        client.cookies[PRIMARY_COOKIE] = '1'
+        assert client.get(url).status_code == status.HTTP_200_OK
+
+        del client.cookies[PRIMARY_COOKIE]
+        assert client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        response = client.patch(url, data={'title': 'updated'}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.cookies[PRIMARY_COOKIE]['max-age'] == 10
+        assert client.get(url).json()['title'] == 'updated'
@@ -0,0 +1,133 @@
+import io
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import msgpack
+import pytest
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import MessagePackParser, ORJSONParser
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+DATA = {
+    'id': 1,
+    'title': 'Цель «1»\u2028line',
+    'created': datetime(2023, 5, 1, 10, 20, 30, 123456, tzinfo=timezone.utc),
+    'local': datetime(2023, 5, 1, 10, 20, 30, tzinfo=timezone(timedelta(hours=3))),
+    'naive': datetime(2023, 5, 1, 10, 20, 30),
+    'due_date': date(2023, 5, 2),
+    'duration': timedelta(hours=1),
+    'amount': Decimal('12.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'label': gettext_lazy('Title'),
+    'items': [None, True, 1.5, ('a', 'b')],
+    'status': {1: 2, 3: 0},
+}
+
+
+def make_page(size: int) -> list[dict]:
+    return [DATA | {'id': i, 'title': f'goal {i}'} for i in range(size)]
+
+
+class TestORJSONRenderer:
+    def test_equal_to_json_renderer(self):
+        """
+        orjson renderer output is byte for byte equal to JSONRenderer output
+        """
+        assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_indent(self):
+        """
+        Pretty printed JSON is rendered like by JSONRenderer
+        """
+        media_type = 'application/json; indent=4'
+        assert ORJSONRenderer().render(DATA, media_type) == JSONRenderer().render(
+            DATA, media_type
+        )
+
+    def test_round_trip(self):
+        """
+        Rendered JSON is parsed back to encoded values
+        """
+        content = ORJSONRenderer().render(DATA)
+        parsed = ORJSONParser().parse(io.BytesIO(content))
+
+        assert parsed['created'] == '2023-05-01T10:20:30.123456Z'
+        assert parsed['amount'] == 12.5
+        assert parsed['title'] == DATA['title']
+
+    def test_parse_error(self):
+        """
+        Invalid JSON raises parse error
+        """
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"title": '))
+
+    @pytest.mark.benchmark
+    def test_throughput(self):
+        """
+        orjson renderer is faster than JSONRenderer on large page
+        """
+        page = make_page(1000)
+        timings = {}
+        for renderer in (JSONRenderer(), ORJSONRenderer(), MessagePackRenderer()):
+            started = time.perf_counter()
+            for _ in range(5):
+                renderer.render(page)
+            timings[type(renderer).__name__] = (time.perf_counter() - started) / 5
+        assert timings['ORJSONRenderer'] < timings['JSONRenderer'], ', '.join(
+            f'{name} {len(page) / seconds:.0f} rows/s'
+            for name, seconds in timings.items()
+        )
+
+
+class TestMessagePack:
+    def test_round_trip(self):
+        """
+        MessagePack carries the same values as JSON, int keys are kept
+        """
+        content = MessagePackRenderer().render(DATA)
+        parsed = MessagePackParser().parse(io.BytesIO(content))
+        json_parsed = ORJSONParser().parse(io.BytesIO(ORJSONRenderer().render(DATA)))
+
+        assert parsed.pop('status') == DATA['status']
+        assert json_parsed.pop('status') == {'1': 2, '3': 0}
+        assert parsed == json_parsed
+
+    def test_parse_error(self):
+        """
+        Invalid MessagePack raises parse error
+        """
+        with pytest.raises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b'\xc1'))
+
+    @pytest.mark.django_db()
+    def test_content_negotiation(self, auth_client, user):
+        """
+        Client gets MessagePack response and sends MessagePack request
+        """
+        board = BoardFactory.create(with_owner=user)
+        category = CategoryFactory.create(board=board, user=user)
+        GoalFactory.create(category=category, user=user)
+        url = reverse('goals:goal-list')
+
+        response = auth_client.get(url, HTTP_ACCEPT='application/msgpack')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['Content-Type'] == 'application/msgpack'
+        assert msgpack.unpackb(response.content) == auth_client.get(url).json()
+
+        response = auth_client.post(
+            reverse('goals:goal-create'),
+            data=msgpack.packb({'title': 'packed', 'category': category.id}),
+            content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert msgpack.unpackb(response.content)['title'] == 'packed'
@@ -0,0 +1,87 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from core.views import UserAutocompleteView
+
+
+@pytest.mark.django_db()
+class TestUserAutocompleteView:
+    url = reverse('core:user-autocomplete')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory):
+        for username in ('alexander', 'alexey', 'alena', 'boris', 'aleksandra'):
+            user_factory.create(username=username)
+
+    def test_auth_required(self, client):
+        """
+        Unauthorized user get Authorization error
+        """
+        response: Response = client.get(self.url, data={'username': 'ale'})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_autocomplete_by_prefix(self, auth_client):
+        """
+        Users are matched by username prefix
+        """
+        response: Response = auth_client.get(self.url, data={'username': 'alex'})
+
+        assert response.status_code == status.HTTP_200_OK
+        usernames = [user['username'] for user in response.json()]
+        assert usernames[:2] == ['alexey', 'alexander']
+        assert 'boris' not in usernames
+        assert set(response.json()[0]) == {'id', 'username'}
+
+    def test_autocomplete_similar_username(self, auth_client):
+        """
+        Users are matched by similar username
+        """
+        response: Response = auth_client.get(self.url, data={'username': 'aleksander'})
+        usernames = [user['username'] for user in response.json()]
+        assert usernames[:2] == ['aleksandra', 'alexander']
+
+    def test_autocomplete_limit(self, auth_client):
+        """
+        Number of users is limited
+        """
+        response: Response = auth_client.get(
+            self.url, data={'username': 'ale', 'limit': 2}
+        )
+        assert len(response.json()) == 2
+
+    def test_autocomplete_empty_term(self, auth_client):
+        """
+        Empty search term returns no users
+        """
+        response: Response = auth_client.get(self.url)
+        assert response.json() == []
+
+    def test_autocomplete_uses_trigram_index(self):
+        """
+        Prefix and similarity conditions of view are both served by trigram index
+        """
+        view = UserAutocompleteView()
+        view.request = Request(APIRequestFactory().get(self.url, {'username': 'Alex'}))
+        queryset = view.get_queryset()
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+
+        assert 'ILIKE' in str(queryset.query)
+        assert 'UPPER' not in str(queryset.query)
+        assert 'Seq Scan' not in plan
+        assert 'BitmapOr' in plan
+        assert plan.count('user_username_trgm_idx') == 2
+
+    def test_autocomplete_prefix_is_escaped(self, auth_client, user_factory):
+        """
+        Wildcards of search term are matched literally
+        """
+        user_factory.create(username='al_x')
+        response: Response = auth_client.get(self.url, data={'username': 'al_'})
+        assert response.json()[0]['username'] == 'al_x'
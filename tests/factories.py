@@ -3,7 +3,7 @@ from django.utils import timezone
 from pytest_factoryboy import register
 
 from core.models import User
-from goals.models import Board, BoardParticipant, GoalCategory
+from goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
 
 
 @register
@@ -63,3 +63,23 @@ class CategoryFactory(DatesFactory):
 
     class Meta:
         model = GoalCategory
+
+
+@register()
+class GoalFactory(DatesFactory):
+    category = factory.SubFactory(CategoryFactory)
+    user = factory.SubFactory(UserFactory)
+    title = factory.Faker('sentence')
+
+    class Meta:
+        model = Goal
+
+
+@register()
+class CommentFactory(DatesFactory):
+    goal = factory.SubFactory(GoalFactory)
+    user = factory.SubFactory(UserFactory)
+    text = factory.Faker('sentence')
+
+    class Meta:
+        model = GoalComment
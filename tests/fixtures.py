@@ -1,8 +1,10 @@
-from typing import Callable
+import threading
+from typing import Callable, Iterator
 
 import pytest
 from rest_framework.test import APIClient
 
+from tests.bot.fake_server import FakeTelegram
 from tests.factories import BoardParticipantFactory
 
 
@@ -39,3 +41,14 @@ def client() -> APIClient:
 def auth_client(client: APIClient, user) -> APIClient:
     client.force_login(user)
     return client
+
+
+@pytest.fixture()
+def tg_server() -> Iterator[FakeTelegram]:
+    server = FakeTelegram()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
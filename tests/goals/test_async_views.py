@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+from rest_framework import status
+
+from tests.factories import BoardFactory, CategoryFactory, CommentFactory, GoalFactory
+from todolist.asgi import is_sync_streaming
+
+
+@pytest.mark.django_db()
+class TestAsyncViews:
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        self.board = BoardFactory.create(with_owner=user)
+        self.category = CategoryFactory.create(board=self.board, user=user)
+        self.goal = GoalFactory.create(category=self.category, user=user)
+        self.comment = CommentFactory.create(goal=self.goal, user=user)
+
+    def urls(self) -> list[str]:
+        return [
+            reverse('goals:goal-list'),
+            reverse('goals:category-list'),
+            reverse('goals:comment-list'),
+            reverse('goals:board-list'),
+            reverse('goals:goal', kwargs={'pk': self.goal.id}),
+            reverse('goals:category', kwargs={'pk': self.category.id}),
+            reverse('goals:comment', kwargs={'pk': self.comment.id}),
+            reverse('goals:board', kwargs={'pk': self.board.id}),
+        ]
+
+    def test_views_are_async(self):
+        """
+        List and retrieve views are coroutines, export views stay streamed by WSGI
+        """
+        for url in self.urls():
+            assert asyncio.iscoroutinefunction(resolve(url).func), url
+
+        assert is_sync_streaming(reverse('goals:goal-export'))
+        assert is_sync_streaming(reverse('goals:comment-export'))
+        assert not is_sync_streaming(reverse('goals:goal-list'))
+        assert not is_sync_streaming('/unknown')
+
+    def test_concurrent_requests(self, user, auth_client):
+        """
+        Concurrent requests on event loop get the same data as sync client
+        """
+        client = AsyncClient()
+        client.force_login(user)
+        urls = self.urls()
+
+        async def get_all() -> list:
+            return await asyncio.gather(*(client.get(url) for url in urls))
+
+        responses = async_to_sync(get_all)()
+
+        for url, response in zip(urls, responses):
+            assert response.status_code == status.HTTP_200_OK, url
+            assert response.json() == auth_client.get(url).json()
+
+    def test_not_found(self, auth_client):
+        """
+        Async retrieve of missing object is not found
+        """
+        response = auth_client.get(reverse('goals:goal', kwargs={'pk': 0}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_update_by_sync_handler(self, auth_client):
+        """
+        Sync update handler of async view is run in thread
+        """
+        url = reverse('goals:goal', kwargs={'pk': self.goal.id})
+        response = auth_client.patch(url, data={'title': 'updated'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert auth_client.get(url).json()['title'] == 'updated'
@@ -0,0 +1,128 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals.cascade import run_cascade_task
+from goals.models import CascadeTask, Goal
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestCascade:
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        self.board = BoardFactory.create(with_owner=user)
+        self.categories = CategoryFactory.create_batch(
+            size=2, board=self.board, user=user
+        )
+        self.goals = [
+            GoalFactory.create(category=category, user=user)
+            for category in self.categories
+            for _ in range(3)
+        ]
+        self.other_goal = GoalFactory.create()
+
+    def archived(self) -> int:
+        return Goal.objects.filter(status=Goal.Status.archived).count()
+
+    def test_board_delete_archives_goals_in_background(self, auth_client):
+        """
+        Board delete marks categories deleted and queues goals archiving
+        """
+        response = auth_client.delete(reverse('goals:board', args=[self.board.id]))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not self.board.categories.filter(is_deleted=False).exists()
+        assert self.archived() == 0
+
+        call_command('runcascades', once=True, chunk_size=2)
+
+        task = CascadeTask.objects.get(board=self.board)
+        assert task.status == CascadeTask.Status.done
+        assert task.processed == task.total == len(self.goals)
+        assert self.archived() == len(self.goals)
+
+    def test_category_delete_archives_goals_in_background(self, auth_client):
+        """
+        Category delete queues archiving of category goals only
+        """
+        category = self.categories[0]
+        response = auth_client.delete(reverse('goals:category', args=[category.id]))
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        call_command('runcascades', once=True)
+        assert self.archived() == category.goals.count() == 3
+
+    def test_resume_interrupted_task(self):
+        """
+        Interrupted task continues from last committed chunk
+        """
+        task = CascadeTask.objects.create(board=self.board)
+
+        def interrupt(current_task: CascadeTask) -> None:
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            run_cascade_task(task, chunk_size=4, on_progress=interrupt)
+
+        task.refresh_from_db()
+        assert task.status == CascadeTask.Status.running
+        assert task.processed == self.archived() == 4
+
+        run_cascade_task(task, chunk_size=4)
+        assert task.status == CascadeTask.Status.done
+        assert task.processed == self.archived() == len(self.goals)
+
+    def test_claim(self):
+        """
+        Claimed task is not taken by other worker until its claim is expired
+        """
+        first, second = CascadeTask.objects.bulk_create(
+            [CascadeTask(board=self.board), CascadeTask(category=self.categories[0])]
+        )
+        lease = timedelta(minutes=5)
+
+        assert CascadeTask.claim(lease) == first
+        assert CascadeTask.claim(lease) == second
+        assert CascadeTask.claim(lease) is None
+
+        CascadeTask.objects.filter(id=first.id).update(
+            claimed_until=timezone.now() - timedelta(seconds=1)
+        )
+        assert CascadeTask.claim(lease) == first
+
+
+@pytest.mark.django_db(transaction=True)
+def test_claim_skips_locked_task(user):
+    """
+    Task row locked by other worker is skipped without waiting
+    """
+    board = BoardFactory.create(with_owner=user)
+    first, second = CascadeTask.objects.bulk_create(
+        [CascadeTask(board=board), CascadeTask(board=board)]
+    )
+    locked, release = threading.Event(), threading.Event()
+
+    def lock_first() -> None:
+        try:
+            with transaction.atomic():
+                CascadeTask.objects.select_for_update().get(id=first.id)
+                locked.set()
+                release.wait(5)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=lock_first)
+    thread.start()
+    try:
+        assert locked.wait(5)
+        assert CascadeTask.claim(timedelta(minutes=5)) == second
+    finally:
+        release.set()
+        thread.join()
@@ -0,0 +1,113 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from goals.cascade import run_cascade_task
+from goals.models import CascadeTask, Goal
+from tests.factories import BoardFactory, CategoryFactory, CommentFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestCommentList:
+    url = reverse('goals:comment-list')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        board = BoardFactory.create(with_owner=user)
+        category = CategoryFactory.create(board=board, user=user)
+        self.goal, self.other_goal = GoalFactory.create_batch(
+            size=2, category=category, user=user
+        )
+        self.comments = CommentFactory.create_batch(size=7, goal=self.goal)
+        self.other_comment = CommentFactory.create(goal=self.other_goal)
+
+    def get_ids(self, client, **params) -> list[int]:
+        response = client.get(self.url, data=params)
+        assert response.status_code == status.HTTP_200_OK
+        return [comment['id'] for comment in response.json()]
+
+    def test_scoped_by_goal(self, auth_client):
+        """
+        Only comments of requested goal are returned
+        """
+        ids = self.get_ids(auth_client, goal=self.goal.id)
+        assert ids == [comment.id for comment in reversed(self.comments)]
+
+    def test_archived_goal(self, auth_client):
+        """
+        Comments of archived goal are not returned
+        """
+        self.goal.status = Goal.Status.archived
+        self.goal.save()
+
+        assert self.get_ids(auth_client, goal=self.goal.id) == []
+        assert self.get_ids(auth_client) == [self.other_comment.id]
+
+        self.goal.status = Goal.Status.to_do
+        self.goal.save()
+
+        assert len(self.get_ids(auth_client)) == 8
+
+    def test_archived_by_cascade(self, auth_client):
+        """
+        Comments of goals archived by category deletion are not returned
+        """
+        task = CascadeTask.objects.create(category=self.goal.category)
+        run_cascade_task(task)
+
+        assert self.get_ids(auth_client) == []
+
+    def test_foreign_goal(self, auth_client):
+        """
+        Comments of goal on foreign board are not returned
+        """
+        foreign_comment = CommentFactory.create()
+
+        assert self.get_ids(auth_client, goal=foreign_comment.goal_id) == []
+
+    def test_cursor_pages(self, auth_client):
+        """
+        Cursor pages return every comment once in (created, id) order
+        """
+        url = f'{self.url}?goal={self.goal.id}&cursor=&limit=3'
+        ids = []
+        while url:
+            page = auth_client.get(url).json()
+            ids += [comment['id'] for comment in page['results']]
+            url = page['next']
+
+        assert ids == [comment.id for comment in reversed(self.comments)]
+
+    def test_offset_pages(self, auth_client):
+        """
+        Requests without cursor keep limit offset pagination
+        """
+        response = auth_client.get(
+            self.url, data={'goal': self.goal.id, 'offset': 3, 'limit': 2}
+        )
+
+        assert response.json()['count'] == 7
+        assert [comment['id'] for comment in response.json()['results']] == [
+            comment.id for comment in reversed(self.comments[2:4])
+        ]
+
+    def test_query_count_is_constant(self, auth_client, user_factory):
+        """
+        Number of queries does not depend on number of comments and authors
+        """
+
+        def count_queries() -> int:
+            with CaptureQueriesContext(connection) as queries:
+                response = auth_client.get(
+                    self.url, data={'goal': self.goal.id, 'cursor': '', 'limit': 100}
+                )
+            assert response.status_code == status.HTTP_200_OK
+            return len(queries)
+
+        small = count_queries()
+        for author in user_factory.create_batch(size=20):
+            CommentFactory.create_batch(size=2, goal=self.goal, user=author)
+
+        assert count_queries() == small
@@ -0,0 +1,126 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from goals.models import BoardParticipant
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestConditionalGet:
+    url = reverse('goals:goal-list')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        self.board = BoardFactory.create(with_owner=user)
+        self.category = CategoryFactory.create(board=self.board, user=user)
+        self.goal = GoalFactory.create(category=self.category, user=user)
+
+    def test_not_modified_list(self, auth_client):
+        """
+        Repeated list request with ETag gets not modified without goals query
+        """
+        response = auth_client.get(self.url, data={'limit': 10})
+        etag = response.headers['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = auth_client.get(
+                self.url, data={'limit': 10}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers['ETag'] == etag
+        assert not [q for q in context.captured_queries if 'goals_goal"' in q['sql']]
+
+    def test_etag_depends_on_query_params(self, auth_client):
+        """
+        Different query params have different ETags
+        """
+        first = auth_client.get(self.url, data={'limit': 10, 'offset': 0})
+        second = auth_client.get(self.url, data={'offset': 0, 'limit': 10})
+        third = auth_client.get(self.url, data={'limit': 5})
+
+        assert first.headers['ETag'] == second.headers['ETag']
+        assert first.headers['ETag'] != third.headers['ETag']
+
+    @pytest.mark.parametrize(
+        'method, url_name, data',
+        [
+            (
+                'post',
+                'goals:goal-create',
+                lambda goal: {'title': 'new', 'category': goal.category_id},
+            ),
+            ('patch', 'goals:goal', lambda goal: {'title': 'changed'}),
+            ('delete', 'goals:goal', lambda goal: None),
+            (
+                'post',
+                'goals:comment-create',
+                lambda goal: {'text': 'text', 'goal': goal.id},
+            ),
+        ],
+        ids=['create', 'update', 'delete', 'comment'],
+    )
+    def test_write_changes_etag(self, auth_client, method, url_name, data):
+        """
+        Write to board content changes ETag of list
+        """
+        etag = auth_client.get(self.url).headers['ETag']
+
+        url = reverse(url_name, args=[] if 'create' in url_name else [self.goal.id])
+        response = getattr(auth_client, method)(url, data=data(self.goal))
+        assert status.is_success(response.status_code)
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers['ETag'] != etag
+
+    def test_profile_update_changes_etag(self, auth_client, user_factory):
+        """
+        Profile change of goal author changes ETag of boards which show author
+        """
+        author = user_factory.create()
+        BoardParticipant.objects.create(
+            board=self.board, user=author, role=BoardParticipant.Role.writer
+        )
+        GoalFactory.create(category=self.category, user=author)
+        other_board = BoardFactory.create(with_owner=self.goal.user)
+        version = other_board.version
+        etag = auth_client.get(self.url).headers['ETag']
+
+        client = APIClient()
+        client.force_login(author)
+        response = client.patch(
+            reverse('core:profile'), data={'first_name': 'Changed'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = auth_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Changed' in [goal['user']['first_name'] for goal in response.json()]
+        other_board.refresh_from_db()
+        assert other_board.version == version
+
+    def test_board_not_modified_since(self, auth_client):
+        """
+        Board detail supports If-Modified-Since
+        """
+        url = reverse('goals:board', args=[self.board.id])
+        response = auth_client.get(url)
+        last_modified = response.headers['Last-Modified']
+
+        response = auth_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_foreign_board_is_not_conditional(self, client, user_factory):
+        """
+        Not participant gets permission error instead of not modified
+        """
+        url = reverse('goals:board', args=[self.board.id])
+        client.force_login(user_factory.create())
+
+        response = client.get(url, HTTP_IF_NONE_MATCH='*')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
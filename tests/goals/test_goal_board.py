@@ -0,0 +1,90 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from goals.models import Goal, GoalComment
+from tests.factories import BoardFactory, CategoryFactory, CommentFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestGoalBoard:
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        self.board, self.other_board = BoardFactory.create_batch(
+            size=2, with_owner=user
+        )
+        self.category = CategoryFactory.create(board=self.board, user=user)
+        self.other_category = CategoryFactory.create(board=self.other_board, user=user)
+        self.goal = GoalFactory.create(category=self.category, user=user)
+        self.comment = CommentFactory.create(goal=self.goal, user=user)
+
+    def test_board_is_set_on_create(self):
+        """
+        Goal and comment get board of category on create
+        """
+        assert self.goal.board_id == self.board.id
+        assert self.comment.board_id == self.board.id
+
+    def test_goal_move_to_other_board(self, auth_client):
+        """
+        Goal moved to category of other board moves its comments
+        """
+        response = auth_client.patch(
+            reverse('goals:goal', args=[self.goal.id]),
+            data={'category': self.other_category.id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['board'] == self.other_board.id
+        assert Goal.objects.get(id=self.goal.id).board_id == self.other_board.id
+        assert GoalComment.objects.get(id=self.comment.id).board_id == (
+            self.other_board.id
+        )
+
+    def test_bulk_goal_move_to_other_board(self, auth_client):
+        """
+        Bulk update of goal category moves goal and its comments
+        """
+        response = auth_client.post(
+            reverse('goals:goal-bulk'),
+            data=[
+                {
+                    'action': 'update',
+                    'id': self.goal.id,
+                    'category': self.other_category.id,
+                }
+            ],
+            format='json',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Goal.objects.get(id=self.goal.id).board_id == self.other_board.id
+        assert GoalComment.objects.get(id=self.comment.id).board_id == (
+            self.other_board.id
+        )
+
+    def test_category_move_to_other_board(self, auth_client):
+        """
+        Category moved to other board moves its goals and comments
+        """
+        response = auth_client.patch(
+            reverse('goals:category', args=[self.category.id]),
+            data={'board': self.other_board.id},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert Goal.objects.get(id=self.goal.id).board_id == self.other_board.id
+        assert GoalComment.objects.get(id=self.comment.id).board_id == (
+            self.other_board.id
+        )
+
+    def test_goal_list_of_user_boards(self, auth_client):
+        """
+        Goal list contains goals of user boards only
+        """
+        GoalFactory.create()
+
+        response = auth_client.get(reverse('goals:goal-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [goal['id'] for goal in response.json()] == [self.goal.id]
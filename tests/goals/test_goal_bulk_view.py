@@ -0,0 +1,107 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+
+from goals.models import BoardParticipant, Goal
+from tests.factories import (
+    BoardFactory,
+    BoardParticipantFactory,
+    CategoryFactory,
+    GoalFactory,
+)
+
+
+@pytest.mark.django_db()
+class TestGoalBulkView:
+    url = reverse('goals:goal-bulk')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        board = BoardFactory.create(with_owner=user)
+        self.category = CategoryFactory.create(board=board, user=user)
+        self.goals = GoalFactory.create_batch(size=3, category=self.category, user=user)
+        self.foreign_goal = GoalFactory.create()
+        self.reader_category = CategoryFactory.create()
+        BoardParticipantFactory.create(
+            board=self.reader_category.board,
+            user=user,
+            role=BoardParticipant.Role.reader,
+        )
+
+    def post(self, client, changes: list[dict]) -> Response:
+        return client.post(self.url, data=changes, format='json')
+
+    def test_auth_required(self, client):
+        """
+        Unauthorized user get Authorization error
+        """
+        response: Response = self.post(client, [])
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_changes(self, auth_client, user):
+        """
+        Goals are created, updated and archived in one request
+        """
+        first, second, _ = self.goals
+        response: Response = self.post(
+            auth_client,
+            [
+                {'action': 'create', 'title': 'new', 'category': self.category.id},
+                {'action': 'update', 'id': first.id, 'priority': 4},
+                {'action': 'archive', 'id': second.id},
+            ],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.json()
+        assert [result['status'] for result in results] == [201, 200, 200]
+        created = Goal.objects.get(id=results[0]['data']['id'])
+        assert created.title == 'new'
+        assert created.user == user
+        first.refresh_from_db()
+        second.refresh_from_db()
+        assert first.priority == Goal.Priority.critical
+        assert second.status == Goal.Status.archived
+
+    def test_bulk_errors(self, auth_client):
+        """
+        Failed changes are reported per item and others are applied
+        """
+        response: Response = self.post(
+            auth_client,
+            [
+                {'action': 'create', 'category': self.category.id},
+                {'action': 'update', 'id': self.foreign_goal.id, 'title': 'x'},
+                {'action': 'create', 'title': 'x', 'category': self.reader_category.id},
+                {'action': 'create', 'title': 'x', 'category': 0},
+                {'action': 'archive', 'id': self.goals[0].id},
+            ],
+        )
+
+        results = response.json()
+        assert [result['status'] for result in results] == [400, 404, 403, 400, 200]
+        assert 'title' in results[0]['errors']
+        assert 'category' in results[3]['errors']
+
+    def test_bulk_queries_do_not_depend_on_size(self, auth_client):
+        """
+        Number of queries does not depend on number of changes
+        """
+
+        def count_queries(size: int) -> int:
+            changes = [
+                {'action': 'create', 'title': f'goal {i}', 'category': self.category.id}
+                for i in range(size)
+            ] + [
+                {'action': 'update', 'id': goal.id, 'title': f'goal {size}'}
+                for goal in self.goals
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = self.post(auth_client, changes)
+            assert response.status_code == status.HTTP_200_OK
+            return len(context.captured_queries)
+
+        assert count_queries(5) == count_queries(100)
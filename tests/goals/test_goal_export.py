@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+import tracemalloc
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals.models import Goal
+from goals.views import GoalExportView
+from tests.factories import BoardFactory, CategoryFactory, CommentFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestExport:
+    goals_url = reverse('goals:goal-export')
+    comments_url = reverse('goals:comment-export')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        board = BoardFactory.create(with_owner=user)
+        category = CategoryFactory.create(board=board, user=user)
+        self.goals = GoalFactory.create_batch(size=5, category=category, user=user)
+        self.goals[0].due_date = timezone.now().date() + timedelta(days=1)
+        self.goals[0].save()
+        CommentFactory.create_batch(size=3, goal=self.goals[0], user=user)
+        other_goal = GoalFactory.create()
+        CommentFactory.create(goal=other_goal)
+
+    @staticmethod
+    def content(response) -> str:
+        return b''.join(response.streaming_content).decode()
+
+    def test_auth_required(self, client):
+        """
+        Unauthorized user get Authorization error
+        """
+        response = client.get(self.goals_url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_goals_ndjson(self, auth_client):
+        """
+        NDJSON export contains goals of user boards like goal list
+        """
+        response = auth_client.get(self.goals_url, data={'format': 'ndjson'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response.headers['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        assert rows == auth_client.get(reverse('goals:goal-list')).json()
+
+    def test_goals_csv(self, auth_client):
+        """
+        CSV export has flat nested user columns and is filtered like goal list
+        """
+        response = auth_client.get(
+            self.goals_url,
+            data={'format': 'csv', 'due_date__gte': timezone.now().date()},
+        )
+
+        assert response.headers['Content-Disposition'] == (
+            'attachment; filename="goals.csv"'
+        )
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        assert [int(row['id']) for row in rows] == [self.goals[0].id]
+        assert rows[0]['user.username'] == self.goals[0].user.username
+        assert rows[0]['description'] == ''
+
+    def test_header_is_sent_first(self, auth_client):
+        """
+        CSV header goes out before rows are read
+        """
+        response = auth_client.get(self.goals_url, data={'format': 'csv'})
+
+        header = next(iter(response.streaming_content)).decode()
+        assert header.startswith('id,user.id,user.username')
+
+    def test_comments(self, auth_client):
+        """
+        Comment export contains comments of user boards only
+        """
+        response = auth_client.get(self.comments_url, data={'format': 'ndjson'})
+
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        assert len(rows) == 3
+        assert {row['goal'] for row in rows} == {self.goals[0].id}
+
+    def test_memory_is_flat(self, auth_client, user, monkeypatch):
+        """
+        Peak memory of export does not grow with number of goals
+        """
+        monkeypatch.setattr(GoalExportView, 'chunk_size', 100)
+        category = self.goals[0].category
+
+        def export_peak(size: int) -> int:
+            Goal.objects.bulk_create(
+                Goal(
+                    category=category, board_id=category.board_id, user=user, title='g'
+                )
+                for _ in range(size)
+            )
+            response = auth_client.get(self.goals_url, data={'format': 'ndjson'})
+            tracemalloc.start()
+            for _ in response.streaming_content:
+                pass
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+
+        small = export_peak(500)
+        large = export_peak(5000)
+        assert large < small * 2
@@ -0,0 +1,193 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from goals.importer import GoalImporter, read_rows
+from goals.models import BoardParticipant, Goal, GoalCounter
+from tests.factories import BoardFactory, CategoryFactory
+
+
+@pytest.mark.django_db()
+class TestGoalImport:
+    url = reverse('goals:goal-import')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user, user_factory):
+        self.board = BoardFactory.create(with_owner=user)
+        self.category = CategoryFactory.create(board=self.board, user=user)
+        self.deleted_category = CategoryFactory.create(
+            board=self.board, user=user, is_deleted=True
+        )
+        self.foreign_category = CategoryFactory.create()
+        reader = user_factory.create()
+        self.reader_category = CategoryFactory.create(user=reader)
+        BoardParticipant.objects.create(
+            board=self.reader_category.board,
+            user=user,
+            role=BoardParticipant.Role.reader,
+        )
+        user_factory.create(username='author')
+
+    def rows(self) -> list[dict]:
+        tomorrow = timezone.now().date() + timedelta(days=1)
+        return [
+            {'title': 'first', 'category': self.category.id},
+            {
+                'title': 'second',
+                'category': self.category.id,
+                'due_date': tomorrow.isoformat(),
+                'priority': Goal.Priority.high,
+            },
+            {'title': 'deleted', 'category': self.deleted_category.id},
+            {'title': 'foreign', 'category': self.foreign_category.id},
+            {'title': 'reader', 'category': self.reader_category.id},
+            {
+                'title': 'past',
+                'category': self.category.id,
+                'due_date': (timezone.now().date() - timedelta(days=1)).isoformat(),
+            },
+            {'title': 'other user', 'category': self.category.id, 'user': 'author'},
+            {'category': self.category.id},
+            {'title': 'third', 'category': self.category.id},
+        ]
+
+    def ndjson(self) -> bytes:
+        lines = [json.dumps(row) for row in self.rows()]
+        lines.insert(3, '{"title": ')
+        return '\n'.join(lines).encode()
+
+    def csv(self) -> bytes:
+        fields = ['title', 'category', 'user', 'due_date', 'priority']
+        lines = [','.join(fields)]
+        for row in self.rows():
+            lines.append(','.join(str(row.get(name, '')) for name in fields))
+        return '\n'.join(lines).encode()
+
+    def test_import_ndjson(self, auth_client, user):
+        """
+        Valid rows are created, invalid rows are reported with row numbers
+        """
+        response = auth_client.post(
+            self.url,
+            data={'file': SimpleUploadedFile('goals.ndjson', self.ndjson())},
+            format='multipart',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['rows'] == data['committed_rows'] == 10
+        assert data['created'] == 4
+        assert {error['row']: list(error['errors']) for error in data['errors']} == {
+            3: ['category'],
+            4: ['detail'],
+            5: ['detail'],
+            6: ['detail'],
+            7: ['due_date'],
+            9: ['title'],
+        }
+        goals = Goal.objects.filter(category=self.category).order_by('id')
+        assert [goal.title for goal in goals] == [
+            'first',
+            'second',
+            'other user',
+            'third',
+        ]
+        # Goals can not be attributed to other users
+        assert {goal.user_id for goal in goals} == {user.id}
+        assert sum(GoalCounter.objects.values_list('count', flat=True)) == 4
+
+    def test_import_csv(self, auth_client):
+        """
+        CSV rows are imported with empty cells as missing values
+        """
+        response = auth_client.post(
+            self.url,
+            data={'file': SimpleUploadedFile('goals.csv', self.csv())},
+            format='multipart',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['created'] == 4
+        assert response.json()['errors_count'] == 5
+
+    def test_malformed_csv(self, auth_client):
+        """
+        Malformed row and undecodable file are reported as row errors
+        """
+        content = (
+            '\n'.join(
+                [
+                    'title,category',
+                    f'first,{self.category.id}',
+                    f'"{"x" * 200000}",{self.category.id}',
+                    f'second,{self.category.id}',
+                ]
+            ).encode()
+            + '\nthird,'.encode()
+            + 'é'.encode('latin-1')
+        )
+        response = auth_client.post(
+            self.url,
+            data={'file': SimpleUploadedFile('goals.csv', content)},
+            format='multipart',
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data['created'] == 2
+        assert [error['row'] for error in data['errors']] == [2, 4]
+        assert 'UTF-8' in data['errors'][1]['errors']['detail'][0]
+
+    def test_unknown_format(self, auth_client):
+        """
+        File with unknown extension is rejected
+        """
+        response = auth_client.post(
+            self.url,
+            data={'file': SimpleUploadedFile('goals.xlsx', b'')},
+            format='multipart',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_resume_by_offset(self, user):
+        """
+        Import resumed from committed rows does not create goals twice
+        """
+        progress = []
+
+        def interrupt(result) -> None:
+            progress.append(result.committed_rows)
+            if len(progress) == 2:
+                raise KeyboardInterrupt
+
+        importer = GoalImporter(user, batch_size=2)
+        with pytest.raises(KeyboardInterrupt):
+            importer.run(
+                read_rows(io.BytesIO(self.ndjson()), 'ndjson'), on_batch=interrupt
+            )
+        assert Goal.objects.count() == 2
+
+        result = importer.run(
+            read_rows(io.BytesIO(self.ndjson()), 'ndjson'), offset=progress[-1]
+        )
+
+        assert result.rows == 10
+        assert Goal.objects.count() == 4
+
+    def test_command(self, user, tmp_path):
+        """
+        Management command imports file in batches
+        """
+        path = tmp_path / 'goals.csv'
+        path.write_bytes(self.csv())
+
+        call_command('importgoals', str(path), user=user.username, batch_size=4)
+
+        assert Goal.objects.count() == 4
@@ -0,0 +1,189 @@
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.views import GoalListView
+
+
+def explain(queryset: QuerySet) -> str:
+    with connection.cursor() as cursor:
+        for model in (Board, BoardParticipant, GoalCategory, Goal, GoalComment):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+    return queryset.explain()
+
+
+@pytest.mark.django_db()
+class TestGoalListIndexes:
+    boards = 20
+    categories_per_board = 5
+    goals_per_category = 10
+    large_category_goals = 3000
+
+    @staticmethod
+    def create_goals(category: GoalCategory, user: User, size: int) -> None:
+        Goal.objects.bulk_create(
+            Goal(
+                category=category,
+                board_id=category.board_id,
+                user=user,
+                title=f'goal {i}',
+                status=Goal.Status.archived if i % 3 == 0 else Goal.Status.to_do,
+            )
+            for i in range(size)
+        )
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user_factory):
+        author = user_factory.create()
+        self.user = user_factory.create()
+        boards = Board.objects.bulk_create(
+            Board(title=f'board {i}', is_deleted=i % 10 == 0)
+            for i in range(self.boards)
+        )
+        BoardParticipant.objects.create(board=boards[1], user=self.user)
+        categories = GoalCategory.objects.bulk_create(
+            GoalCategory(
+                board=board, user=author, title=f'category {i}', is_deleted=i == 0
+            )
+            for board in boards
+            for i in range(self.categories_per_board)
+        )
+        for category in categories:
+            self.create_goals(category, author, self.goals_per_category)
+        self.category = categories[self.categories_per_board + 1]
+        self.small_board_id = categories[-1].board_id
+        self.create_goals(self.category, author, self.large_category_goals)
+
+        self.goal = Goal.objects.create(
+            category=self.category, user=self.user, title='user goal'
+        )
+        GoalComment.objects.bulk_create(
+            GoalComment(goal_id=goal_id, board_id=board_id, user=author, text='c')
+            for goal_id, board_id in Goal.objects.values_list('id', 'board_id')
+        )
+
+    def active_goals(self) -> QuerySet:
+        return Goal.objects.filter(category__is_deleted=False).exclude(
+            status=Goal.Status.archived
+        )
+
+    @pytest.mark.parametrize(
+        'ordering, indexes',
+        [
+            ('title', ['goal_category_title_idx']),
+            ('created', ['goal_category_created_idx', 'goal_created_idx']),
+        ],
+    )
+    def test_goal_list_by_category(self, ordering, indexes):
+        """
+        Goal list filtered by category uses partial ordered index
+        """
+        queryset = (
+            self.active_goals()
+            .select_related('user')
+            .filter(category__in=[self.category.id])
+            .order_by(ordering, 'id')[:20]
+        )
+        plan = explain(queryset)
+        assert any(index in plan for index in indexes)
+
+    @pytest.mark.parametrize(
+        'ordering, indexes',
+        [
+            ('title', ['goal_board_title_idx', 'goal_title_idx']),
+            ('created', ['goal_board_created_idx', 'goal_created_idx']),
+        ],
+    )
+    def test_goal_list_by_board(self, ordering, indexes):
+        """
+        Goal list view of user boards is read by partial ordered index without
+        sort and without join of categories
+        """
+        request = Request(
+            APIRequestFactory().get(reverse('goals:goal-list'), {'ordering': ordering})
+        )
+        request.user = self.user
+        view = GoalListView(request=request, format_kwarg=None)
+        queryset = view.filter_queryset(view.get_queryset())[:20]
+
+        plan = explain(queryset)
+        assert any(index in plan for index in indexes), plan
+        assert 'Sort' not in plan
+        # Categories are read only by hashed subquery, authors are joined
+        assert 'hashed SubPlan' in plan
+        assert plan.count('goals_goalcategory') == 1
+
+    def test_goal_list_by_due_date(self):
+        """
+        Goal list filtered by category and due date uses due date index
+        """
+        queryset = self.active_goals().filter(
+            category=self.category.id, due_date__lte='2023-01-01'
+        )
+        assert 'goal_category_due_date_idx' in explain(queryset)
+
+    def test_goal_list_ordered_page(self):
+        """
+        First page of goal list ordered by title uses partial title index
+        """
+        queryset = self.active_goals().order_by('title', 'id')[:20]
+        assert 'goal_title_idx' in explain(queryset)
+
+    def test_bot_user_goals(self):
+        """
+        Bot goals query uses partial user index
+        """
+        queryset = self.active_goals().filter(user_id=self.user.id)
+        assert 'goal_user_category_idx' in explain(queryset)
+
+    def test_category_list(self):
+        """
+        Page of category list of large board is read in title order from
+        partial board and title index
+        """
+        board = Board.objects.create(title='large board')
+        GoalCategory.objects.bulk_create(
+            GoalCategory(
+                board=board,
+                user=self.user,
+                title=f'category {i}',
+                is_deleted=i % 5 == 0,
+            )
+            for i in range(5000)
+        )
+        queryset = (
+            GoalCategory.objects.filter(board_id__in=[board.id])
+            .exclude(is_deleted=True)
+            .order_by('title')[:20]
+        )
+        plan = explain(queryset)
+        assert 'category_board_title_idx' in plan
+        assert 'Join' not in plan
+
+    def test_board_comment_list(self):
+        """
+        Comments of user boards are read from board and created index without
+        join of goals
+        """
+        queryset = GoalComment.objects.filter(
+            board_id__in=[self.small_board_id], goal_archived=False
+        ).order_by('-created')[:20]
+        plan = explain(queryset)
+        assert 'comment_board_created_idx' in plan
+        assert 'Join' not in plan
+
+    def test_comment_list(self):
+        """
+        Goal comments are read from goal, created and id index in cursor order
+        """
+        queryset = GoalComment.objects.filter(goal=self.goal).order_by(
+            '-created', '-id'
+        )
+        plan = explain(queryset)
+        assert 'comment_goal_created_id_idx' in plan
+        assert 'Sort' not in plan
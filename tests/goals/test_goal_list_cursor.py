@@ -0,0 +1,81 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestGoalListCursor:
+    url = reverse('goals:goal-list')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        board = BoardFactory.create(with_owner=user)
+        category = CategoryFactory.create(board=board, user=user)
+        self.goals = GoalFactory.create_batch(
+            size=7, category=category, user=user, title='same title'
+        )
+
+    def collect(self, client, url: str, key: str = 'next') -> list[dict]:
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.json())
+            url = pages[-1][key]
+        return pages
+
+    @pytest.mark.parametrize('ordering', ['title', '-title', 'created', '-created'])
+    def test_cursor_pages_cover_all_goals(self, auth_client, ordering):
+        """
+        Cursor pages return every goal once in (ordering field, id) order
+        """
+        pages = self.collect(
+            auth_client, f'{self.url}?cursor=&limit=3&ordering={ordering}'
+        )
+
+        ids = [goal['id'] for page in pages for goal in page['results']]
+        assert [len(page['results']) for page in pages] == [3, 3, 1]
+        assert len(ids) == len(set(ids)) == len(self.goals)
+        assert 'count' not in pages[0]
+        assert pages[0]['previous'] is None
+
+    def test_previous_cursor_returns_same_pages(self, auth_client):
+        """
+        Previous cursors walk pages back in the same order
+        """
+        forward = self.collect(auth_client, f'{self.url}?cursor=&limit=3')
+        backward = self.collect(auth_client, forward[-1]['previous'], key='previous')
+
+        assert [page['results'] for page in backward] == [
+            page['results'] for page in reversed(forward[:-1])
+        ]
+
+    def test_invalid_cursor(self, auth_client):
+        """
+        Broken cursor returns not found error
+        """
+        response = auth_client.get(f'{self.url}?cursor=broken')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_with_ranked_search(self, auth_client):
+        """
+        Cursor can`t page goals ordered by search rank, explicit ordering can
+        """
+        response = auth_client.get(f'{self.url}?cursor=&search=same')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        pages = self.collect(
+            auth_client, f'{self.url}?cursor=&limit=3&search=same&ordering=title'
+        )
+        assert sum(len(page['results']) for page in pages) == len(self.goals)
+
+    def test_limit_offset_without_cursor(self, auth_client):
+        """
+        Limit offset pagination is used without cursor
+        """
+        response = auth_client.get(f'{self.url}?limit=3&offset=3')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == len(self.goals)
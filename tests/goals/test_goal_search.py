@@ -0,0 +1,77 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+
+from goals.filters import GoalSearchFilter
+from goals.models import Goal
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestGoalSearch:
+    url = reverse('goals:goal-list')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        board = BoardFactory.create(with_owner=user)
+        category = CategoryFactory.create(board=board, user=user)
+        self.milk = GoalFactory.create(
+            category=category, user=user, title='Buy milk', description='milk milk'
+        )
+        self.shop = GoalFactory.create(
+            category=category, user=user, title='Go shopping', description='buy milk'
+        )
+        self.book = GoalFactory.create(
+            category=category, user=user, title='Read book', description=None
+        )
+        GoalFactory.create(
+            category=category,
+            user=user,
+            title='Archived milk',
+            status=Goal.Status.archived,
+        )
+
+    def search(self, client, term: str, **params) -> list[int]:
+        response = client.get(self.url, data={'search': term, **params})
+        assert response.status_code == status.HTTP_200_OK
+        return [goal['id'] for goal in response.json()]
+
+    def test_prefix_search_ranked(self, auth_client):
+        """
+        Goals are matched by word prefix and ordered by rank
+        """
+        assert self.search(auth_client, 'mil') == [self.milk.id, self.shop.id]
+
+    def test_search_all_words(self, auth_client):
+        """
+        All words of search term have to match
+        """
+        assert self.search(auth_client, 'buy sho') == [self.shop.id]
+        assert self.search(auth_client, 'read') == [self.book.id]
+
+    def test_search_with_ordering(self, auth_client):
+        """
+        Explicit ordering overrides rank
+        """
+        result = self.search(auth_client, 'milk', ordering='title')
+        assert result == [self.milk.id, self.shop.id]
+
+    def test_search_without_words(self, auth_client):
+        """
+        Search term without words matches nothing
+        """
+        assert self.search(auth_client, '!!!') == []
+
+    def test_search_uses_index(self, rf):
+        """
+        Search query expression matches GIN index
+        """
+        request = rf.get(self.url, data={'search': 'milk'})
+        request.query_params = request.GET
+        queryset = GoalSearchFilter().filter_queryset(
+            request, Goal.objects.exclude(status=Goal.Status.archived), None
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        assert 'goal_search_idx' in queryset.explain()
@@ -0,0 +1,126 @@
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from goals.cache import response_cache
+from tests.factories import BoardFactory, CategoryFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestResponseCache:
+    url = reverse('goals:goal-list')
+
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        caches['responses'].clear()
+        self.board = BoardFactory.create(with_owner=user)
+        self.category = CategoryFactory.create(board=self.board, user=user)
+        self.goal = GoalFactory.create(category=self.category, user=user)
+
+    def test_cached_list(self, auth_client):
+        """
+        Repeated list request is answered from cache without goals query
+        """
+        first = auth_client.get(self.url)
+        assert first.headers['X-Cache'] == 'MISS'
+
+        with CaptureQueriesContext(connection) as context:
+            second = auth_client.get(self.url)
+
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.json() == first.json()
+        assert second.headers['ETag'] == first.headers['ETag']
+        assert not [q for q in context.captured_queries if 'goals_goal"' in q['sql']]
+
+    def test_goal_update_invalidates_list(self, auth_client):
+        """
+        Goal update bumps board version, so list is not taken from cache
+        """
+        auth_client.get(self.url)
+        auth_client.patch(
+            reverse('goals:goal', args=[self.goal.id]), data={'title': 'changed'}
+        )
+
+        response = auth_client.get(self.url)
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.json()[0]['title'] == 'changed'
+
+    def test_profile_update_invalidates_list(self, auth_client):
+        """
+        Profile update of goal author bumps board version, so list with nested
+        author is not taken from cache
+        """
+        auth_client.get(self.url)
+        auth_client.patch(
+            reverse('core:profile'), data={'first_name': 'Changed'}, format='json'
+        )
+
+        response = auth_client.get(self.url)
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.json()[0]['user']['first_name'] == 'Changed'
+
+    def test_board_update_invalidates_detail(self, auth_client):
+        """
+        Board update bumps board version, so detail is not taken from cache
+        """
+        url = reverse('goals:board', args=[self.board.id])
+        auth_client.get(url)
+        response = auth_client.put(
+            url, data={'title': 'changed', 'participants': []}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        response = auth_client.get(url)
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.json()['title'] == 'changed'
+        assert auth_client.get(url).headers['X-Cache'] == 'HIT'
+
+    def test_cache_is_per_user(self, auth_client, client, user_factory):
+        """
+        Cached response of one user is not returned to another one
+        """
+        auth_client.get(self.url)
+        client.force_login(user_factory.create())
+
+        response = client.get(self.url)
+        assert response.headers['X-Cache'] == 'MISS'
+
+    def test_lru_eviction(self, auth_client, monkeypatch):
+        """
+        Cache size is capped, least recently used entries are evicted
+        """
+        cache = caches['responses']
+        monkeypatch.setattr(cache, '_max_entries', 2)
+        monkeypatch.setattr(cache, '_cull_frequency', 2)
+
+        def cache_status(limit: int) -> str:
+            return auth_client.get(self.url, data={'limit': limit}).headers['X-Cache']
+
+        cache_status(1)
+        cache_status(2)
+        assert cache_status(1) == 'HIT'
+        cache_status(3)
+
+        assert cache_status(1) == 'HIT'
+        assert cache_status(2) == 'MISS'
+
+    def test_stats(self, client, user_factory):
+        """
+        Admin gets hit and miss counters of response cache
+        """
+        hits, misses = response_cache.hits, response_cache.misses
+        client.force_login(user_factory.create(is_staff=True))
+
+        response = client.get(reverse('goals:cache-stats'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'hits': hits,
+            'misses': misses,
+            'sets': response_cache.sets,
+            'max_entries': settings.CACHES['responses']['OPTIONS']['MAX_ENTRIES'],
+        }
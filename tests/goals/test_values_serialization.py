@@ -0,0 +1,143 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.db.models import QuerySet
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from goals.models import Goal, GoalCategory, GoalComment
+from goals.serializers import (
+    GoalCategoryListSerializer,
+    GoalCommentSerializer,
+    GoalSerializer,
+)
+from goals.values import ValuesSerializer
+from tests.factories import BoardFactory, CategoryFactory, CommentFactory, GoalFactory
+
+
+@pytest.mark.django_db()
+class TestValuesSerialization:
+    @pytest.fixture(autouse=True)
+    def setup(self, user):
+        caches['responses'].clear()
+        board = BoardFactory.create(with_owner=user)
+        self.categories = CategoryFactory.create_batch(size=3, board=board, user=user)
+        self.goals = [
+            GoalFactory.create(
+                category=self.categories[i % 3],
+                user=user,
+                title=f'Goal «{i}» "quoted"',
+                description=None if i % 2 else f'Description\n{i}',
+                due_date=timezone.now().date() + timedelta(days=i) if i % 3 else None,
+                priority=i % 4 + 1,
+            )
+            for i in range(9)
+        ]
+        CommentFactory.create_batch(size=3, goal=self.goals[0], user=user)
+
+    @pytest.mark.parametrize(
+        'url_name, serializer_class, queryset, ordering',
+        [
+            (
+                'goals:goal-list',
+                GoalSerializer,
+                Goal.objects.select_related('user'),
+                ('title', 'id'),
+            ),
+            (
+                'goals:category-list',
+                GoalCategoryListSerializer,
+                GoalCategory.objects.select_related('user'),
+                ('title', 'id'),
+            ),
+            (
+                'goals:comment-list',
+                GoalCommentSerializer,
+                GoalComment.objects.select_related('user'),
+                ('-created', '-id'),
+            ),
+        ],
+        ids=['goals', 'categories', 'comments'],
+    )
+    def test_parity(self, auth_client, url_name, serializer_class, queryset, ordering):
+        """
+        Fast list output is byte for byte equal to serializer output
+        """
+        response = auth_client.get(reverse(url_name))
+
+        data = serializer_class(queryset.order_by(*ordering), many=True).data
+        assert response.content == JSONRenderer().render(data)
+
+    def test_cursor_page_parity(self, auth_client):
+        """
+        Cursor pages of fast list are equal to serializer output
+        """
+        response = auth_client.get(
+            reverse('goals:goal-list'), data={'cursor': '', 'limit': 4}
+        )
+        next_page = auth_client.get(response.json()['next'])
+
+        goals = Goal.objects.order_by('title', 'id')
+        assert next_page.json()['results'] == GoalSerializer(goals[4:8], many=True).data
+
+    def test_unsupported_field(self):
+        """
+        Serializer with method field can`t be read from values
+        """
+
+        class Serializer(GoalSerializer):
+            extra = serializers.SerializerMethodField()
+
+            def get_extra(self, obj: Goal) -> None:
+                return None
+
+        with pytest.raises(TypeError):
+            ValuesSerializer(Serializer())
+
+    def make_page(self, user) -> QuerySet:
+        category = self.categories[0]
+        Goal.objects.bulk_create(
+            Goal(category=category, board_id=category.board_id, user=user, title=f'{i}')
+            for i in range(1000)
+        )
+        return Goal.objects.select_related('user').order_by('title', 'id')[:1000]
+
+    def test_large_page_parity(self, user):
+        """
+        Fast path output of large page is equal to model serializer output
+        """
+        queryset = self.make_page(user)
+        values_serializer = ValuesSerializer(GoalSerializer())
+        values_data = values_serializer.to_representation_many(
+            queryset.values(*values_serializer.columns)
+        )
+
+        assert JSONRenderer().render(values_data) == JSONRenderer().render(
+            GoalSerializer(queryset, many=True).data
+        )
+
+    @pytest.mark.benchmark
+    def test_benchmark(self, user):
+        """
+        Fast path serializes a large page faster than model serializer
+        """
+        queryset = self.make_page(user)
+
+        started = time.perf_counter()
+        GoalSerializer(queryset, many=True).data
+        serializer_time = time.perf_counter() - started
+
+        started = time.perf_counter()
+        values_serializer = ValuesSerializer(GoalSerializer())
+        values_serializer.to_representation_many(
+            queryset.values(*values_serializer.columns)
+        )
+        values_time = time.perf_counter() - started
+
+        assert (
+            values_time < serializer_time
+        ), f'serializer {serializer_time:.3f}s, values {values_time:.3f}s'
@@ -8,9 +8,55 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 """
 
 import os
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
 from django.core.asgi import get_asgi_application
+from django.core.wsgi import get_wsgi_application
+from django.urls import Resolver404, resolve
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+wsgi_handler = get_wsgi_application()
+
+
+def closing_wsgi_application(environ: dict, start_response: Callable) -> Iterator:
+    """
+    WSGI application which closes response after iteration, so connections
+    are closed by request finished signal like under WSGI server
+    """
+    response = wsgi_handler(environ, start_response)
+    try:
+        yield from response
+    finally:
+        response.close()
+
+
+wsgi_application = WsgiToAsgi(closing_wsgi_application)
+
+
+@lru_cache(maxsize=1024)
+def is_sync_streaming(path: str) -> bool:
+    """
+    Check that view of path streams rows from database while response
+    is iterated, Django ASGI handler iterates response on event loop
+    :param path: request path
+    :return: True if view must be served by WSGI handler
+    """
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return False
+    view_class = getattr(match.func, 'cls', None)
+    return getattr(view_class, 'sync_streaming', False)
+
+
+async def application(scope: dict, receive: Callable, send: Callable) -> None:
+    if scope['type'] == 'http' and is_sync_streaming(scope['path']):
+        async with ThreadSensitiveContext():
+            await wsgi_application(scope, receive, send)
+        return
+    await django_application(scope, receive, send)
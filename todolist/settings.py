@@ -44,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third-party apps
     'rest_framework',
     'django_filters',
@@ -61,6 +62,7 @@ if DEBUG:
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.replica_routing_middleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -92,15 +94,86 @@ WSGI_APPLICATION = 'todolist.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+# With POSTGRES_POOL connections are taken from pool of process for each
+# request and returned to it after request, so they are not kept by request
+# threads and CONN_MAX_AGE must be 0
+POSTGRES_POOL = env.bool('POSTGRES_POOL', False)
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db' if POSTGRES_POOL else 'django.db.backends.postgresql',
         'NAME': env.str('POSTGRES_DB'),
         'USER': env.str('POSTGRES_USER'),
         'PASSWORD': env.str('POSTGRES_PASSWORD'),
         'HOST': env.str('POSTGRES_HOST'),
         'PORT': '5432',
+        'CONN_MAX_AGE': 0 if POSTGRES_POOL else env.int('POSTGRES_CONN_MAX_AGE', 60),
+        'CONN_HEALTH_CHECKS': env.bool('POSTGRES_CONN_HEALTH_CHECKS', True),
+        'POOL': {
+            'MIN_SIZE': env.int('POSTGRES_POOL_MIN_SIZE', 0),
+            'MAX_SIZE': env.int('POSTGRES_POOL_MAX_SIZE', 10),
+            'TIMEOUT': env.float('POSTGRES_POOL_TIMEOUT', 10),
+            'MAX_IDLE': env.float('POSTGRES_POOL_MAX_IDLE', 300),
+        },
+    }
+}
+
+# Reads of safe method requests go to replicas, client which wrote reads from
+# primary for DATABASE_REPLICA_STICKINESS seconds, unavailable replica is
+# skipped for DATABASE_REPLICA_RETRY seconds
+DATABASE_REPLICAS = []
+for number, host in enumerate(env.list('POSTGRES_REPLICA_HOSTS', default=[]), 1):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
     }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+DATABASE_REPLICA_STICKINESS = env.int('POSTGRES_REPLICA_STICKINESS', 10)
+DATABASE_REPLICA_RETRY = env.int('POSTGRES_REPLICA_RETRY', 30)
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': env.str(
+            'RESPONSE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': env.str('RESPONSE_CACHE_LOCATION', 'responses'),
+        'TIMEOUT': env.int('RESPONSE_CACHE_TIMEOUT', 300),
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('RESPONSE_CACHE_MAX_ENTRIES', 1000),
+            'CULL_FREQUENCY': env.int('RESPONSE_CACHE_CULL_FREQUENCY', 10),
+        },
+    },
+    # Dialog states of bot chats, backend must be shared by bot processes
+    'bot_states': {
+        'BACKEND': env.str(
+            'BOT_STATE_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': env.str('BOT_STATE_CACHE_LOCATION', 'bot_states'),
+        'TIMEOUT': env.int('BOT_STATE_TIMEOUT', 3600),
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('BOT_STATE_MAX_ENTRIES', 10000),
+        },
+    },
+    # Counters of bot message rate limits, backend must be shared by bot and
+    # web processes and increment atomically (Redis or Memcached)
+    'bot_limits': {
+        'BACKEND': env.str(
+            'BOT_LIMIT_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': env.str('BOT_LIMIT_CACHE_LOCATION', 'bot_limits'),
+    },
 }
 
 # Password validation
@@ -164,7 +237,20 @@ AUTHENTICATION_BACKENDS = (
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'core.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 
 BOT_TOKEN = env.str(('BOT_TOKEN'))
+# Secret token of webhook requests, webhook is disabled without it
+BOT_WEBHOOK_SECRET = env.str('BOT_WEBHOOK_SECRET', '')